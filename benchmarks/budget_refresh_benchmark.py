@@ -0,0 +1,87 @@
+"""Full vs. time-budgeted refresh benchmark against a local stub server.
+
+Runs one full `scrape_data()` refresh against StubWikipedia, then a series of refreshes
+with a time budget on a fresh dataset, and reports the wall time, requests and bytes of
+each, how many animals have been fetched so far, and the age of the stalest page when each
+refresh ends. Budgeted refreshes should each take about the budget, spend it on pages no
+earlier refresh reached, and cover the whole list in about `full time / budget` runs.
+
+Usage:
+    python -m benchmarks.budget_refresh_benchmark [--animals 300] [--budget 0.5] [--runs 6]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from typing import Optional
+
+from benchmarks.lazy_images_benchmark import image_dir
+from benchmarks.stub_server import StubWikipedia
+from db.animals_db import AnimalsInMemoryDB
+from scraper import pipeline
+from scraper.checkpoint import Checkpoint
+from scraper.priority import FetchPriority
+from scraper.progress import ScrapeProgress
+
+
+async def refresh(
+    db: AnimalsInMemoryDB, stub: StubWikipedia, directory: str, budget: Optional[float]
+) -> float:
+    stub.requests.clear()
+    stub.bytes_sent.clear()
+    checkpoint = Checkpoint(os.path.join(directory, "checkpoint.jsonl"))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await pipeline.scrape_data(
+            db,
+            ScrapeProgress(),
+            stub.list_url,
+            checkpoint,
+            shards=1,
+            lazy_images=False,
+            priority=FetchPriority(("table",)),
+            budget=budget,
+        )
+    return time.perf_counter() - start
+
+
+def row(mode: str, seconds: float, db: AnimalsInMemoryDB, stub: StubWikipedia, animals: int):
+    def requests(prefix: str) -> int:
+        return sum(count for path, count in stub.requests.items() if path.startswith(prefix))
+
+    fetched_at = db.snapshot().animal_fetched_at
+    stalest = time.time() - min(fetched_at.values()) if len(fetched_at) == animals else None
+    print(
+        f"{mode:>10} {seconds:>7.2f} {requests('/wiki/Animal_'):>6} {requests('/images/'):>7} "
+        f"{sum(stub.bytes_sent.values()) / 2**20:>6.1f} {len(fetched_at):>8} "
+        + (f"{stalest:>10.2f}" if stalest is not None else f"{'never':>10}")
+    )
+
+
+async def main(args: argparse.Namespace):
+    async with StubWikipedia(animals=args.animals, latency=args.latency) as stub:
+        print(
+            f"{'refresh':>10} {'wall s':>7} {'pages':>6} {'images':>7} {'MiB':>6} "
+            f"{'fetched':>8} {'stalest s':>10}"
+        )
+        with image_dir() as directory:
+            db = AnimalsInMemoryDB()
+            row("full", await refresh(db, stub, directory, None), db, stub, args.animals)
+        with image_dir() as directory:
+            db = AnimalsInMemoryDB()
+            for run in range(1, args.runs + 1):
+                seconds = await refresh(db, stub, directory, args.budget)
+                row(f"budget #{run}", seconds, db, stub, args.animals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--budget", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=6)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,62 @@
+"""Insert throughput benchmark for the storage backends.
+
+Replays the writes a scrape produces (two adjectives, an image URL and a local path per
+animal) against each backend, once with per-item inserts and once through a BatchWriter,
+and reports writes per second.
+
+Usage:
+    python -m benchmarks.db_insert_benchmark [--animals 20000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_sqlite_db import AnimalsSQLiteDB
+from db.batch_writer import BatchWriter
+
+WRITES_PER_ANIMAL = 4
+
+
+def _write_animals(db, animals: int):
+    for i in range(animals):
+        name = f"Animal_{i}"
+        db.insert_animal_to_collateral_adjectives(f"adjective-{i % 300}", name)
+        db.insert_animal_to_collateral_adjectives(f"adjective-{i % 7}", name)
+        db.insert_image_url(f"https://upload.wikimedia.org/{i}/{name}.jpg", name)
+        db.insert_image_local_path(name, f"/tmp/{name}.jpg")
+
+
+def measure(db, animals: int, batched: bool) -> float:
+    """Returns the writes per second achieved, including the final publish."""
+    target = BatchWriter(db) if batched else db
+    start = time.perf_counter()
+    _write_animals(target, animals)
+    target.publish()
+    return animals * WRITES_PER_ANIMAL / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "memory": AnimalsInMemoryDB,
+            "sqlite": lambda: AnimalsSQLiteDB(Path(directory, f"{time.time_ns()}.sqlite3")),
+        }
+
+        print(f"{'backend':>8} {'per-item w/s':>14} {'batched w/s':>14} {'speedup':>8}")
+        for name, factory in backends.items():
+            per_item = measure(factory(), args.animals, batched=False)
+            batched = measure(factory(), args.animals, batched=True)
+            print(
+                f"{name:>8} {per_item:>14,.0f} {batched:>14,.0f} {batched / per_item:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Memory benchmark for AnimalsInMemoryDB.
+
+Loads synthetic animals into the compact interned database and into the previous
+layout of three plain dicts, and reports the memory retained by each.
+
+Usage:
+    python -m benchmarks.db_memory_benchmark [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from collections import defaultdict
+
+from db.animals_db import AnimalsInMemoryDB
+
+ADJECTIVES_POOL_SIZE = 500
+IMAGE_URL_TEMPLATE = (
+    "https://upload.wikimedia.org/wikipedia/commons/thumb/{shard}/{name}.jpg/"
+    "250px-{name}.jpg"
+)
+
+
+class LegacyAnimalsDB:
+    """The previous dict-of-strings layout, kept here as the benchmark baseline."""
+
+    def __init__(self):
+        self.collateral_adjectives_to_animals = defaultdict(list)
+        self.animal_images_local_paths = {}
+        self.animal_image_urls = {}
+
+    def insert_image_url(self, image_url: str, animal_name: str):
+        self.animal_image_urls[image_url] = animal_name
+
+    def insert_image_local_path(self, animal_name: str, local_path: str):
+        self.animal_images_local_paths[animal_name] = local_path
+
+    def insert_animal_to_collateral_adjectives(self, adjective: str, animal: str):
+        self.collateral_adjectives_to_animals[adjective].append(animal)
+
+
+def _fresh(text: str) -> str:
+    """Returns an equal but distinct string object, as separate scrapers would."""
+    return "".join(list(text))
+
+
+def _load(db, size: int, seed: int = 0):
+    rng = random.Random(seed)
+    adjectives = [f"adjective-{i}" for i in range(ADJECTIVES_POOL_SIZE)]
+    for i in range(size):
+        name = f"Animal_{i}"
+        for adjective in rng.sample(adjectives, rng.randint(1, 3)):
+            db.insert_animal_to_collateral_adjectives(_fresh(adjective), _fresh(name))
+        image_url = IMAGE_URL_TEMPLATE.format(shard=i % 256, name=name)
+        db.insert_image_url(image_url, _fresh(name))
+        db.insert_image_local_path(_fresh(name), f"/tmp/{name}.jpg")
+
+
+def measure(factory, size: int) -> int:
+    """Returns the bytes retained after loading `size` synthetic animals."""
+    gc.collect()
+    tracemalloc.start()
+    db = factory()
+    _load(db, size)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del db
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'animals':>10} {'legacy MiB':>12} {'compact MiB':>12} {'saving':>8}")
+    for size in args.sizes:
+        legacy = measure(LegacyAnimalsDB, size)
+        compact = measure(AnimalsInMemoryDB, size)
+        print(
+            f"{size:>10} {legacy / 2**20:>12.1f} {compact / 2**20:>12.1f}"
+            f" {1 - compact / legacy:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Load test for the homepage served by one or more uvicorn workers.
+
+Seeds a SQLite dataset with synthetic animals, starts the app with each requested number
+of workers against that dataset, and reports homepage requests per second.
+
+Usage:
+    python -m benchmarks.homepage_load_benchmark [--workers 1 2 4] [--animals 300]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+from db.animals_sqlite_db import AnimalsSQLiteDB
+
+
+def seed_dataset(db_path: Path, animals: int, adjectives: int = 50):
+    db = AnimalsSQLiteDB(db_path)
+    with db.batch():
+        db.reset()
+        db.insert_many(
+            adjectives=[(f"adjective-{i % adjectives}", f"Animal_{i}") for i in range(animals)],
+            image_urls=[(f"https://example.com/{i}.jpg", f"Animal_{i}") for i in range(animals)],
+            local_paths=[(f"Animal_{i}", f"/tmp/Animal_{i}.jpg") for i in range(animals)],
+        )
+    db.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.perf_counter() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"Server at {url} did not become ready")
+
+
+async def _hammer(url: str, concurrency: int, duration: float) -> int:
+    completed = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(session: aiohttp.ClientSession):
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            async with session.get(url) as response:
+                await response.read()
+                completed += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[client(session) for _ in range(concurrency)])
+    return completed
+
+
+def measure(db_path: Path, workers: int, concurrency: int, duration: float) -> float:
+    """Returns the homepage requests/sec served by `workers` uvicorn processes."""
+    port = _free_port()
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable, "-m", "uvicorn", "server:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env={**os.environ, "ANIMALS_DB_PATH": str(db_path)},
+    )
+    url = f"http://127.0.0.1:{port}/"
+    try:
+        asyncio.run(_wait_until_ready(url))
+        asyncio.run(_hammer(url, concurrency, 1.0))  # Warm up every worker
+        completed = asyncio.run(_hammer(url, concurrency, duration))
+    finally:
+        server.terminate()
+        server.wait()
+    return completed / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory, "animals.sqlite3")
+        seed_dataset(db_path, args.animals)
+
+        print(f"{'workers':>8} {'req/s':>10}")
+        for workers in args.workers:
+            rate = measure(db_path, workers, args.concurrency, args.duration)
+            print(f"{workers:>8} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Eager vs. lazy image fetching benchmark against a local stub server.
+
+Runs the full `scrape_data()` pipeline against StubWikipedia with images downloaded eagerly
+during the scrape and lazily, and reports the refresh wall time and the image bytes
+downloaded by each. The lazy row is followed by a burst of simulated image views with a
+Zipf-like popularity, served through ImageCache, to show what lazy mode downloads once the
+images people actually look at have been requested, and how slow a first view is.
+
+Usage:
+    python -m benchmarks.lazy_images_benchmark [--animals 300] [--views 1000]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import server
+from benchmarks.stub_server import StubWikipedia
+from client.http_client import AsyncHttpClient
+from scraper.checkpoint import Checkpoint
+from scraper.image_cache import ImageCache
+
+
+@contextlib.contextmanager
+def image_dir():
+    """Saves images to a fresh temporary directory, so nothing is cached between runs."""
+    with tempfile.TemporaryDirectory() as directory:
+        tempfile.tempdir = directory
+        try:
+            yield directory
+        finally:
+            tempfile.tempdir = None
+
+
+def image_bytes(stub: StubWikipedia) -> int:
+    return sum(size for path, size in stub.bytes_sent.items() if path.startswith("/images/"))
+
+
+def row(mode: str, seconds: str, stub: StubWikipedia):
+    images = sum(count for path, count in stub.requests.items() if path.startswith("/images/"))
+    print(f"{mode:>18} {seconds:>10} {images:>8} {image_bytes(stub) / 2**20:>8.1f}")
+
+
+async def refresh(stub: StubWikipedia, directory: str, lazy_images: bool) -> float:
+    stub.requests.clear()
+    stub.bytes_sent.clear()
+    checkpoint = Checkpoint(os.path.join(directory, "checkpoint.jsonl"))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await server.scrape_data(stub.list_url, checkpoint, shards=1, lazy_images=lazy_images)
+    return time.perf_counter() - start
+
+
+async def view(stub: StubWikipedia, views: int, viewers: int) -> tuple[list, list]:
+    """Requests images like `viewers` concurrent users, returning first and cached latency."""
+    image_urls = {
+        animal_name: image_url
+        for image_url, animal_name in server.db.snapshot().animal_image_urls.items()
+    }
+    animals = stub.animals
+    weights = [1 / rank for rank in range(1, len(animals) + 1)]
+    requests = random.Random(0).choices(animals, weights, k=views)
+    first, cached = [], []
+
+    async with AsyncHttpClient() as client:
+        cache = ImageCache(client)
+
+        async def viewer(names):
+            for animal_name in names:
+                was_cached = cache.is_cached(animal_name, image_urls[animal_name])
+                start = time.perf_counter()
+                await cache.get(animal_name, image_urls[animal_name])
+                (cached if was_cached else first).append(time.perf_counter() - start)
+
+        await asyncio.gather(*[viewer(requests[i::viewers]) for i in range(viewers)])
+    return first, cached
+
+
+async def main(args: argparse.Namespace):
+    async with StubWikipedia(
+        animals=args.animals, latency=args.latency, image_size=args.image_size
+    ) as stub:
+        print(f"{'mode':>18} {'refresh s':>10} {'images':>8} {'MiB':>8}")
+        with image_dir() as directory:
+            row("eager", f"{await refresh(stub, directory, False):.2f}", stub)
+        with image_dir() as directory:
+            row("lazy", f"{await refresh(stub, directory, True):.2f}", stub)
+            first, cached = await view(stub, args.views, args.viewers)
+            row(f"lazy + {args.views} views", "-", stub)
+
+    print(
+        f"first view p50 {statistics.median(first) * 1000:.1f} ms, "
+        f"cached view p50 {statistics.median(cached) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--image-size", type=int, default=200_000)
+    parser.add_argument("--views", type=int, default=1000)
+    parser.add_argument("--viewers", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
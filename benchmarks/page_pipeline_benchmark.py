@@ -0,0 +1,85 @@
+"""Table-to-page pipeline benchmark against a local stub server.
+
+Runs AnimalTableScraper and AnimalPageScraper against StubWikipedia with injected latency
+and reports the time until the first animal page is processed and the total wall time,
+for several fetcher pool sizes. The `lockstep` row replays the previous design, in which
+rows were handled in batches of 10 and each batch waited for its slowest page.
+
+Usage:
+    python -m benchmarks.page_pipeline_benchmark [--animals 300] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubWikipedia
+from client.http_client import AsyncHttpClient
+from db.animals_db import AnimalsInMemoryDB
+from scraper.animal_page_scraper import AnimalPageScraper
+from scraper.frontier import UrlFrontier
+from scraper.table_reader import read_animal_table
+from scraper.table_scraper import AnimalTableScraper
+
+
+class _TimedPageScraper(AnimalPageScraper):
+    """Records when the first page is processed and skips image downloads."""
+
+    first_page_at: float | None = None
+
+    async def _process_page(self, url, response, animal_name=None):
+        if self.first_page_at is None:
+            self.first_page_at = time.perf_counter()
+        await self._extract_image_url(response, animal_name, url)
+
+
+async def run_frontier(stub: StubWikipedia, fetchers: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    async with AsyncHttpClient() as client:
+        frontier = UrlFrontier()
+        db = AnimalsInMemoryDB()
+        page_scraper = _TimedPageScraper(client, db, frontier, UrlFrontier(), fetchers=fetchers)
+        await asyncio.gather(
+            AnimalTableScraper(client, db, frontier, url=stub.list_url).run(),
+            page_scraper.run(),
+        )
+    return page_scraper.first_page_at - start, time.perf_counter() - start
+
+
+async def run_lockstep(stub: StubWikipedia) -> tuple[float, float]:
+    start = time.perf_counter()
+    async with AsyncHttpClient() as client:
+        db = AnimalsInMemoryDB()
+        table_scraper = AnimalTableScraper(client, db, UrlFrontier(), url=stub.list_url)
+        page_scraper = _TimedPageScraper(client, db, UrlFrontier(), UrlFrontier())
+
+        async def row(animal):
+            url, response = await page_scraper._fetch_page(stub.page_url(animal))
+            await page_scraper._process_page(url, response, animal)
+
+        html = await table_scraper._fetch_wikipedia_page()
+        animals = [
+            table_row.animal
+            for table_row in read_animal_table(html, AnimalTableScraper.COLLATERAL_ADJECTIVE_COLUMN)
+        ]
+        for i in range(0, len(animals), 10):
+            await asyncio.gather(*[row(animal) for animal in animals[i : i + 10]])
+    return page_scraper.first_page_at - start, time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace):
+    async with StubWikipedia(animals=args.animals, latency=args.latency) as stub:
+        print(f"{'mode':>12} {'first page s':>13} {'total s':>9}")
+        first, total = await run_lockstep(stub)
+        print(f"{'lockstep':>12} {first:>13.3f} {total:>9.3f}")
+        for fetchers in args.fetchers:
+            first, total = await run_frontier(stub, fetchers)
+            print(f"{f'{fetchers} fetchers':>12} {first:>13.3f} {total:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fetchers", type=int, nargs="+", default=[1, 5, 10, 20])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""Fetch priority benchmark against a local stub server.
+
+Simulates Zipf-distributed image views over the animals in a random order, then runs the
+full `scrape_data()` pipeline against StubWikipedia with different fetch priority signals
+and reports the time until the N most-viewed animals are complete (page fetched and image
+saved), along with the total refresh time. `table` is the plain FIFO order of the table.
+
+Usage:
+    python -m benchmarks.priority_benchmark [--animals 300] [--top 20]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+import server
+from benchmarks.stub_server import StubWikipedia
+from scraper.checkpoint import Checkpoint
+from scraper.priority import FetchPriority, parse_signals
+
+
+async def run(
+    stub: StubWikipedia, priority: FetchPriority, top: set[str]
+) -> tuple[float, float]:
+    """Returns the time until every `top` animal's image is saved, and the total time."""
+    remaining = set(top)
+    top_done = asyncio.get_running_loop().create_future()
+
+    async def follow():
+        async for name, data in server.progress.events():
+            if name == "image":
+                remaining.discard(data["animal"])
+                if not remaining and not top_done.done():
+                    top_done.set_result(time.perf_counter())
+
+    with tempfile.TemporaryDirectory() as image_dir:
+        tempfile.tempdir = image_dir
+        follower = asyncio.create_task(follow())
+        await asyncio.sleep(0)  # Subscribe before the scrape starts
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                await server.scrape_data(
+                    stub.list_url,
+                    Checkpoint(os.path.join(image_dir, "checkpoint.jsonl")),
+                    shards=1,
+                    lazy_images=False,
+                    priority=priority,
+                )
+            total = time.perf_counter() - start
+            top_time = await top_done - start
+        finally:
+            follower.cancel()
+            tempfile.tempdir = None
+    return top_time, total
+
+
+async def main(args: argparse.Namespace):
+    async with StubWikipedia(animals=args.animals, latency=args.latency) as stub:
+        animals = stub.animals
+        popularity = random.Random(0).sample(animals, len(animals))
+        weights = [1 / rank for rank in range(1, len(animals) + 1)]
+        views = Counter(random.Random(1).choices(popularity, weights, k=args.views))
+        top = {animal_name for animal_name, _ in views.most_common(args.top)}
+
+        print(f"{'signals':>16} {f'top {args.top} s':>9} {'total s':>9}")
+        for signals in args.signals:
+            priority = FetchPriority(signals, views=views)
+            top_time, total = await run(stub, priority, top)
+            print(f"{','.join(signals):>16} {top_time:>9.2f} {total:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--views", type=int, default=2000)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--signals", type=parse_signals, nargs="+", default=[("table",), ("views", "table")]
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""Search index vs. linear scan benchmark over a synthetic dataset.
+
+Fills an AnimalsInMemoryDB with synthetic animals and collateral adjectives, then runs
+prefix queries, exact adjective queries and misspelled queries through
+`AnimalsSnapshot.search()` and through a linear scan that applies the same prefix and
+trigram matching to every animal and adjective, and reports the latency of each.
+
+Usage:
+    python -m benchmarks.search_benchmark [--entries 100000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsSnapshot
+from db.search_index import FUZZY_THRESHOLD, _fold, _trigrams
+
+SYLLABLES = [c + v for c in "bcdfghjklmnprstvwz" for v in "aeiou"]
+SUFFIXES = ("ine", "ian", "al", "ous", "id")
+
+
+def word(rng: random.Random, syllables: tuple[int, int]) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(*syllables)))
+
+
+def dataset(entries: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """Returns about `entries` distinct animal names and one adjective per 20 animals."""
+    rng = random.Random(seed)
+    animals: dict[str, None] = {}
+    while len(animals) < entries:
+        name = word(rng, (2, 4)).capitalize()
+        if rng.random() < 0.3:
+            name = f"{word(rng, (2, 3)).capitalize()} {name.lower()}"
+        animals[name] = None
+    adjectives = {word(rng, (1, 3)) + rng.choice(SUFFIXES): None for _ in range(entries // 20)}
+    return list(animals), list(adjectives)
+
+
+def misspell(rng: random.Random, text: str) -> str:
+    """Swaps two adjacent letters, or drops one."""
+    i = rng.randrange(len(text) - 1)
+    if rng.random() < 0.5:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+    return text[:i] + text[i + 1 :]
+
+
+def linear_search(snapshot: AnimalsSnapshot, query: str, limit: int = 20) -> list[str]:
+    """Applies the index's matching rules to every term, the way a search without it would."""
+    folded = _fold(query)
+    terms = list(snapshot.animal_images_local_paths) + list(
+        snapshot.collateral_adjectives_to_animals
+    )
+    scores = {}
+    for term in terms:
+        if any(word.startswith(folded) for word in _fold(term).split(" ")):
+            scores[term] = 1.0
+    if not scores:
+        grams = _trigrams(folded)
+        for term in terms:
+            term_grams = _trigrams(_fold(term))
+            common = len(grams & term_grams)
+            score = common / (len(grams) + len(term_grams) - common)
+            if score >= FUZZY_THRESHOLD:
+                scores.setdefault(term, score)
+    return sorted(scores, key=lambda term: -scores[term])[:limit]
+
+
+def latencies(search: Callable[[str], list], queries: list[str]) -> list[float]:
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-queries", type=int, default=10)
+    args = parser.parse_args()
+
+    animals, adjectives = dataset(args.entries)
+    rng = random.Random(1)
+    db = AnimalsInMemoryDB()
+    start = time.perf_counter()
+    with db.batch():
+        db.insert_many(
+            adjectives=[(rng.choice(adjectives), animal) for animal in animals],
+            local_paths=[(animal, f"/tmp/{animal}.jpg") for animal in animals],
+        )
+    print(
+        f"Inserted and published {len(animals)} animals and {len(adjectives)} adjectives "
+        f"in {time.perf_counter() - start:.2f} s"
+    )
+    snapshot = db.snapshot()
+    start = time.perf_counter()
+    _ = snapshot.search_view  # Built by the first search of each snapshot
+    print(f"Indexed them for the first search in {time.perf_counter() - start:.2f} s")
+
+    queries = {
+        "prefix": [_fold(rng.choice(animals))[:3] for _ in range(args.queries)],
+        "adjective": [rng.choice(adjectives) for _ in range(args.queries)],
+        "misspelled": [misspell(rng, rng.choice(animals)) for _ in range(args.queries)],
+    }
+    print(f"{'queries':>12} {'index p50 ms':>13} {'index p99 ms':>13} {'scan p50 ms':>12}")
+    for kind, batch in queries.items():
+        indexed = sorted(latencies(snapshot.search, batch))
+        scanned = latencies(lambda q: linear_search(snapshot, q), batch[: args.scan_queries])
+        print(
+            f"{kind:>12} {statistics.median(indexed) * 1000:>13.3f} "
+            f"{indexed[int(len(indexed) * 0.99) - 1] * 1000:>13.3f} "
+            f"{statistics.median(scanned) * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
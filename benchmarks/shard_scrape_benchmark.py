@@ -0,0 +1,58 @@
+"""Sharded scrape benchmark against a local stub server.
+
+Runs the full `scrape_data()` pipeline against StubWikipedia, whose animal pages are padded
+to a realistic size so parsing them is CPU-bound, and reports the wall time for each shard
+count. One shard is the single-process pipeline; with more, animal pages and images are
+scraped in that many worker processes. Shards only pay off with at least as many free cores.
+
+Usage:
+    python -m benchmarks.shard_scrape_benchmark [--animals 100] [--shards 1 2 4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import server
+from benchmarks.stub_server import StubWikipedia
+from scraper.checkpoint import Checkpoint
+
+
+async def run(stub: StubWikipedia, shards: int) -> float:
+    with tempfile.TemporaryDirectory() as image_dir:
+        os.environ["TMPDIR"] = image_dir  # Inherited by the shard processes
+        tempfile.tempdir = image_dir
+        checkpoint = Checkpoint(os.path.join(image_dir, "checkpoint.jsonl"))
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await server.scrape_data(stub.list_url, checkpoint, shards=shards)
+        elapsed = time.perf_counter() - start
+
+        tempfile.tempdir = None
+    scraped = len(server.db.snapshot().animal_images_local_paths)
+    assert scraped == len(stub.animals), f"only {scraped} animals were scraped"
+    return elapsed
+
+
+async def main(args: argparse.Namespace):
+    print(f"{os.cpu_count()} CPUs")
+    async with StubWikipedia(
+        animals=args.animals, latency=args.latency, page_size=args.page_size
+    ) as stub:
+        print(f"{'shards':>6} {'wall s':>8}")
+        for shards in args.shards:
+            print(f"{shards:>6} {await run(stub, shards):>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animals", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--page-size", type=int, default=300_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    asyncio.run(main(parser.parse_args()))
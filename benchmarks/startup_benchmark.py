@@ -0,0 +1,128 @@
+"""Startup benchmark of the `main.py` commands, based on `python -X importtime`.
+
+Imports the module each command starts from in a fresh interpreter with `-X importtime`
+and reports the best total import time over several runs, the heaviest packages it pulls
+in, and any package of the other command's stack that leaked in. Then starts
+`python main.py serve` on a seeded SQLite dataset and reports the time until its port
+accepts connections. Exits with status 1 if a command imports a stack it must not or the
+serve startup takes longer than `--max-startup` seconds, so startup regressions fail.
+
+Usage:
+    python -m benchmarks.startup_benchmark [--runs 5] [--max-startup 1.0]
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.homepage_load_benchmark import _free_port, seed_dataset
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRAPER_STACK = ("aiohttp", "bs4", "aiofiles")
+WEB_STACK = ("fastapi", "uvicorn", "jinja2", "starlette")
+
+# The module each command imports at startup, and the packages it must not import
+COMMANDS = {
+    "main.py": ("main", SCRAPER_STACK + WEB_STACK),
+    "serve": ("server", SCRAPER_STACK),
+    "scrape": ("scraper.pipeline", WEB_STACK),
+}
+
+
+def import_times(module: str) -> tuple[int, dict[str, int]]:
+    """Imports `module` in a fresh interpreter.
+
+    Returns:
+        tuple[int, dict[str, int]]: The total import time in microseconds, and the
+            cumulative import time of each top-level package it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name == f" {module}":  # Everything `module` imported is listed before it
+            return int(cumulative), packages
+        if not name.startswith("  "):  # Imported by the interpreter itself, e.g. `site`
+            packages.clear()
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative))
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def serve_startup(db_path: Path) -> float:
+    """Returns the seconds from starting `python main.py serve` until its port is open."""
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable, "main.py", "serve",
+            "--db-path", str(db_path), "--port", str(port),
+        ],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while server.poll() is None:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"`main.py serve` exited with status {server.returncode}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--animals", type=int, default=300)
+    parser.add_argument("--max-startup", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'command':>8} {'import ms':>10}  heaviest packages (ms)")
+    for command, (module, forbidden) in COMMANDS.items():
+        total, packages = min(
+            (import_times(module) for _ in range(args.runs)), key=lambda times: times[0]
+        )
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[: args.top]
+        print(
+            f"{command:>8} {total / 1000:>10.1f}  "
+            + ", ".join(f"{package} {us / 1000:.0f}" for package, us in heaviest)
+        )
+        leaked = sorted(set(forbidden) & set(packages))
+        if leaked:
+            print(f"{'':>8} imports {', '.join(leaked)}")
+            failed = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory, "animals.sqlite3")
+        seed_dataset(db_path, args.animals)
+        startup = min(serve_startup(db_path) for _ in range(args.runs))
+    print(f"`main.py serve` accepts connections after {startup:.3f} s")
+    if startup > args.max_startup:
+        print(f"Slower than {args.max_startup} s")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""A local stand-in for the Wikipedia pages the scrapers fetch.
+
+Serves a synthetic `List_of_animal_names` table, one page per animal with an infobox image,
+and the images themselves, each after an injected latency. The latency is exponentially
+distributed around the given mean unless `jitter` is off, so some responses are much
+slower than others. Animal pages can be padded with filler markup to about `page_size`
+bytes, so parsing them costs as much CPU as parsing a real article. Every request and the
+bytes sent are counted per path, so benchmarks and tests can check exactly what was fetched.
+"""
+
+import asyncio
+import random
+from collections import Counter
+
+from aiohttp import web
+
+LIST_PATH = "/wiki/List_of_animal_names"
+
+
+class StubWikipedia:
+    """An aiohttp server that imitates the parts of Wikipedia used by the scrapers.
+
+    Attributes:
+        requests (Counter): The number of requests received per path.
+        bytes_sent (Counter): The number of response body bytes sent per path.
+    """
+
+    def __init__(
+        self,
+        animals: int = 200,
+        latency: float = 0.05,
+        image_size: int = 20_000,
+        adjectives: int = 50,
+        page_size: int = 0,
+        jitter: bool = True,
+        seed: int = 0,
+    ):
+        self._animals = [f"Animal_{i}" for i in range(animals)]
+        self._latency = latency
+        self._image = b"\xff\xd8" + bytes(image_size)
+        self._adjectives = adjectives
+        filler = "<p>Lorem ipsum <a href='/wiki/x'>dolor</a> sit amet.</p>"
+        self._filler = filler * (page_size // len(filler))
+        self._jitter = jitter
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._base_url = ""
+        self.requests: Counter = Counter()
+        self.bytes_sent: Counter = Counter()
+
+    @property
+    def animals(self) -> list[str]:
+        return list(self._animals)
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def list_url(self) -> str:
+        return self._base_url + LIST_PATH
+
+    def page_url(self, animal: str) -> str:
+        return f"{self._base_url}/wiki/{animal}"
+
+    def image_url(self, animal: str) -> str:
+        return f"{self._base_url}/images/{animal}.jpg"
+
+    async def __aenter__(self) -> "StubWikipedia":
+        app = web.Application()
+        app.router.add_get(LIST_PATH, self._list_page)
+        app.router.add_get("/wiki/{animal}", self._animal_page)
+        app.router.add_get("/images/{image}", self._image_file)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self._base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._runner.cleanup()
+
+    async def _respond(self, request: web.Request):
+        self.requests[request.path] += 1
+        latency = self._latency
+        if self._jitter and latency:
+            latency = self._random.expovariate(1 / latency)
+        await asyncio.sleep(latency)
+
+    async def _list_page(self, request: web.Request) -> web.Response:
+        await self._respond(request)
+        rows = "".join(
+            f"<tr><td><a href='/wiki/{animal}'>{animal}</a></td>"
+            f"<td>adjective-{i % self._adjectives}</td></tr>"
+            for i, animal in enumerate(self._animals)
+        )
+        html = (
+            "<html><body><table class='wikitable sortable sticky-header'>"
+            "<tr><th>Animal</th><th>Collateral adjective</th></tr>"
+            f"{rows}</table></body></html>"
+        )
+        return self._sent(request, web.Response(text=html, content_type="text/html"))
+
+    async def _animal_page(self, request: web.Request) -> web.Response:
+        await self._respond(request)
+        animal = request.match_info["animal"]
+        host = self._base_url.split("//", 1)[1]
+        html = (
+            f"<html><body><h1>{animal}</h1><table class='infobox'><tr><td>"
+            f"<img src='//{host}/images/{animal}.jpg'></td></tr></table>"
+            f"{self._filler}</body></html>"
+        )
+        return self._sent(request, web.Response(text=html, content_type="text/html"))
+
+    async def _image_file(self, request: web.Request) -> web.Response:
+        await self._respond(request)
+        return self._sent(request, web.Response(body=self._image, content_type="image/jpeg"))
+
+    def _sent(self, request: web.Request, response: web.Response) -> web.Response:
+        self.bytes_sent[request.path] += len(response.body)
+        return response
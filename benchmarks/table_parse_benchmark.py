@@ -0,0 +1,143 @@
+"""Animal table parse time and memory benchmark over a synthetic `List_of_animal_names` page.
+
+Builds a page whose table has `--scale` times the rows of the real one, with the real
+table's seven columns, reference footnotes, line-broken and missing ("—") adjectives, and
+the lead and trailing sections of the article around it. Then reads the table with the
+BeautifulSoup tree the table scraper used to build, and with `read_animal_table()` on each
+installed parser backend, checks that they all read the same rows, and reports the time
+until the first row is available, the total parse time and the peak memory of each.
+
+Peak memory is measured with `tracemalloc`, which sees Python objects only; the lxml
+backend's own buffers are a few kilobytes, since it never builds a tree.
+
+Usage:
+    python -m benchmarks.table_parse_benchmark [--scale 10] [--runs 5]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+
+from bs4 import BeautifulSoup
+
+from scraper import table_reader
+from scraper.table_reader import TABLE_CLASS, TableRow, read_animal_table
+from scraper.table_scraper import AnimalTableScraper
+
+REAL_ROWS = 230  # Rows of the animal table on the real page
+COLUMN = AnimalTableScraper.COLLATERAL_ADJECTIVE_COLUMN
+EMPTY = AnimalTableScraper.EMPTY_COLUMN
+HEADERS = ("Animal", "Young", "Female", "Male", "Collective noun", COLUMN, "Culinary noun")
+FILLER = (
+    "<p>Lorem ipsum <a href='/wiki/Dolor' title='Dolor'>dolor</a> sit amet, consectetur "
+    "adipiscing elit.<sup class='reference'><a href='#cite_note-0'>[0]</a></sup></p>\n"
+)
+
+
+def synthetic_page(rows: int, seed: int = 0) -> str:
+    """Returns an article holding an animal table with `rows` rows."""
+    rng = random.Random(seed)
+
+    def cell(words: str) -> str:
+        if rng.random() < 0.3:
+            return f"<td>{EMPTY}\n</td>"
+        values = "<br />".join(f"{words}{rng.randrange(100)}" for _ in range(rng.randint(1, 3)))
+        reference = rng.randrange(500)
+        return (
+            f"<td>{values}<sup class='reference'><a href='#cite_note-{reference}'>"
+            f"[{reference}]</a></sup>\n</td>"
+        )
+
+    lines = ["<html><body>", FILLER * 40, f"<table class='{TABLE_CLASS}'>", "<tbody><tr>"]
+    lines += [f"<th>{header}\n</th>" for header in HEADERS]
+    lines.append("</tr>")
+    for i in range(rows):
+        animal = f"Animal {i}"
+        lines.append(
+            f"<tr>\n<td><a href='/wiki/Animal_{i}' title='{animal}'>{animal}</a>"
+            + (" <i>(list)</i>" if i % 7 == 0 else "")
+            + "\n</td>"
+            + "".join(cell(word) for word in ("cub", "cow", "bull", "herd"))
+            + cell("adjective-")
+            + cell("meat")
+            + "</tr>"
+        )
+    lines += ["</tbody></table>", FILLER * 1500, "</body></html>"]
+    return "\n".join(lines)
+
+
+def bs4_rows(html: str) -> Iterator[TableRow]:
+    """Reads the table the way the table scraper did before `read_animal_table()`."""
+    table = BeautifulSoup(html, "html.parser").find("table", class_=TABLE_CLASS)
+    headers = [header.text.strip() for header in table.find_all("th")]
+    column = headers.index(COLUMN)
+    for row in table.find_all("tr"):
+        cells = row.find_all(["td"])
+        if len(cells) <= column:
+            continue
+        link = cells[0].find("a")
+        if not link:
+            continue
+        cell = cells[column]
+        adjectives = (
+            []
+            if cell.get_text(strip=True) == EMPTY
+            else [text.strip() for text in cell.stripped_strings if text.strip()]
+        )
+        yield TableRow(link.text.strip(), link.get("href"), adjectives)
+
+
+def readers() -> dict[str, Callable[[str], Iterator[TableRow]]]:
+    found = {"bs4 tree": bs4_rows}
+    for backend in table_reader.BACKENDS:
+        if backend == "lxml" and table_reader.etree is None:
+            continue
+        found[f"stream {backend}"] = (
+            lambda html, backend=backend: read_animal_table(html, COLUMN, backend=backend)
+        )
+    return found
+
+
+def timed(read: Callable[[str], Iterator[TableRow]], html: str) -> tuple[float, float]:
+    """Returns the seconds until the first row is read and until the last one is."""
+    start = time.perf_counter()
+    rows = read(html)
+    next(rows)
+    first = time.perf_counter() - start
+    for _ in rows:
+        pass
+    return first, time.perf_counter() - start
+
+
+def peak_memory(read: Callable[[str], Iterator[TableRow]], html: str) -> int:
+    """Returns the peak bytes allocated while reading every row."""
+    tracemalloc.start()
+    try:
+        for _ in read(html):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    html = synthetic_page(REAL_ROWS * args.scale)
+    expected = list(bs4_rows(html))
+    print(f"{len(expected)} rows, {len(html) / 1e6:.1f} MB page")
+    print(f"{'reader':>18} {'first row ms':>13} {'total ms':>9} {'peak MiB':>9}")
+    for name, read in readers().items():
+        assert list(read(html)) == expected, f"{name} read different rows"
+        first, total = min(timed(read, html) for _ in range(args.runs))
+        peak = peak_memory(read, html)
+        print(f"{name:>18} {first * 1000:>13.1f} {total * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
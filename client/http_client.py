@@ -2,9 +2,14 @@
 
 import asyncio
 import logging
+from typing import Optional
+
 import aiohttp
 from yarl import URL
 
+DEFAULT_TIMEOUT = 30  # Seconds before a request is abandoned
+MIN_TIMEOUT = 0.001  # aiohttp treats a timeout of 0 as no timeout at all
+
 
 class AsyncHttpClient:
     """
@@ -28,23 +33,43 @@ class AsyncHttpClient:
         await self.session.close()
 
     async def fetch(
-        self, url: str, is_image=False
+        self,
+        url: str,
+        is_image=False,
+        enqueue=True,
+        final_url=False,
+        timeout: Optional[float] = None,
     ) -> tuple[str, str] | tuple[URL, bytes] | str:
-        """Fetch a URL and return its response or error."""
+        """Fetch a URL and return its response or error.
+
+        The response is also put on `queue` unless `enqueue` is False, for callers that
+        consume the returned value directly. With `final_url`, a text response is returned
+        with the URL it was served from after redirects instead of the requested one.
+        A `timeout` shorter than `DEFAULT_TIMEOUT`, e.g. the rest of a refresh's time
+        budget, abandons the request sooner.
+        """
         self._logger.debug(f"Fetching {url}")
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+        timeout = min(max(timeout, MIN_TIMEOUT), DEFAULT_TIMEOUT)
 
         try:
-            async with self.session.get(url, timeout=30) as response:
+            async with self.session.get(url, timeout=timeout) as response:
                 if is_image:
                     content = await response.read()
-                    self.queue.put_nowait((url, content))
+                    if enqueue:
+                        self.queue.put_nowait((url, content))
                     return response.url, content
                 text = await response.text()
                 self._logger.debug(f"Received response from {url}")
-                self.queue.put_nowait((url, text))
-                return url, text
+                if enqueue:
+                    self.queue.put_nowait((url, text))
+                return (str(response.url) if final_url else url), text
         except asyncio.TimeoutError:
-            self._logger.error(f"Timeout fetching {url}")
+            if timeout < DEFAULT_TIMEOUT:  # Cut off by the caller's deadline, as asked
+                self._logger.debug(f"Timeout fetching {url} after {timeout:.3f}s")
+            else:
+                self._logger.error(f"Timeout fetching {url}")
             return "Error: Timeout"
         except Exception as e:  # pylint: disable=broad-exception-caught
             self._logger.error(f"Failed to fetch {url}: {e}")
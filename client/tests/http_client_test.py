@@ -32,6 +32,17 @@ async def test_fetch_timeout():
             assert result == "Error: Timeout"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeout, expected", [(None, 30), (2.5, 2.5), (0, 0.001), (60, 30)])
+async def test_fetch_timeout_is_capped(timeout, expected):
+    url = "https://example.com"
+
+    with patch("aiohttp.ClientSession.get", side_effect=asyncio.TimeoutError()) as get:
+        async with AsyncHttpClient() as client:
+            await client.fetch(url, timeout=timeout)
+            assert get.call_args.kwargs["timeout"] == expected
+
+
 @pytest.mark.asyncio
 async def test_fetch_exception():
     url = "https://example.com"
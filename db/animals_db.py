@@ -3,31 +3,147 @@
 The database maintains mappings between animals and their associated collateral adjectives,
 image file paths, and image URLs. This can serve as a temporary storage solution for
 applications that require fast lookups and insertions without a persistent database.
+
+Internally every animal is interned to a small integer ID and stored once in a slotted
+record, so names, adjectives and image URLs are not duplicated across several dicts.
+
+Writers mutate the records under a lock and publish immutable snapshots; readers take the
+current snapshot without locking, so they never block and never observe a half-applied
+batch of writes.
 """
 
-from collections import defaultdict
+import sys
+from array import array
+from collections.abc import Iterable
+from types import MappingProxyType
+
+from db.animals_storage import AnimalsSnapshot, AnimalsStorage
+
+
+class _AnimalRecord:
+    """A compact, slotted record holding everything known about a single animal."""
+
+    __slots__ = ("name", "adjective_ids", "image_url", "local_path", "fetched_at")
 
+    def __init__(self, name: str):
+        self.name = name
+        self.adjective_ids: tuple[int, ...] = ()
+        self.image_url: str | None = None
+        self.local_path: str | None = None
+        self.fetched_at: float | None = None
 
-class AnimalsInMemoryDB:
+
+class AnimalsInMemoryDB(AnimalsStorage):
     """An in-memory database for managing animals, their associated collateral adjectives,
     and image information (both local file paths and URLs).
 
     Attributes:
-        _collateral_adjectives_to_animals (defaultdict[str, list[str]]):
-            A mapping of collateral adjectives to a list of corresponding animals.
-        _animal_images_local_paths (dict[str, str]):
-            A mapping of animal names to their corresponding local image file paths.
-        _animal_image_urls (dict[str, str]):
-            A mapping of image URLs to corresponding animal names.
+        _animal_ids (dict[str, int]):
+            A mapping of interned animal names to their animal IDs.
+        _animals (list[_AnimalRecord]):
+            The animal records, indexed by animal ID.
+        _adjective_ids (dict[str, int]):
+            A mapping of interned collateral adjectives to their adjective IDs.
+        _adjectives (list[str]):
+            The collateral adjectives, indexed by adjective ID.
+        _adjective_members (list[array]):
+            The animal IDs associated with each adjective, in insertion order.
+        _image_url_index (dict[str, int]):
+            A mapping of image URLs to the ID of the animal shown in the image.
+        _snapshot (AnimalsSnapshot):
+            The most recently published snapshot.
     """
 
     def __init__(self):
         """Initializes the in-memory database with empty data structures."""
-        self._collateral_adjectives_to_animals: defaultdict[str, list[str]] = (
-            defaultdict(list)
-        )
-        self._animal_images_local_paths: dict[str, str] = {}
-        self._animal_image_urls: dict[str, str] = {}
+        super().__init__()
+        self._animal_ids: dict[str, int] = {}
+        self._animals: list[_AnimalRecord] = []
+        self._adjective_ids: dict[str, int] = {}
+        self._adjectives: list[str] = []
+        self._adjective_members: list[array] = []
+        self._image_url_index: dict[str, int] = {}
+        self._snapshot = AnimalsSnapshot()
+
+    def reset(self):
+        """Discards all unpublished and published records from the writer state.
+
+        The current snapshot stays visible to readers until the next `publish()`.
+        """
+        with self._lock:
+            self._animal_ids = {}
+            self._animals = []
+            self._adjective_ids = {}
+            self._adjectives = []
+            self._adjective_members = []
+            self._image_url_index = {}
+
+    def abort(self):
+        """Discards every write applied since the last `publish()`.
+
+        The records are rebuilt from the current snapshot.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            self.reset()
+            self.insert_many(
+                adjectives=(
+                    (adjective, animal)
+                    for adjective, animals in snapshot.collateral_adjectives_to_animals.items()
+                    for animal in animals
+                ),
+                image_urls=snapshot.animal_image_urls.items(),
+                local_paths=snapshot.animal_images_local_paths.items(),
+                fetched_at=snapshot.animal_fetched_at.items(),
+            )
+
+    def snapshot(self) -> AnimalsSnapshot:
+        """Returns the most recently published snapshot without taking any lock."""
+        return self._snapshot
+
+    def publish(self) -> AnimalsSnapshot:
+        """Makes every write applied so far visible to readers as a new snapshot.
+
+        Returns:
+            AnimalsSnapshot: The newly published snapshot.
+        """
+        with self._lock:
+            snapshot = AnimalsSnapshot(
+                collateral_adjectives_to_animals=MappingProxyType(
+                    {
+                        adjective: tuple(animals)
+                        for adjective, animals in self.collateral_adjectives_to_animals.items()
+                    }
+                ),
+                animal_image_urls=MappingProxyType(self.animal_image_urls),
+                animal_images_local_paths=MappingProxyType(
+                    self.animal_images_local_paths
+                ),
+                animal_fetched_at=MappingProxyType(self.animal_fetched_at),
+                generation=self._snapshot.generation + 1,
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def _intern_animal(self, animal_name: str) -> int:
+        """Returns the ID of an animal, creating its record on first sight."""
+        animal_id = self._animal_ids.get(animal_name)
+        if animal_id is None:
+            animal_id = len(self._animals)
+            self._animal_ids[animal_name] = animal_id
+            self._animals.append(_AnimalRecord(animal_name))
+        return animal_id
+
+    def _intern_adjective(self, adjective: str) -> int:
+        """Returns the ID of a collateral adjective, registering it on first sight."""
+        adjective_id = self._adjective_ids.get(adjective)
+        if adjective_id is None:
+            adjective = sys.intern(adjective)
+            adjective_id = len(self._adjectives)
+            self._adjective_ids[adjective] = adjective_id
+            self._adjectives.append(adjective)
+            self._adjective_members.append(array("I"))
+        return adjective_id
 
     def insert_image_url(self, image_url: str, animal_name: str):
         """Inserts an image URL and associates it with a specific animal.
@@ -36,7 +152,21 @@ class AnimalsInMemoryDB:
             image_url (str): The URL of the animal image.
             animal_name (str): The name of the animal in the image.
         """
-        self._animal_image_urls[image_url] = animal_name
+        with self._lock:
+            self._set_image_url(image_url, animal_name)
+
+    def _set_image_url(self, image_url: str, animal_name: str):
+        animal_id = self._intern_animal(animal_name)
+        record = self._animals[animal_id]
+
+        previous_id = self._image_url_index.get(image_url)
+        if previous_id is not None and previous_id != animal_id:
+            self._animals[previous_id].image_url = None
+        if record.image_url is not None and record.image_url != image_url:
+            del self._image_url_index[record.image_url]
+
+        record.image_url = image_url
+        self._image_url_index[image_url] = animal_id
 
     def get_animal_name_by_url(self, image_url: str) -> str | None:
         """Retrieves the animal name associated with a given image URL.
@@ -47,7 +177,11 @@ class AnimalsInMemoryDB:
         Returns:
             str | None: The name of the animal if found, otherwise None.
         """
-        return self._animal_image_urls.get(image_url)
+        with self._lock:
+            animal_id = self._image_url_index.get(image_url)
+            if animal_id is None:
+                return None
+            return self._animals[animal_id].name
 
     def insert_image_local_path(self, animal_name: str, local_path: str):
         """Stores the local file path of an animal's image.
@@ -56,7 +190,24 @@ class AnimalsInMemoryDB:
             animal_name (str): The name of the animal.
             local_path (str): The local file path of the image.
         """
-        self._animal_images_local_paths[animal_name] = local_path
+        with self._lock:
+            self._set_local_path(animal_name, local_path)
+
+    def _set_local_path(self, animal_name: str, local_path: str):
+        self._animals[self._intern_animal(animal_name)].local_path = local_path
+
+    def insert_fetched_at(self, animal_name: str, fetched_at: float):
+        """Records when an animal's page was last fetched.
+
+        Args:
+            animal_name (str): The name of the animal.
+            fetched_at (float): The Unix time the page was fetched at.
+        """
+        with self._lock:
+            self._set_fetched_at(animal_name, fetched_at)
+
+    def _set_fetched_at(self, animal_name: str, fetched_at: float):
+        self._animals[self._intern_animal(animal_name)].fetched_at = fetched_at
 
     def insert_animal_to_collateral_adjectives(self, adjective: str, animal: str):
         """Associates an animal with a collateral adjective.
@@ -65,43 +216,93 @@ class AnimalsInMemoryDB:
             adjective (str): The collateral adjective.
             animal (str): The name of the animal.
         """
-        self._collateral_adjectives_to_animals[adjective].append(animal)
-
-    def get_all_data(self):
-        """Prints all stored data in a structured and readable format."""
-        print("=== Animals In Memory Database ===\n")
-
-        print("📌 Collateral Adjectives to Animals:")
-        if self._collateral_adjectives_to_animals:
-            for adjective, animals in self._collateral_adjectives_to_animals.items():
-                print(f"  - {adjective}: {', '.join(animals)}")
-        else:
-            print("  (No data)")
-
-        print("\n📌 Animal Images (Local Paths):")
-        if self._animal_images_local_paths:
-            for animal, path in self._animal_images_local_paths.items():
-                print(f"  - {animal}: {path}")
-        else:
-            print("  (No data)")
-
-        print("\n📌 Animal Image URLs:")
-        if self._animal_image_urls:
-            for url, animal in self._animal_image_urls.items():
-                print(f"  - {animal}: {url}")
-        else:
-            print("  (No data)")
-
-        print("\n===================================")
+        with self._lock:
+            self._add_adjective(adjective, animal)
+
+    def _add_adjective(self, adjective: str, animal: str):
+        animal_id = self._intern_animal(animal)
+        adjective_id = self._intern_adjective(adjective)
+        self._adjective_members[adjective_id].append(animal_id)
+
+        record = self._animals[animal_id]
+        if adjective_id not in record.adjective_ids:
+            record.adjective_ids += (adjective_id,)
+
+    def insert_many(
+        self,
+        adjectives: Iterable[tuple[str, str]] = (),
+        image_urls: Iterable[tuple[str, str]] = (),
+        local_paths: Iterable[tuple[str, str]] = (),
+        fetched_at: Iterable[tuple[str, float]] = (),
+    ):
+        """Applies several writes while taking the writer lock only once.
+
+        Args:
+            adjectives (Iterable[tuple[str, str]]): `(adjective, animal)` pairs.
+            image_urls (Iterable[tuple[str, str]]): `(image_url, animal_name)` pairs.
+            local_paths (Iterable[tuple[str, str]]): `(animal_name, local_path)` pairs.
+            fetched_at (Iterable[tuple[str, float]]): `(animal_name, fetched_at)` pairs.
+        """
+        with self._lock:
+            for adjective, animal in adjectives:
+                self._add_adjective(adjective, animal)
+            for image_url, animal_name in image_urls:
+                self._set_image_url(image_url, animal_name)
+            for animal_name, local_path in local_paths:
+                self._set_local_path(animal_name, local_path)
+            for animal_name, timestamp in fetched_at:
+                self._set_fetched_at(animal_name, timestamp)
+
+    def get_animal_adjectives(self, animal_name: str) -> list[str]:
+        """Retrieves the collateral adjectives associated with an animal.
+
+        Args:
+            animal_name (str): The name of the animal.
+
+        Returns:
+            list[str]: The animal's collateral adjectives, empty if it is unknown.
+        """
+        with self._lock:
+            animal_id = self._animal_ids.get(animal_name)
+            if animal_id is None:
+                return []
+            return [
+                self._adjectives[adjective_id]
+                for adjective_id in self._animals[animal_id].adjective_ids
+            ]
+
+    @property
+    def collateral_adjectives_to_animals(self) -> dict[str, list[str]]:
+        with self._lock:
+            animals = self._animals
+            return {
+                adjective: [animals[animal_id].name for animal_id in members]
+                for adjective, members in zip(self._adjectives, self._adjective_members)
+            }
 
     @property
-    def collateral_adjectives_to_animals(self):
-        return self._collateral_adjectives_to_animals
+    def animal_image_urls(self) -> dict[str, str]:
+        with self._lock:
+            animals = self._animals
+            return {
+                image_url: animals[animal_id].name
+                for image_url, animal_id in self._image_url_index.items()
+            }
 
     @property
-    def animal_image_urls(self):
-        return self._animal_image_urls
+    def animal_images_local_paths(self) -> dict[str, str]:
+        with self._lock:
+            return {
+                record.name: record.local_path
+                for record in self._animals
+                if record.local_path is not None
+            }
 
     @property
-    def animal_images_local_paths(self):
-        return self._animal_images_local_paths
+    def animal_fetched_at(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                record.name: record.fetched_at
+                for record in self._animals
+                if record.fetched_at is not None
+            }
@@ -0,0 +1,445 @@
+"""This module implements a persistent SQLite database for managing animal-related data.
+
+It stores the same data as `AnimalsInMemoryDB`, but in a single SQLite file running in
+WAL mode, so several worker processes can share one dataset and it survives restarts.
+
+Writes go to staging tables private to the writer's connection (SQLite `TEMP` tables), each
+batch in its own short transaction, so a scrape never holds the database's write lock.
+`publish()` copies the staging tables over the published ones in one transaction; readers
+use their own per-thread connections and, thanks to WAL, only ever see published snapshots
+without blocking the writer. Opening a database whose schema is up to date writes nothing.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import MappingProxyType
+
+from db.animals_storage import AnimalsSnapshot, AnimalsStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS animals (
+    name TEXT PRIMARY KEY,
+    image_url TEXT UNIQUE,
+    local_path TEXT,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS collateral_adjectives (
+    id INTEGER PRIMARY KEY,
+    adjective TEXT NOT NULL,
+    animal TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS collateral_adjectives_adjective
+    ON collateral_adjectives (adjective);
+CREATE INDEX IF NOT EXISTS collateral_adjectives_animal
+    ON collateral_adjectives (animal);
+CREATE TABLE IF NOT EXISTS generation (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO generation (id, value) VALUES (0, 0);
+"""
+TABLES = {"animals", "collateral_adjectives", "generation"}
+
+STAGING_SCHEMA = """
+CREATE TEMP TABLE staging_animals (
+    name TEXT PRIMARY KEY,
+    image_url TEXT UNIQUE,
+    local_path TEXT,
+    fetched_at REAL
+);
+CREATE TEMP TABLE staging_adjectives (
+    id INTEGER PRIMARY KEY,
+    adjective TEXT NOT NULL,
+    animal TEXT NOT NULL
+);
+CREATE INDEX temp.staging_adjectives_animal ON staging_adjectives (animal);
+"""
+COPY_PUBLISHED = (
+    "INSERT INTO staging_animals (name, image_url, local_path, fetched_at) "
+    "SELECT name, image_url, local_path, fetched_at FROM main.animals ORDER BY rowid",
+    "INSERT INTO staging_adjectives (adjective, animal) "
+    "SELECT adjective, animal FROM main.collateral_adjectives ORDER BY id",
+)
+PUBLISH_STAGED = (
+    "DELETE FROM main.collateral_adjectives",
+    "DELETE FROM main.animals",
+    "INSERT INTO main.animals (name, image_url, local_path, fetched_at) "
+    "SELECT name, image_url, local_path, fetched_at FROM staging_animals ORDER BY rowid",
+    "INSERT INTO main.collateral_adjectives (adjective, animal) "
+    "SELECT adjective, animal FROM staging_adjectives ORDER BY id",
+    "UPDATE main.generation SET value = value + 1",
+)
+
+DETACH_IMAGE_URL = "UPDATE staging_animals SET image_url = NULL WHERE image_url = ? AND name <> ?"
+UPSERT_IMAGE_URL = (
+    "INSERT INTO staging_animals (name, image_url) VALUES (?, ?) "
+    "ON CONFLICT (name) DO UPDATE SET image_url = excluded.image_url"
+)
+UPSERT_LOCAL_PATH = (
+    "INSERT INTO staging_animals (name, local_path) VALUES (?, ?) "
+    "ON CONFLICT (name) DO UPDATE SET local_path = excluded.local_path"
+)
+UPSERT_FETCHED_AT = (
+    "INSERT INTO staging_animals (name, fetched_at) VALUES (?, ?) "
+    "ON CONFLICT (name) DO UPDATE SET fetched_at = excluded.fetched_at"
+)
+INSERT_ADJECTIVE = "INSERT INTO staging_adjectives (adjective, animal) VALUES (?, ?)"
+
+
+class AnimalsSQLiteDB(AnimalsStorage):
+    """A SQLite-backed database for managing animals, their associated collateral
+    adjectives, and image information (both local file paths and URLs).
+
+    Attributes:
+        _path (Path): The location of the SQLite database file.
+        _writer (sqlite3.Connection): The connection used for all writes, which owns the
+            staging tables.
+        _readers (threading.local): Per-thread connections used by `snapshot()`.
+        _snapshot (AnimalsSnapshot): The most recently loaded snapshot.
+    """
+
+    def __init__(self, path: str | Path, busy_timeout: float = 30.0):
+        """Opens (and creates, if needed) the database file.
+
+        Args:
+            path (str | Path): The location of the SQLite database file.
+            busy_timeout (float): Seconds to wait for another process's write lock.
+        """
+        super().__init__()
+        self._path = Path(path)
+        self._busy_timeout = busy_timeout
+        self._writer = self._connect(check_same_thread=False)
+        self._ensure_schema()
+        self._staged = False  # Whether the staging tables exist on the writer connection
+        self._readers = threading.local()
+        self._snapshot = AnimalsSnapshot()
+
+    def _ensure_schema(self):
+        """Creates or upgrades the schema, without writing if it is already up to date.
+
+        Every worker opens the database, possibly while another process is publishing,
+        so the common case must not wait for the write lock.
+        """
+        (journal_mode,) = self._writer.execute("PRAGMA journal_mode").fetchone()
+        if journal_mode != "wal":
+            self._writer.execute("PRAGMA journal_mode = WAL")
+        if self._schema_is_current():
+            return
+        with self._transaction():
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self._writer.execute(statement)
+            self._migrate()
+
+    def _schema_is_current(self) -> bool:
+        tables = {
+            name
+            for (name,) in self._writer.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        return TABLES <= tables and "fetched_at" in self._columns("animals")
+
+    def _columns(self, table: str) -> set[str]:
+        return {row[1] for row in self._writer.execute(f"PRAGMA table_info({table})")}
+
+    def _migrate(self):
+        """Adds the columns introduced after a database file was created."""
+        if "fetched_at" not in self._columns("animals"):
+            self._writer.execute("ALTER TABLE animals ADD COLUMN fetched_at REAL")
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout,
+            isolation_level=None,  # Transactions are managed explicitly
+            check_same_thread=check_same_thread,
+        )
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    @contextmanager
+    def _transaction(self, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+        """Runs the enclosed writer statements in one transaction, rolled back on errors."""
+        self._writer.execute(f"BEGIN {mode}")
+        try:
+            yield self._writer
+        except BaseException:
+            self._writer.execute("ROLLBACK")
+            raise
+        self._writer.execute("COMMIT")
+
+    def _stage(self, copy_published: bool = True):
+        """Creates the writer's staging tables on first use.
+
+        Args:
+            copy_published (bool): Fill them with the published data, which writes then
+                update, rather than leave them empty.
+        """
+        if self._staged:
+            return
+        with self._transaction("DEFERRED") as writer:  # Only takes a read lock on the file
+            for statement in STAGING_SCHEMA.split(";"):
+                if statement.strip():
+                    writer.execute(statement)
+            if copy_published:
+                for statement in COPY_PUBLISHED:
+                    writer.execute(statement)
+        self._staged = True
+
+    def close(self):
+        """Discards unpublished writes and closes the writer connection."""
+        with self._lock:
+            self._writer.close()
+
+    def reset(self):
+        """Deletes all records from the writer's staging tables.
+
+        The current snapshot stays visible to readers until the next `publish()`.
+        """
+        with self._lock:
+            if not self._staged:
+                self._stage(copy_published=False)
+                return
+            with self._transaction("DEFERRED") as writer:
+                writer.execute("DELETE FROM staging_adjectives")
+                writer.execute("DELETE FROM staging_animals")
+
+    def abort(self):
+        """Rolls back any open transaction and drops the writer's staging tables.
+
+        They are filled with the published data again on their next use.
+        """
+        with self._lock:
+            if self._writer.in_transaction:
+                self._writer.execute("ROLLBACK")
+            if self._staged:
+                with self._transaction("DEFERRED") as writer:
+                    writer.execute("DROP TABLE temp.staging_adjectives")
+                    writer.execute("DROP TABLE temp.staging_animals")
+                self._staged = False
+
+    def publish(self) -> AnimalsSnapshot:
+        """Replaces the published data with the staged data in one short transaction.
+
+        Returns:
+            AnimalsSnapshot: The newly published snapshot.
+        """
+        with self._lock:
+            self._stage()
+            with self._transaction() as writer:
+                for statement in PUBLISH_STAGED:
+                    writer.execute(statement)
+        return self.snapshot()
+
+    def snapshot(self) -> AnimalsSnapshot:
+        """Returns the most recently committed snapshot.
+
+        The snapshot is cached and only reloaded when another connection, possibly in
+        another process, has published a newer generation.
+        """
+        reader = self._reader()
+        reader.execute("BEGIN")
+        try:
+            (generation,) = reader.execute("SELECT value FROM generation").fetchone()
+            snapshot = self._snapshot
+            if snapshot.generation != generation:
+                snapshot = self._load_snapshot(reader, generation)
+                self._snapshot = snapshot
+        finally:
+            reader.execute("COMMIT")
+        return snapshot
+
+    def _reader(self) -> sqlite3.Connection:
+        reader = getattr(self._readers, "connection", None)
+        if reader is None:
+            reader = self._readers.connection = self._connect()
+        return reader
+
+    @staticmethod
+    def _load_snapshot(reader: sqlite3.Connection, generation: int) -> AnimalsSnapshot:
+        collateral_adjectives_to_animals: dict[str, list[str]] = {}
+        for adjective, animal in reader.execute(
+            "SELECT adjective, animal FROM collateral_adjectives ORDER BY id"
+        ):
+            collateral_adjectives_to_animals.setdefault(adjective, []).append(animal)
+
+        animal_image_urls = {}
+        animal_images_local_paths = {}
+        animal_fetched_at = {}
+        for name, image_url, local_path, fetched_at in reader.execute(
+            "SELECT name, image_url, local_path, fetched_at FROM animals ORDER BY rowid"
+        ):
+            if image_url is not None:
+                animal_image_urls[image_url] = name
+            if local_path is not None:
+                animal_images_local_paths[name] = local_path
+            if fetched_at is not None:
+                animal_fetched_at[name] = fetched_at
+
+        return AnimalsSnapshot(
+            collateral_adjectives_to_animals=MappingProxyType(
+                {
+                    adjective: tuple(animals)
+                    for adjective, animals in collateral_adjectives_to_animals.items()
+                }
+            ),
+            animal_image_urls=MappingProxyType(animal_image_urls),
+            animal_images_local_paths=MappingProxyType(animal_images_local_paths),
+            animal_fetched_at=MappingProxyType(animal_fetched_at),
+            generation=generation,
+        )
+
+    def insert_image_url(self, image_url: str, animal_name: str):
+        """Inserts an image URL and associates it with a specific animal.
+
+        Args:
+            image_url (str): The URL of the animal image.
+            animal_name (str): The name of the animal in the image.
+        """
+        self.insert_many(image_urls=[(image_url, animal_name)])
+
+    def get_animal_name_by_url(self, image_url: str) -> str | None:
+        """Retrieves the animal name associated with a given image URL.
+
+        Unpublished writes are included, so scrapers can read back their own inserts.
+
+        Args:
+            image_url (str): The URL of the animal image.
+
+        Returns:
+            str | None: The name of the animal if found, otherwise None.
+        """
+        with self._lock:
+            self._stage()
+            row = self._writer.execute(
+                "SELECT name FROM staging_animals WHERE image_url = ?", (image_url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def insert_image_local_path(self, animal_name: str, local_path: str):
+        """Stores the local file path of an animal's image.
+
+        Args:
+            animal_name (str): The name of the animal.
+            local_path (str): The local file path of the image.
+        """
+        self.insert_many(local_paths=[(animal_name, local_path)])
+
+    def insert_fetched_at(self, animal_name: str, fetched_at: float):
+        """Records when an animal's page was last fetched.
+
+        Args:
+            animal_name (str): The name of the animal.
+            fetched_at (float): The Unix time the page was fetched at.
+        """
+        self.insert_many(fetched_at=[(animal_name, fetched_at)])
+
+    def insert_animal_to_collateral_adjectives(self, adjective: str, animal: str):
+        """Associates an animal with a collateral adjective.
+
+        Args:
+            adjective (str): The collateral adjective.
+            animal (str): The name of the animal.
+        """
+        self.insert_many(adjectives=[(adjective, animal)])
+
+    def insert_many(
+        self,
+        adjectives: Iterable[tuple[str, str]] = (),
+        image_urls: Iterable[tuple[str, str]] = (),
+        local_paths: Iterable[tuple[str, str]] = (),
+        fetched_at: Iterable[tuple[str, float]] = (),
+    ):
+        """Applies several writes with one `executemany` per statement.
+
+        Args:
+            adjectives (Iterable[tuple[str, str]]): `(adjective, animal)` pairs.
+            image_urls (Iterable[tuple[str, str]]): `(image_url, animal_name)` pairs.
+            local_paths (Iterable[tuple[str, str]]): `(animal_name, local_path)` pairs.
+            fetched_at (Iterable[tuple[str, float]]): `(animal_name, fetched_at)` pairs.
+        """
+        adjectives = list(adjectives)
+        image_urls = list(dict(image_urls).items())  # The last owner of a URL wins
+        local_paths = list(local_paths)
+        fetched_at = list(fetched_at)
+
+        with self._lock:
+            self._stage()
+            with self._transaction("DEFERRED") as writer:  # Staging tables only
+                if adjectives:
+                    writer.executemany(INSERT_ADJECTIVE, adjectives)
+                if image_urls:
+                    writer.executemany(DETACH_IMAGE_URL, image_urls)
+                    writer.executemany(
+                        UPSERT_IMAGE_URL, [(name, url) for url, name in image_urls]
+                    )
+                if local_paths:
+                    writer.executemany(UPSERT_LOCAL_PATH, local_paths)
+                if fetched_at:
+                    writer.executemany(UPSERT_FETCHED_AT, fetched_at)
+
+    def get_animal_adjectives(self, animal_name: str) -> list[str]:
+        """Retrieves the collateral adjectives associated with an animal.
+
+        Args:
+            animal_name (str): The name of the animal.
+
+        Returns:
+            list[str]: The animal's collateral adjectives, empty if it is unknown.
+        """
+        with self._lock:
+            self._stage()
+            rows = self._writer.execute(
+                "SELECT adjective FROM staging_adjectives WHERE animal = ? "
+                "GROUP BY adjective ORDER BY MIN(id)",
+                (animal_name,),
+            ).fetchall()
+        return [adjective for (adjective,) in rows]
+
+    @property
+    def collateral_adjectives_to_animals(self) -> dict[str, list[str]]:
+        collateral_adjectives_to_animals: dict[str, list[str]] = {}
+        with self._lock:
+            self._stage()
+            for adjective, animal in self._writer.execute(
+                "SELECT adjective, animal FROM staging_adjectives ORDER BY id"
+            ):
+                collateral_adjectives_to_animals.setdefault(adjective, []).append(animal)
+        return collateral_adjectives_to_animals
+
+    @property
+    def animal_image_urls(self) -> dict[str, str]:
+        with self._lock:
+            self._stage()
+            return dict(
+                self._writer.execute(
+                    "SELECT image_url, name FROM staging_animals "
+                    "WHERE image_url IS NOT NULL ORDER BY rowid"
+                )
+            )
+
+    @property
+    def animal_images_local_paths(self) -> dict[str, str]:
+        with self._lock:
+            self._stage()
+            return dict(
+                self._writer.execute(
+                    "SELECT name, local_path FROM staging_animals "
+                    "WHERE local_path IS NOT NULL ORDER BY rowid"
+                )
+            )
+
+    @property
+    def animal_fetched_at(self) -> dict[str, float]:
+        with self._lock:
+            self._stage()
+            return dict(
+                self._writer.execute(
+                    "SELECT name, fetched_at FROM staging_animals "
+                    "WHERE fetched_at IS NOT NULL ORDER BY rowid"
+                )
+            )
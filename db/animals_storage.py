@@ -0,0 +1,261 @@
+"""This module defines the storage-engine interface shared by the animal databases.
+
+Every engine stores the same data (collateral adjectives, image URLs, local image paths and
+the time its page was last fetched per animal) and follows the same visibility rules: writes
+are applied to the writer's view immediately, and become visible to readers only when they
+are published as a snapshot.
+"""
+
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Optional
+
+from db.search_index import (
+    ANIMAL,
+    DEFAULT_SEARCH_LIMIT,
+    SearchResult,
+    SearchView,
+    build_search_view,
+)
+
+_search_view_lock = threading.Lock()  # Builds each snapshot's search index once
+
+
+def _empty_mapping() -> Mapping:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class AnimalsSnapshot:
+    """An immutable, point-in-time view of the database for readers.
+
+    Attributes:
+        collateral_adjectives_to_animals (Mapping[str, tuple[str, ...]]):
+            A mapping of collateral adjectives to the animals associated with them.
+        animal_image_urls (Mapping[str, str]):
+            A mapping of image URLs to corresponding animal names.
+        animal_images_local_paths (Mapping[str, str]):
+            A mapping of animal names to their corresponding local image file paths.
+        animal_fetched_at (Mapping[str, float]):
+            A mapping of animal names to when their page was last fetched, as a Unix time.
+        generation (int): The number of snapshots published before this one.
+        _search_view (Optional[SearchView]): The index behind `search_view`, once built.
+    """
+
+    collateral_adjectives_to_animals: Mapping[str, tuple[str, ...]] = field(
+        default_factory=_empty_mapping
+    )
+    animal_image_urls: Mapping[str, str] = field(default_factory=_empty_mapping)
+    animal_images_local_paths: Mapping[str, str] = field(
+        default_factory=_empty_mapping
+    )
+    animal_fetched_at: Mapping[str, float] = field(default_factory=_empty_mapping)
+    generation: int = 0
+    _search_view: Optional[SearchView] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def search_view(self) -> SearchView:
+        """The animals and adjectives of this snapshot, indexed on the first search.
+
+        Only processes that search build it, so writers and shard workers never pay for
+        the index, and it is dropped with the snapshot it belongs to.
+        """
+        if self._search_view is None:
+            with _search_view_lock:
+                if self._search_view is None:
+                    animals = itertools.chain(
+                        itertools.chain.from_iterable(
+                            self.collateral_adjectives_to_animals.values()
+                        ),
+                        self.animal_image_urls.values(),
+                        self.animal_images_local_paths,
+                        self.animal_fetched_at,
+                    )
+                    view = build_search_view(animals, self.collateral_adjectives_to_animals)
+                    object.__setattr__(self, "_search_view", view)  # Frozen otherwise
+        return self._search_view
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[SearchResult]:
+        """Finds the animals and collateral adjectives starting with or resembling `query`.
+
+        Args:
+            query (str): The text to search for, compared case-insensitively.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[SearchResult]: The best matches first, each with its animals.
+        """
+        return [
+            replace(
+                result,
+                animals=(
+                    (result.term,)
+                    if result.kind == ANIMAL
+                    else self.collateral_adjectives_to_animals.get(result.term, ())
+                ),
+            )
+            for result in self.search_view.search(query, limit)
+        ]
+
+
+class AnimalsStorage(ABC):
+    """Base class for animal storage engines.
+
+    Attributes:
+        _lock (threading.RLock):
+            Serializes writers; never taken by `snapshot()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    @abstractmethod
+    def insert_image_url(self, image_url: str, animal_name: str):
+        """Inserts an image URL and associates it with a specific animal."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_animal_name_by_url(self, image_url: str) -> str | None:
+        """Retrieves the animal name associated with a given image URL."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_image_local_path(self, animal_name: str, local_path: str):
+        """Stores the local file path of an animal's image."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_animal_to_collateral_adjectives(self, adjective: str, animal: str):
+        """Associates an animal with a collateral adjective."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_fetched_at(self, animal_name: str, fetched_at: float):
+        """Records when an animal's page was last fetched, as a Unix time."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_animal_adjectives(self, animal_name: str) -> list[str]:
+        """Retrieves the collateral adjectives associated with an animal."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self):
+        """Discards all records from the writer state, keeping the current snapshot."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def abort(self):
+        """Discards every write applied since the last `publish()`, e.g. after a failed scrape.
+
+        The writer state goes back to the current snapshot, which readers keep seeing.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def snapshot(self) -> AnimalsSnapshot:
+        """Returns the most recently published snapshot."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish(self) -> AnimalsSnapshot:
+        """Makes every write applied so far visible to readers as a new snapshot."""
+        raise NotImplementedError
+
+    def insert_many(
+        self,
+        adjectives: Iterable[tuple[str, str]] = (),
+        image_urls: Iterable[tuple[str, str]] = (),
+        local_paths: Iterable[tuple[str, str]] = (),
+        fetched_at: Iterable[tuple[str, float]] = (),
+    ):
+        """Applies several writes at once, holding the writer lock only once.
+
+        Args:
+            adjectives (Iterable[tuple[str, str]]): `(adjective, animal)` pairs.
+            image_urls (Iterable[tuple[str, str]]): `(image_url, animal_name)` pairs.
+            local_paths (Iterable[tuple[str, str]]): `(animal_name, local_path)` pairs.
+            fetched_at (Iterable[tuple[str, float]]): `(animal_name, fetched_at)` pairs.
+        """
+        with self._lock:
+            for adjective, animal in adjectives:
+                self.insert_animal_to_collateral_adjectives(adjective, animal)
+            for image_url, animal_name in image_urls:
+                self.insert_image_url(image_url, animal_name)
+            for animal_name, local_path in local_paths:
+                self.insert_image_local_path(animal_name, local_path)
+            for animal_name, timestamp in fetched_at:
+                self.insert_fetched_at(animal_name, timestamp)
+
+    @contextmanager
+    def batch(self) -> Iterator["AnimalsStorage"]:
+        """Groups writes so that readers see all of them at once, or none of them.
+
+        Other writers are blocked for the duration of the batch, and a new snapshot is
+        published when it exits without an error. If it raises, its writes are discarded
+        with `abort()`, so none of them show up in a later publish either.
+        """
+        with self._lock:
+            try:
+                yield self
+            except BaseException:
+                self.abort()
+                raise
+            self.publish()
+
+    def get_all_data(self):
+        """Prints all stored data in a structured and readable format."""
+        print(f"=== {type(self).__name__} ===\n")
+
+        print("📌 Collateral Adjectives to Animals:")
+        collateral_adjectives_to_animals = self.collateral_adjectives_to_animals
+        if collateral_adjectives_to_animals:
+            for adjective, animals in collateral_adjectives_to_animals.items():
+                print(f"  - {adjective}: {', '.join(animals)}")
+        else:
+            print("  (No data)")
+
+        print("\n📌 Animal Images (Local Paths):")
+        animal_images_local_paths = self.animal_images_local_paths
+        if animal_images_local_paths:
+            for animal, path in animal_images_local_paths.items():
+                print(f"  - {animal}: {path}")
+        else:
+            print("  (No data)")
+
+        print("\n📌 Animal Image URLs:")
+        animal_image_urls = self.animal_image_urls
+        if animal_image_urls:
+            for url, animal in animal_image_urls.items():
+                print(f"  - {animal}: {url}")
+        else:
+            print("  (No data)")
+
+        print("\n===================================")
+
+    @property
+    @abstractmethod
+    def collateral_adjectives_to_animals(self) -> dict[str, list[str]]:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def animal_image_urls(self) -> dict[str, str]:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def animal_images_local_paths(self) -> dict[str, str]:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def animal_fetched_at(self) -> dict[str, float]:
+        raise NotImplementedError
@@ -0,0 +1,190 @@
+"""This module implements a write buffer in front of an animal storage engine.
+
+Scrapers produce many tiny writes (one per adjective, page or image). `BatchWriter`
+accumulates them and applies them to the wrapped storage with a single `insert_many` call
+once enough writes are pending or the flush interval has elapsed, which keeps lock
+acquisitions and SQLite statements per write to a minimum.
+"""
+
+import time
+from collections.abc import Iterable
+
+from db.animals_storage import AnimalsSnapshot, AnimalsStorage
+
+DEFAULT_BATCH_SIZE = 256  # Pending writes that trigger a flush
+DEFAULT_FLUSH_INTERVAL = 1.0  # Seconds after which pending writes are flushed
+
+
+class BatchWriter(AnimalsStorage):
+    """Buffers writes to an `AnimalsStorage` and flushes them in batches.
+
+    Lookups see pending writes, so a scraper can read back an image URL another scraper
+    has just written even before it is flushed.
+
+    Attributes:
+        _db (AnimalsStorage): The storage the batches are flushed to.
+        _batch_size (int): The number of pending writes that triggers a flush.
+        _flush_interval (float): Seconds after which pending writes are flushed.
+    """
+
+    def __init__(
+        self,
+        db: AnimalsStorage,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        super().__init__()
+        self._db = db
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending_adjectives: list[tuple[str, str]] = []
+        self._pending_image_urls: dict[str, str] = {}
+        self._pending_local_paths: list[tuple[str, str]] = []
+        self._pending_fetched_at: list[tuple[str, float]] = []
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """The number of writes waiting to be flushed."""
+        return self._pending_count
+
+    def flush(self):
+        """Applies all pending writes to the wrapped storage in one `insert_many` call."""
+        with self._lock:
+            if self._pending_count:
+                self._db.insert_many(
+                    adjectives=self._pending_adjectives,
+                    image_urls=self._pending_image_urls.items(),
+                    local_paths=self._pending_local_paths,
+                    fetched_at=self._pending_fetched_at,
+                )
+            self._clear_pending()
+
+    def _clear_pending(self):
+        self._pending_adjectives = []
+        self._pending_image_urls = {}
+        self._pending_local_paths = []
+        self._pending_fetched_at = []
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    def _added(self, count: int):
+        """Accounts for new pending writes and flushes if the batch is due."""
+        self._pending_count += count
+        if (
+            self._pending_count >= self._batch_size
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def insert_many(
+        self,
+        adjectives: Iterable[tuple[str, str]] = (),
+        image_urls: Iterable[tuple[str, str]] = (),
+        local_paths: Iterable[tuple[str, str]] = (),
+        fetched_at: Iterable[tuple[str, float]] = (),
+    ):
+        """Queues several writes at once.
+
+        Args:
+            adjectives (Iterable[tuple[str, str]]): `(adjective, animal)` pairs.
+            image_urls (Iterable[tuple[str, str]]): `(image_url, animal_name)` pairs.
+            local_paths (Iterable[tuple[str, str]]): `(animal_name, local_path)` pairs.
+            fetched_at (Iterable[tuple[str, float]]): `(animal_name, fetched_at)` pairs.
+        """
+        adjectives = list(adjectives)
+        image_urls = list(image_urls)
+        local_paths = list(local_paths)
+        fetched_at = list(fetched_at)
+
+        with self._lock:
+            self._pending_adjectives.extend(adjectives)
+            self._pending_local_paths.extend(local_paths)
+            self._pending_fetched_at.extend(fetched_at)
+            for image_url, animal_name in image_urls:
+                self._pending_image_urls.pop(image_url, None)  # Keep the latest last
+                self._pending_image_urls[image_url] = animal_name
+            self._added(
+                len(adjectives) + len(image_urls) + len(local_paths) + len(fetched_at)
+            )
+
+    def insert_image_url(self, image_url: str, animal_name: str):
+        """Queues an image URL for a specific animal."""
+        with self._lock:
+            self._pending_image_urls.pop(image_url, None)
+            self._pending_image_urls[image_url] = animal_name
+            self._added(1)
+
+    def insert_image_local_path(self, animal_name: str, local_path: str):
+        """Queues the local file path of an animal's image."""
+        with self._lock:
+            self._pending_local_paths.append((animal_name, local_path))
+            self._added(1)
+
+    def insert_fetched_at(self, animal_name: str, fetched_at: float):
+        """Queues when an animal's page was last fetched."""
+        with self._lock:
+            self._pending_fetched_at.append((animal_name, fetched_at))
+            self._added(1)
+
+    def insert_animal_to_collateral_adjectives(self, adjective: str, animal: str):
+        """Queues an association between an animal and a collateral adjective."""
+        with self._lock:
+            self._pending_adjectives.append((adjective, animal))
+            self._added(1)
+
+    def get_animal_name_by_url(self, image_url: str) -> str | None:
+        """Retrieves the animal name for an image URL, including pending writes."""
+        with self._lock:
+            animal_name = self._pending_image_urls.get(image_url)
+        if animal_name is not None:
+            return animal_name
+        return self._db.get_animal_name_by_url(image_url)
+
+    def get_animal_adjectives(self, animal_name: str) -> list[str]:
+        """Retrieves the collateral adjectives of an animal after flushing."""
+        self.flush()
+        return self._db.get_animal_adjectives(animal_name)
+
+    def reset(self):
+        """Drops pending writes and resets the wrapped storage."""
+        with self._lock:
+            self._clear_pending()
+            self._db.reset()
+
+    def abort(self):
+        """Drops pending writes and discards the wrapped storage's unpublished writes."""
+        with self._lock:
+            self._clear_pending()
+            self._db.abort()
+
+    def snapshot(self) -> AnimalsSnapshot:
+        """Returns the wrapped storage's most recently published snapshot."""
+        return self._db.snapshot()
+
+    def publish(self) -> AnimalsSnapshot:
+        """Flushes pending writes and publishes them as a new snapshot."""
+        with self._lock:
+            self.flush()
+            return self._db.publish()
+
+    @property
+    def collateral_adjectives_to_animals(self) -> dict[str, list[str]]:
+        self.flush()
+        return self._db.collateral_adjectives_to_animals
+
+    @property
+    def animal_image_urls(self) -> dict[str, str]:
+        self.flush()
+        return self._db.animal_image_urls
+
+    @property
+    def animal_images_local_paths(self) -> dict[str, str]:
+        self.flush()
+        return self._db.animal_images_local_paths
+
+    @property
+    def animal_fetched_at(self) -> dict[str, float]:
+        self.flush()
+        return self._db.animal_fetched_at
@@ -0,0 +1,237 @@
+"""This module implements the search index over animal names and collateral adjectives.
+
+Two structures are kept side by side:
+
+- A sorted list of keys, one per word of every term, so a prefix such as "bea" finds
+  "Bear" and "Black bear" by bisection instead of scanning every term.
+- A trigram index mapping every three-character slice of a term to the terms containing
+  it, so a misspelled query such as "ursne" still finds "ursine" by the share of
+  trigrams the two have in common.
+
+The index is append-only: a `SearchView` is limited to the terms added before it was
+created, so views handed out earlier are never affected by later terms. Snapshots build
+their index from their own animals and adjectives on their first search, so it only
+takes memory in the processes that serve searches, never in writers or shard workers.
+"""
+
+import bisect
+import heapq
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+ANIMAL = "animal"
+ADJECTIVE = "adjective"
+DEFAULT_SEARCH_LIMIT = 20
+FUZZY_THRESHOLD = 0.2  # Minimum Jaccard similarity of the trigrams for a fuzzy match
+WORD_PREFIX_SCORE = 0.9  # Score of a prefix match on a later word, e.g. "bea" -> "Black bear"
+
+_KINDS = (ANIMAL, ADJECTIVE)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """A term matching a search query.
+
+    Attributes:
+        kind (str): `ANIMAL` or `ADJECTIVE`.
+        term (str): The matching animal name or collateral adjective.
+        score (float): 1.0 for a prefix match, less for a fuzzy or later-word match.
+        animals (tuple[str, ...]): The animal itself, or the animals of the adjective.
+    """
+
+    kind: str
+    term: str
+    score: float
+    animals: tuple[str, ...] = ()
+
+
+def _fold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(folded: str) -> set[str]:
+    padded = f" {folded} "  # So the first and last letters are matched in place too
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """An append-only prefix and trigram index of animal names and collateral adjectives.
+
+    Attributes:
+        _terms (list[str]): The terms, indexed by term ID.
+        _kinds (bytearray): The kind of each term, as an index into `_KINDS`.
+        _folded (list[str]): The case-folded terms, indexed by term ID.
+        _keys (list[str]): The sorted keys published by the last `view()`.
+        _key_ids (array): The term ID of each key in `_keys`.
+        _pending (list[tuple[str, int]]): `(key, term_id)` pairs added since `view()`.
+        _trigrams (dict[str, array]): The IDs of the terms containing each trigram.
+        _trigram_counts (array): The number of distinct trigrams of each term.
+    """
+
+    def __init__(self):
+        self._terms: list[str] = []
+        self._kinds = bytearray()
+        self._folded: list[str] = []
+        self._keys: list[str] = []
+        self._key_ids = array("I")
+        self._pending: list[tuple[str, int]] = []
+        self._trigrams: dict[str, array] = {}
+        self._trigram_counts = array("H")
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str, kind: str = ANIMAL) -> int:
+        """Adds an animal name or a collateral adjective.
+
+        The index does not look terms up, so each term of a kind must be added once; the
+        animals and adjectives of a snapshot already are, see `build_search_view()`.
+
+        Args:
+            term (str): The animal name or collateral adjective.
+            kind (str): `ANIMAL` or `ADJECTIVE`.
+
+        Returns:
+            int: The ID of the term.
+        """
+        term_id = len(self._terms)
+        folded = _fold(term)
+        self._kinds.append(_KINDS.index(kind))
+        self._folded.append(folded)
+
+        # One key per word, so a prefix of any word finds the term
+        start = 0
+        for word in folded.split(" "):
+            self._pending.append((folded[start:], term_id))
+            start += len(word) + 1
+
+        grams = _trigrams(folded)
+        for gram in grams:
+            postings = self._trigrams.get(gram)
+            if postings is None:
+                postings = self._trigrams[gram] = array("I")
+            postings.append(term_id)
+        self._trigram_counts.append(min(len(grams), 0xFFFF))
+
+        self._terms.append(term)  # Last, so the term is complete once it is counted
+        return term_id
+
+    def view(self) -> "SearchView":
+        """Returns a read-only view of every term added so far.
+
+        The keys added since the last view are merged into a new sorted list, so views
+        handed out earlier keep searching the list they were created with.
+        """
+        if self._pending:
+            pending = sorted(self._pending)
+            self._pending = []
+            merged = list(zip(self._keys, self._key_ids))
+            merged += pending
+            merged.sort()  # Two sorted runs, merged in linear time
+            self._keys = [key for key, _ in merged]
+            self._key_ids = array("I", (term_id for _, term_id in merged))
+        return SearchView(self, self._keys, self._key_ids, len(self._terms))
+
+    def _result(self, term_id: int, score: float) -> SearchResult:
+        return SearchResult(_KINDS[self._kinds[term_id]], self._terms[term_id], score)
+
+    def _fuzzy(self, folded: str, size: int) -> dict[int, float]:
+        """Returns the terms whose trigrams are similar enough to the query's, by score.
+
+        A term can only reach `FUZZY_THRESHOLD` if it shares at least that fraction of the
+        query's trigrams, so candidates are only taken from the rarest trigrams' postings
+        and the most common trigrams are only checked against those candidates.
+        """
+        postings = self._trigrams
+        grams = sorted(_trigrams(folded), key=lambda gram: len(postings.get(gram, ())))
+        needed = max(1, math.ceil(FUZZY_THRESHOLD * len(grams)))
+        split = len(grams) - needed + 1
+
+        shared: Counter = Counter()
+        for gram in grams[:split]:
+            shared.update(postings.get(gram, ()))
+        candidates = shared.keys()
+        for gram in grams[split:]:
+            shared.update(candidates & set(postings.get(gram, ())))
+
+        counts = self._trigram_counts
+        matches = {}
+        for term_id in [term_id for term_id, common in shared.items() if common >= needed]:
+            if term_id >= size:  # Added after the view was published
+                continue
+            common = shared[term_id]
+            score = common / (len(grams) + counts[term_id] - common)
+            if score >= FUZZY_THRESHOLD:
+                matches[term_id] = score
+        return matches
+
+
+@dataclass(frozen=True, slots=True)
+class SearchView:
+    """The terms of a `SearchIndex` that were added before a snapshot was published.
+
+    Attributes:
+        index (SearchIndex): The index the view was created from.
+        keys (list[str]): The sorted prefix keys, never modified after the view is created.
+        key_ids (array): The term ID of each key.
+        size (int): The number of terms visible through the view.
+    """
+
+    index: SearchIndex = field(default_factory=SearchIndex)
+    keys: list[str] = field(default_factory=list)
+    key_ids: array = field(default_factory=lambda: array("I"))
+    size: int = 0
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[SearchResult]:
+        """Finds the terms with a word starting with the query, or resembling it if none do.
+
+        Args:
+            query (str): The text to search for, compared case-insensitively.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[SearchResult]: The best matches first, without their animals.
+        """
+        folded = _fold(query)
+        if not folded or limit <= 0:
+            return []
+
+        folded_terms = self.index._folded
+        scores: dict[int, float] = {}
+        keys, key_ids = self.keys, self.key_ids
+        i = bisect.bisect_left(keys, folded)
+        # Every match is scored: keys are in alphabetical order, not in order of rank, so
+        # a whole-term match can sort after any number of longer or later-word matches
+        while i < len(keys) and keys[i].startswith(folded):
+            term_id = key_ids[i]
+            whole = len(keys[i]) == len(folded_terms[term_id])
+            scores[term_id] = max(
+                scores.get(term_id, 0.0), 1.0 if whole else WORD_PREFIX_SCORE
+            )
+            i += 1
+
+        if not scores:
+            scores = self.index._fuzzy(folded, self.size)
+
+        best = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], len(folded_terms[item[0]]), folded_terms[item[0]]),
+        )
+        return [self.index._result(term_id, score) for term_id, score in best]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def build_search_view(animals: Iterable[str], adjectives: Iterable[str]) -> SearchView:
+    """Indexes every animal and adjective at once, each only the first time it is listed."""
+    index = SearchIndex()
+    for animal in dict.fromkeys(animals):
+        index.add(animal, ANIMAL)
+    for adjective in dict.fromkeys(adjectives):
+        index.add(adjective, ADJECTIVE)
+    return index.view()
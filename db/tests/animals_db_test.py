@@ -1,5 +1,8 @@
+import threading
+
 import pytest
 from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
 
 
 @pytest.fixture
@@ -8,6 +11,17 @@ def db():
     return AnimalsInMemoryDB()
 
 
+def test_incomplete_engine_cannot_be_created():
+    """Test that an engine missing part of the storage interface fails on creation."""
+
+    class PartialDB(AnimalsStorage):  # pylint: disable=abstract-method
+        def insert_image_url(self, image_url: str, animal_name: str):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialDB()  # pylint: disable=abstract-class-instantiated
+
+
 def test_insert_image_url(db):
     """Test inserting and retrieving an image URL."""
     db.insert_image_url("https://example.com/lion.jpg", "lion")
@@ -72,3 +86,155 @@ def test_persistence_of_data(db):
     assert db.get_animal_name_by_url("https://example.com/cat.jpg") == "cat"
     assert db.animal_images_local_paths["dog"] == "/images/dog.jpg"
     assert db.collateral_adjectives_to_animals["majestic"] == ["eagle"]
+
+
+def test_fetched_at_is_published(db):
+    """Test that the time each page was last fetched is published with the snapshot."""
+    db.insert_fetched_at("elephant", 100.0)
+    db.insert_many(fetched_at=[("mouse", 200.0), ("elephant", 300.0)])
+
+    assert db.snapshot().animal_fetched_at == {}
+    assert db.publish().animal_fetched_at == {"elephant": 300.0, "mouse": 200.0}
+
+
+def test_get_animal_adjectives(db):
+    """Test retrieving the collateral adjectives of a single animal."""
+    db.insert_animal_to_collateral_adjectives("ursine", "bear")
+    db.insert_animal_to_collateral_adjectives("arctoid", "bear")
+    db.insert_animal_to_collateral_adjectives("ursine", "panda")
+
+    assert db.get_animal_adjectives("bear") == ["ursine", "arctoid"]
+    assert db.get_animal_adjectives("panda") == ["ursine"]
+    assert db.get_animal_adjectives("unicorn") == []
+
+
+def test_names_are_stored_once(db):
+    """Test that an animal inserted through several methods shares one interned name."""
+    db.insert_animal_to_collateral_adjectives("canine", "".join(["fo", "x"]))
+    db.insert_image_url("https://example.com/fox.jpg", "".join(["f", "ox"]))
+    db.insert_image_local_path("".join(["f", "o", "x"]), "/images/fox.jpg")
+
+    adjective_name = db.collateral_adjectives_to_animals["canine"][0]
+    url_name = db.get_animal_name_by_url("https://example.com/fox.jpg")
+    (path_name,) = db.animal_images_local_paths
+    assert adjective_name is url_name is path_name
+
+
+def test_overwrite_image_url_detaches_previous_animal(db):
+    """Test that reassigning an image URL removes it from the previous animal."""
+    db.insert_image_url("https://example.com/tiger.jpg", "tiger")
+    db.insert_image_url("https://example.com/tiger.jpg", "panther")
+    db.insert_image_url("https://example.com/tiger2.jpg", "tiger")
+
+    assert db.animal_image_urls == {
+        "https://example.com/tiger.jpg": "panther",
+        "https://example.com/tiger2.jpg": "tiger",
+    }
+
+
+def test_snapshot_hides_unpublished_writes(db):
+    """Test that readers only see writes once they are published."""
+    db.insert_image_url("https://example.com/owl.jpg", "owl")
+    assert db.snapshot().animal_image_urls == {}
+
+    snapshot = db.publish()
+    assert db.snapshot() is snapshot
+    assert snapshot.animal_image_urls == {"https://example.com/owl.jpg": "owl"}
+    assert snapshot.generation == 1
+
+
+def test_snapshot_is_immutable(db):
+    """Test that a published snapshot cannot be mutated by readers."""
+    db.insert_animal_to_collateral_adjectives("avian", "owl")
+    snapshot = db.publish()
+
+    with pytest.raises(TypeError):
+        snapshot.collateral_adjectives_to_animals["avian"] = ("bat",)
+    assert snapshot.collateral_adjectives_to_animals["avian"] == ("owl",)
+
+
+def test_batch_publishes_on_exit(db):
+    """Test that a batch of writes becomes visible as a whole when it exits."""
+    with db.batch():
+        db.insert_image_url("https://example.com/bat.jpg", "bat")
+        db.insert_image_local_path("bat", "/images/bat.jpg")
+        assert db.snapshot().animal_images_local_paths == {}
+
+    assert db.snapshot().animal_images_local_paths == {"bat": "/images/bat.jpg"}
+
+
+def test_failed_batch_leaves_no_trace(db):
+    """Test that the writes of a batch that raises are never published."""
+    with pytest.raises(RuntimeError):
+        with db.batch():
+            db.insert_image_url("https://example.com/u1.jpg", "A")
+            raise RuntimeError("boom")
+
+    with db.batch():
+        db.insert_image_url("https://example.com/u2.jpg", "B")
+
+    assert db.get_animal_name_by_url("https://example.com/u1.jpg") is None
+    assert db.snapshot().animal_image_urls == {"https://example.com/u2.jpg": "B"}
+
+
+def test_reset_keeps_published_snapshot(db):
+    """Test that clearing the writer state does not affect readers until published."""
+    db.insert_image_local_path("dog", "/images/dog.jpg")
+    db.publish()
+
+    db.reset()
+    assert db.animal_images_local_paths == {}
+    assert db.snapshot().animal_images_local_paths == {"dog": "/images/dog.jpg"}
+
+    db.publish()
+    assert db.snapshot().animal_images_local_paths == {}
+
+
+def test_abort_restores_the_published_state(db):
+    """Test that aborting discards unpublished writes and keeps the published ones."""
+    db.insert_many(
+        adjectives=[("canine", "dog")],
+        image_urls=[("https://example.com/dog.jpg", "dog")],
+        local_paths=[("dog", "/images/dog.jpg")],
+        fetched_at=[("dog", 100.0)],
+    )
+    published = db.publish()
+
+    db.reset()
+    db.insert_animal_to_collateral_adjectives("feline", "cat")
+    db.abort()
+
+    assert db.collateral_adjectives_to_animals == {"canine": ["dog"]}
+    assert db.get_animal_name_by_url("https://example.com/dog.jpg") == "dog"
+    assert db.animal_images_local_paths == {"dog": "/images/dog.jpg"}
+    assert db.animal_fetched_at == {"dog": 100.0}
+    assert db.snapshot() is published
+
+
+def test_concurrent_readers_never_see_torn_batches(db):
+    """Test that readers racing a writer only ever observe complete batches."""
+    stop = threading.Event()
+    torn = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = db.snapshot()
+            urls = set(snapshot.animal_image_urls.values())
+            if urls != set(snapshot.animal_images_local_paths):
+                torn.append(snapshot.generation)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+
+    for i in range(200):
+        with db.batch():
+            db.insert_image_url(f"https://example.com/{i}.jpg", f"animal{i}")
+            db.insert_image_local_path(f"animal{i}", f"/images/{i}.jpg")
+
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not torn
+    assert len(db.snapshot().animal_image_urls) == 200
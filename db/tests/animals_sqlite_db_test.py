@@ -0,0 +1,230 @@
+import sqlite3
+import threading
+
+import pytest
+from db.animals_sqlite_db import AnimalsSQLiteDB
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture for the location of a fresh database file."""
+    return tmp_path / "animals.sqlite3"
+
+
+@pytest.fixture
+def db(db_path):
+    """Fixture to create a new SQLite database for each test."""
+    database = AnimalsSQLiteDB(db_path)
+    yield database
+    database.close()
+
+
+def test_insert_image_url(db):
+    """Test inserting and retrieving an image URL."""
+    db.insert_image_url("https://example.com/lion.jpg", "lion")
+    assert db.get_animal_name_by_url("https://example.com/lion.jpg") == "lion"
+    assert db.get_animal_name_by_url("https://example.com/missing.jpg") is None
+
+
+def test_insert_animal_to_collateral_adjectives(db):
+    """Test inserting animals under different collateral adjectives."""
+    db.insert_animal_to_collateral_adjectives("nocturnal", "owl")
+    db.insert_animal_to_collateral_adjectives("nocturnal", "bat")
+    db.insert_animal_to_collateral_adjectives("furry", "rabbit")
+
+    assert db.collateral_adjectives_to_animals == {
+        "nocturnal": ["owl", "bat"],
+        "furry": ["rabbit"],
+    }
+    assert db.get_animal_adjectives("owl") == ["nocturnal"]
+
+
+def test_overwrite_image_url_and_local_path(db):
+    """Test overwriting an image URL owner and a local image path."""
+    db.insert_image_url("https://example.com/tiger.jpg", "tiger")
+    db.insert_image_url("https://example.com/tiger.jpg", "panther")
+    db.insert_image_local_path("wolf", "/images/wolf1.jpg")
+    db.insert_image_local_path("wolf", "/images/wolf2.jpg")
+
+    assert db.animal_image_urls == {"https://example.com/tiger.jpg": "panther"}
+    assert db.animal_images_local_paths == {"wolf": "/images/wolf2.jpg"}
+
+
+def test_insert_many(db):
+    """Test applying several kinds of writes in one call."""
+    db.insert_many(
+        adjectives=[("ursine", "bear"), ("ursine", "panda")],
+        image_urls=[("https://example.com/bear.jpg", "bear")],
+        local_paths=[("bear", "/images/bear.jpg")],
+    )
+
+    assert db.collateral_adjectives_to_animals == {"ursine": ["bear", "panda"]}
+    assert db.animal_image_urls == {"https://example.com/bear.jpg": "bear"}
+    assert db.animal_images_local_paths == {"bear": "/images/bear.jpg"}
+
+
+def test_snapshot_hides_unpublished_writes(db):
+    """Test that readers only see writes once they are published."""
+    db.insert_image_url("https://example.com/owl.jpg", "owl")
+    assert db.snapshot().animal_image_urls == {}
+
+    snapshot = db.publish()
+    assert snapshot.animal_image_urls == {"https://example.com/owl.jpg": "owl"}
+    assert db.snapshot() is snapshot
+
+
+def test_reset_keeps_published_snapshot(db):
+    """Test that clearing the writer state does not affect readers until published."""
+    db.insert_image_local_path("dog", "/images/dog.jpg")
+    db.publish()
+
+    db.reset()
+    assert db.animal_images_local_paths == {}
+    assert db.snapshot().animal_images_local_paths == {"dog": "/images/dog.jpg"}
+
+
+def test_abort_discards_unpublished_writes(db, db_path):
+    """Test that aborting restores the published data and leaves the file writable."""
+    db.insert_many(
+        adjectives=[("vulpine", "fox")], image_urls=[("https://example.com/fox.jpg", "fox")]
+    )
+    published = db.publish()
+
+    db.reset()
+    db.insert_animal_to_collateral_adjectives("strigine", "owl")
+    db.abort()
+
+    assert db.collateral_adjectives_to_animals == {"vulpine": ["fox"]}
+    assert db.get_animal_name_by_url("https://example.com/fox.jpg") == "fox"
+    assert db.snapshot() is published
+
+    worker = AnimalsSQLiteDB(db_path, busy_timeout=0.1)
+    worker.insert_fetched_at("fox", 100.0)
+    worker.publish()
+    worker.close()
+    assert db.snapshot().animal_fetched_at == {"fox": 100.0}
+
+
+def test_failed_batch_leaves_no_trace(db):
+    """Test that the writes of a batch that raises are rolled back, not published later."""
+    with pytest.raises(RuntimeError):
+        with db.batch():
+            db.insert_image_url("https://example.com/u1.jpg", "A")
+            raise RuntimeError("boom")
+
+    with db.batch():
+        db.insert_image_url("https://example.com/u2.jpg", "B")
+
+    assert db.snapshot().animal_image_urls == {"https://example.com/u2.jpg": "B"}
+
+
+def test_data_survives_restart(db_path):
+    """Test that published data is visible to a new instance on the same file."""
+    db = AnimalsSQLiteDB(db_path)
+    db.insert_animal_to_collateral_adjectives("majestic", "eagle")
+    db.publish()
+    db.insert_image_local_path("eagle", "/images/unpublished.jpg")
+    db.close()
+
+    reopened = AnimalsSQLiteDB(db_path)
+    snapshot = reopened.snapshot()
+    assert snapshot.collateral_adjectives_to_animals == {"majestic": ("eagle",)}
+    assert snapshot.animal_images_local_paths == {}
+    reopened.close()
+
+
+def test_fetched_at_survives_restart(db_path):
+    """Test that the time each page was last fetched is stored with the animal."""
+    db = AnimalsSQLiteDB(db_path)
+    db.insert_image_url("https://example.com/eagle.jpg", "eagle")
+    db.insert_many(fetched_at=[("eagle", 100.0), ("owl", 200.0)])
+    db.publish()
+    db.close()
+
+    reopened = AnimalsSQLiteDB(db_path)
+    assert reopened.snapshot().animal_fetched_at == {"eagle": 100.0, "owl": 200.0}
+    reopened.close()
+
+
+def test_adds_fetched_at_to_existing_files(db_path):
+    """Test that a database created before fetch times were stored is upgraded."""
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE animals (name TEXT PRIMARY KEY, image_url TEXT UNIQUE, local_path TEXT)"
+    )
+    connection.execute("INSERT INTO animals (name, local_path) VALUES ('eagle', '/eagle.jpg')")
+    connection.commit()
+    connection.close()
+
+    db = AnimalsSQLiteDB(db_path)
+    db.insert_fetched_at("eagle", 100.0)
+    snapshot = db.publish()
+    db.close()
+
+    assert snapshot.animal_images_local_paths == {"eagle": "/eagle.jpg"}
+    assert snapshot.animal_fetched_at == {"eagle": 100.0}
+
+
+def test_readers_see_publishes_from_other_connections(db, db_path):
+    """Test that a second instance, as used by another worker, picks up publishes."""
+    worker = AnimalsSQLiteDB(db_path)
+    assert worker.snapshot().animal_image_urls == {}
+
+    db.insert_image_url("https://example.com/fox.jpg", "fox")
+    db.publish()
+
+    assert worker.snapshot().animal_image_urls == {"https://example.com/fox.jpg": "fox"}
+    worker.close()
+
+
+def test_other_connections_open_and_read_during_a_scrape(db, db_path):
+    """Test that a worker can open the file and read snapshots between reset and publish."""
+    db.insert_image_url("https://example.com/fox.jpg", "fox")
+    db.publish()
+
+    db.reset()
+    db.insert_image_url("https://example.com/owl.jpg", "owl")
+    worker = AnimalsSQLiteDB(db_path, busy_timeout=0.1)  # Fails fast if the file is locked
+    assert worker.snapshot().animal_image_urls == {"https://example.com/fox.jpg": "fox"}
+
+    worker.insert_fetched_at("fox", 100.0)  # Another process can publish meanwhile, too
+    worker.publish()
+    worker.close()
+    db.insert_image_local_path("owl", "/images/owl.jpg")
+    snapshot = db.publish()
+
+    assert snapshot.animal_image_urls == {"https://example.com/owl.jpg": "owl"}
+    assert snapshot.animal_images_local_paths == {"owl": "/images/owl.jpg"}
+
+
+def test_snapshot_from_another_thread(db):
+    """Test that snapshots can be read from threads other than the writer's."""
+    db.insert_image_url("https://example.com/cat.jpg", "cat")
+    db.publish()
+    results = []
+
+    thread = threading.Thread(target=lambda: results.append(db.snapshot()))
+    thread.start()
+    thread.join()
+
+    assert results[0].animal_image_urls == {"https://example.com/cat.jpg": "cat"}
+
+
+@pytest.mark.usefixtures("db")
+def test_uses_wal_and_indexes(db_path):
+    """Test that the database runs in WAL mode with the lookup indexes in place."""
+    connection = sqlite3.connect(db_path)
+    (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+    indexes = {
+        name
+        for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    connection.close()
+
+    assert journal_mode == "wal"
+    assert {
+        "collateral_adjectives_adjective",
+        "collateral_adjectives_animal",
+    } <= indexes
@@ -0,0 +1,124 @@
+from unittest.mock import MagicMock
+
+import pytest
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
+from db.batch_writer import BatchWriter
+
+
+@pytest.fixture
+def db():
+    """Fixture to create the storage the writer flushes to."""
+    return AnimalsInMemoryDB()
+
+
+@pytest.fixture
+def writer(db):
+    """Fixture to create a writer that only flushes when asked or when full."""
+    return BatchWriter(db, batch_size=3, flush_interval=3600)
+
+
+def test_writes_are_buffered_until_flush(writer, db):
+    """Test that writes only reach the storage on flush."""
+    writer.insert_animal_to_collateral_adjectives("aquatic", "dolphin")
+    assert writer.pending == 1
+    assert db.collateral_adjectives_to_animals == {}
+
+    writer.flush()
+    assert writer.pending == 0
+    assert db.collateral_adjectives_to_animals == {"aquatic": ["dolphin"]}
+
+
+def test_flushes_when_batch_is_full(writer, db):
+    """Test that reaching the batch size flushes all pending writes."""
+    writer.insert_many(adjectives=[("aquatic", "dolphin"), ("aquatic", "whale")])
+    assert db.collateral_adjectives_to_animals == {}
+
+    writer.insert_image_local_path("whale", "/images/whale.jpg")
+    assert writer.pending == 0
+    assert db.collateral_adjectives_to_animals == {"aquatic": ["dolphin", "whale"]}
+    assert db.animal_images_local_paths == {"whale": "/images/whale.jpg"}
+
+
+def test_flushes_after_interval(db):
+    """Test that pending writes are flushed once the flush interval has elapsed."""
+    writer = BatchWriter(db, batch_size=1000, flush_interval=0)
+    writer.insert_image_local_path("owl", "/images/owl.jpg")
+    assert db.animal_images_local_paths == {"owl": "/images/owl.jpg"}
+
+
+def test_fetched_at_is_buffered(writer, db):
+    """Test that fetch times are buffered and flushed like any other write."""
+    writer.insert_fetched_at("dolphin", 100.0)
+    writer.insert_many(fetched_at=[("orca", 200.0)])
+    assert writer.pending == 2
+    assert db.animal_fetched_at == {}
+
+    assert writer.animal_fetched_at == {"dolphin": 100.0, "orca": 200.0}
+
+
+def test_lookup_sees_pending_image_urls(writer, db):
+    """Test that image URL lookups include writes that were not flushed yet."""
+    db.insert_image_url("https://example.com/cat.jpg", "cat")
+    writer.insert_image_url("https://example.com/lion.jpg", "lion")
+
+    assert writer.get_animal_name_by_url("https://example.com/lion.jpg") == "lion"
+    assert writer.get_animal_name_by_url("https://example.com/cat.jpg") == "cat"
+    assert db.get_animal_name_by_url("https://example.com/lion.jpg") is None
+
+
+def test_latest_image_url_owner_wins(writer, db):
+    """Test that the last pending owner of an image URL is the one flushed."""
+    writer.insert_image_url("https://example.com/tiger.jpg", "tiger")
+    writer.insert_image_url("https://example.com/tiger.jpg", "panther")
+    writer.flush()
+
+    assert db.animal_image_urls == {"https://example.com/tiger.jpg": "panther"}
+
+
+def test_publish_flushes_first(writer, db):
+    """Test that publishing includes writes that were still pending."""
+    writer.insert_image_url("https://example.com/bat.jpg", "bat")
+    snapshot = writer.publish()
+
+    assert snapshot.animal_image_urls == {"https://example.com/bat.jpg": "bat"}
+    assert db.snapshot() is snapshot
+
+
+def test_reset_drops_pending_writes(writer, db):
+    """Test that resetting discards pending writes along with the stored ones."""
+    db.insert_image_local_path("dog", "/images/dog.jpg")
+    writer.insert_image_local_path("cat", "/images/cat.jpg")
+
+    writer.reset()
+    writer.flush()
+    assert db.animal_images_local_paths == {}
+
+
+def test_abort_drops_pending_and_unpublished_writes(writer, db):
+    """Test that aborting discards pending writes and those flushed but not published."""
+    writer.insert_image_local_path("dog", "/images/dog.jpg")
+    writer.publish()
+    writer.insert_image_local_path("cat", "/images/cat.jpg")
+    writer.flush()
+    writer.insert_image_local_path("owl", "/images/owl.jpg")
+
+    writer.abort()
+    writer.flush()
+    assert db.animal_images_local_paths == {"dog": "/images/dog.jpg"}
+
+
+def test_flush_is_a_single_insert_many():
+    """Test that a flush applies all kinds of pending writes with one call."""
+    storage = MagicMock(spec=AnimalsStorage)
+    writer = BatchWriter(storage, batch_size=10, flush_interval=3600)
+    writer.insert_animal_to_collateral_adjectives("ursine", "bear")
+    writer.insert_image_url("https://example.com/bear.jpg", "bear")
+    writer.insert_image_local_path("bear", "/images/bear.jpg")
+    writer.flush()
+
+    storage.insert_many.assert_called_once()
+    kwargs = storage.insert_many.call_args.kwargs
+    assert kwargs["adjectives"] == [("ursine", "bear")]
+    assert list(kwargs["image_urls"]) == [("https://example.com/bear.jpg", "bear")]
+    assert kwargs["local_paths"] == [("bear", "/images/bear.jpg")]
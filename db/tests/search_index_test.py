@@ -0,0 +1,132 @@
+import pytest
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_sqlite_db import AnimalsSQLiteDB
+from db.search_index import ADJECTIVE, ANIMAL, SearchIndex, SearchResult, build_search_view
+
+
+@pytest.fixture
+def index():
+    """Fixture for an index of a few animals and adjectives."""
+    index = SearchIndex()
+    for animal in ["Bear", "Black bear", "Beaver", "Fox"]:
+        index.add(animal, ANIMAL)
+    for adjective in ["ursine", "vulpine"]:
+        index.add(adjective, ADJECTIVE)
+    return index
+
+
+def terms(results: list[SearchResult]) -> list[str]:
+    return [result.term for result in results]
+
+
+def test_prefix_matches_any_word(index):
+    """Test that a prefix finds terms starting with it first, then later words."""
+    results = index.view().search("BEA")
+
+    assert terms(results) == ["Bear", "Beaver", "Black bear"]
+    assert [result.score for result in results] == [1.0, 1.0, 0.9]
+
+
+def test_prefix_results_are_limited(index):
+    """Test that no more than `limit` results are returned."""
+    assert terms(index.view().search("bea", limit=1)) == ["Bear"]
+
+
+def test_whole_term_match_is_not_cut_off_by_earlier_keys():
+    """Test that ranking sees every prefix match, not just the first `limit` keys."""
+    index = SearchIndex()
+    for animal in ["Black bear", "Brown bear", "Polar bear", "Bear"]:
+        index.add(animal, ANIMAL)
+
+    # The "bear" keys of the first three sort before the whole-term "Bear"
+    assert terms(index.view().search("bear", limit=1)) == ["Bear"]
+    assert terms(index.view().search("bear", limit=2)) == ["Bear", "Black bear"]
+
+
+def test_misspelled_query_matches_fuzzily(index):
+    """Test that a query no term starts with finds terms with similar trigrams."""
+    results = index.view().search("ursne")
+
+    assert results == [SearchResult(ADJECTIVE, "ursine", pytest.approx(0.375))]
+
+
+def test_unrelated_query_finds_nothing(index):
+    """Test that a query sharing too few trigrams with every term finds nothing."""
+    assert index.view().search("zebra") == []
+    assert index.view().search("  ") == []
+
+
+def test_duplicate_terms_are_indexed_once():
+    """Test that a term listed twice is indexed once, while the other kind is separate."""
+    view = build_search_view(["Fox", "Red fox", "Fox"], ["Fox"])
+
+    assert len(view) == 3
+    assert terms(view.search("fox")) == ["Fox", "Fox", "Red fox"]
+
+
+def test_view_does_not_see_later_terms(index):
+    """Test that a view only finds the terms added before it was created."""
+    view = index.view()
+    index.add("Bearded dragon", ANIMAL)
+
+    assert "Bearded dragon" not in terms(view.search("bear"))
+    assert "Bearded dragon" not in terms(view.search("beardd"))
+    assert "Bearded dragon" in terms(index.view().search("bear"))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def db(request, tmp_path):
+    """Fixture for each storage engine."""
+    if request.param == "memory":
+        return AnimalsInMemoryDB()
+    return AnimalsSQLiteDB(tmp_path / "animals.sqlite3")
+
+
+def test_snapshot_search_lists_animals(db):
+    """Test that adjective results carry their animals, and animal results themselves."""
+    with db.batch():
+        db.insert_many(
+            adjectives=[("ursine", "Bear"), ("ursine", "Black bear")],
+            image_urls=[("https://example.com/beaver.jpg", "Beaver")],
+        )
+
+    assert db.snapshot().search("urs") == [
+        SearchResult(ADJECTIVE, "ursine", 1.0, ("Bear", "Black bear"))
+    ]
+    assert db.snapshot().search("beav") == [SearchResult(ANIMAL, "Beaver", 1.0, ("Beaver",))]
+
+
+def test_snapshot_indexes_its_terms_on_the_first_search(db):
+    """Test that the index is only built by a search, once per snapshot."""
+    with db.batch():
+        db.insert_animal_to_collateral_adjectives("ursine", "Bear")
+    snapshot = db.snapshot()
+    assert snapshot._search_view is None
+
+    view = snapshot.search_view
+    assert snapshot.search_view is view
+    assert len(view) == 2
+
+
+def test_snapshot_search_only_sees_published_data(db):
+    """Test that unpublished inserts are not searchable until they are published."""
+    with db.batch():
+        db.insert_animal_to_collateral_adjectives("ursine", "Bear")
+    db.insert_image_url("https://example.com/beaver.jpg", "Beaver")
+
+    assert terms(db.snapshot().search("bea")) == ["Bear"]
+    db.publish()
+    assert terms(db.snapshot().search("bea")) == ["Bear", "Beaver"]
+
+
+def test_reset_keeps_published_search(db):
+    """Test that a reset does not change the results of the published snapshot."""
+    with db.batch():
+        db.insert_animal_to_collateral_adjectives("ursine", "Bear")
+    db.reset()
+    db.insert_animal_to_collateral_adjectives("vulpine", "Fox")
+
+    assert terms(db.snapshot().search("ursine")) == ["ursine"]
+    db.publish()
+    assert terms(db.snapshot().search("ursine")) == []
+    assert terms(db.snapshot().search("fox")) == ["Fox"]
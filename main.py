@@ -1,93 +1,192 @@
+"""Command line entry point: scrapes Wikipedia animals and serves them.
+
+Usage:
+    python main.py scrape [--db-path animals.sqlite3] [--shards N] [--lazy-images] [--budget 60s]
+    python main.py serve [--db-path animals.sqlite3] [--workers N] [--port 8000]
+    python main.py [all] [--workers N] [--db-path animals.sqlite3] [--shards N] ...
+
+`scrape` builds a dataset in the SQLite file and exits, `serve` serves the dataset already
+in it without scraping, and `all`, the default, scrapes and then serves. Each command
+imports only what it needs: `serve` leaves the scraper stack (aiohttp, bs4, aiofiles) to
+the first refresh and `scrape` never loads the web stack (FastAPI, uvicorn, Jinja2).
+"""
+
+# pylint: disable=import-outside-toplevel
+import argparse
 import asyncio
-import time
-import uvicorn
-from fastapi import FastAPI, Request, BackgroundTasks
-from fastapi.templating import Jinja2Templates
+import multiprocessing
+import os
+import sys
+from typing import Optional
 
-from db.animals_db import AnimalsInMemoryDB
-from client.http_client import AsyncHttpClient
+from db.animals_sqlite_db import AnimalsSQLiteDB
 from logger.logging_setup import setup_logging
-from scraper.animal_page_scraper import AnimalPageScraper
-from scraper.file_handler import FileHandler
-from scraper.table_scraper import AnimalTableScraper
-
-# Initialize FastAPI app and templates
-app = FastAPI()
-templates = Jinja2Templates(directory="templates")
+from scraper.budget import parse_budget
+from scraper.checkpoint import Checkpoint, CheckpointLockedError
+from scraper.paths import checkpoint_path
+from scraper.priority import DEFAULT_SIGNALS, FetchPriority, parse_signals
+from scraper.progress import ScrapeProgress
 
-# Shared database instance
-db = AnimalsInMemoryDB()
+HOST = "127.0.0.1"
+PORT = 8000
+DEFAULT_DB_PATH = "animals.sqlite3"
+COMMANDS = ("scrape", "serve", "all")
 
 
-async def scrape_data():
-    """Runs the web scraper to populate the database."""
-    print("Starting data scraping...")
+def scrape(args: argparse.Namespace):
+    """Scrapes a fresh dataset into the SQLite file at `args.db_path`."""
+    from scraper.pipeline import scrape_data
 
-    queue_animals_pages = asyncio.Queue()
-    queue_images = asyncio.Queue()
+    setup_logging()
+    try:
+        asyncio.run(
+            scrape_data(
+                AnimalsSQLiteDB(args.db_path),
+                ScrapeProgress(),
+                checkpoint=Checkpoint(checkpoint_path(args.db_path)),
+                shards=args.shards,
+                lazy_images=args.lazy_images,
+                priority=FetchPriority(args.priority),
+                budget=args.budget,
+            )
+        )
+    except CheckpointLockedError as e:
+        sys.exit(f"{e}; wait for that scrape to finish")
 
-    start_time = time.perf_counter()
 
-    # Clear old data before re-scraping
-    global db
-    db = AnimalsInMemoryDB()  # Reset DB instance
+def serve(args: argparse.Namespace):
+    """Serves the dataset already in the SQLite file at `args.db_path`, without scraping."""
+    import uvicorn
 
-    async with AsyncHttpClient() as client, AsyncHttpClient() as client_image:
-        print("Created HTTP clients")
+    setup_logging()
+    if not os.path.exists(args.db_path):
+        print(f"No dataset at {args.db_path} yet; run `python main.py scrape` or POST /refresh")
+    os.environ["ANIMALS_DB_PATH"] = args.db_path  # Read by `server.db` in every worker
 
-        table_scraper = AnimalTableScraper(client, db, queue_animals_pages)
-        page_scraper = AnimalPageScraper(
-            client, client_image, db, queue_animals_pages, queue_images
-        )
-        file_handler = FileHandler(client_image, db)
-
-        print("Initialized scrapers")
-
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(table_scraper.run())
-            tg.create_task(page_scraper.run())
-            tg.create_task(file_handler.run())
-
-    db.get_all_data()
-    end_time = time.perf_counter()
-    print(f"Scraping complete. Execution time: {end_time - start_time:.4f} seconds")
-
-
-@app.get("/")
-async def homepage(request: Request):
-    """Renders the HTML page with scraped data."""
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "adjective_to_animals": db.collateral_adjectives_to_animals,
-            "animal_images": db.animal_image_urls,
-            "local_paths": db.animal_images_local_paths,
-        },
+    print(f"Starting {args.workers} FastAPI worker(s) on http://{args.host}:{args.port}")
+    uvicorn.run(
+        "server:app", host=args.host, port=args.port, workers=args.workers, log_level="info"
     )
 
 
-@app.post("/refresh")
-async def refresh_data(background_tasks: BackgroundTasks):
-    """
-    API endpoint to trigger a fresh data scrape.
-    - Runs scraping in the background.
-    - Returns an immediate response while the data refreshes.
+async def main(host: str = HOST, port: int = PORT, budget: Optional[float] = None):
+    """Runs the scraper and then starts the web server."""
+    import uvicorn
+    import server
+
+    setup_logging()
+    await server.scrape_data(budget=budget)  # First, scrape and populate the database
+
+    print(f"Starting FastAPI server on http://{host}:{port}")
+    config = uvicorn.Config(server.app, host=host, port=port, log_level="info")
+    await uvicorn.Server(config).serve()
+
+
+def serve_workers(args: argparse.Namespace):
+    """Serves the app from several uvicorn worker processes sharing one SQLite dataset.
+
+    The dataset is built by a separate scrape process while the workers already serve the
+    last published generation; each worker picks up a new generation on its next request.
     """
-    background_tasks.add_task(asyncio.run, scrape_data())  # Runs asynchronously
-    return {"message": "Data refresh started! Check back in a few minutes."}
+    scraper = multiprocessing.get_context("spawn").Process(
+        target=scrape, args=(args,), name="scraper"
+    )
+    scraper.start()
+    try:
+        serve(args)
+    finally:
+        if scraper.is_alive():
+            scraper.terminate()
+        scraper.join()
+
+
+def scrape_and_serve(args: argparse.Namespace):
+    """Scrapes and then serves; with several workers, serves while a scrape process runs."""
+    if args.workers > 1:
+        serve_workers(args)
+    else:
+        asyncio.run(main(args.host, args.port, args.budget))
+
+
+def _add_scrape_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=int(os.environ.get("ANIMALS_SCRAPE_SHARDS", "1")),
+        help="Number of processes animal pages and images are scraped in.",
+    )
+    parser.add_argument(
+        "--lazy-images",
+        action="store_true",
+        default=bool(os.environ.get("ANIMALS_LAZY_IMAGES")),
+        help="Download each image when it is first viewed instead of during the scrape.",
+    )
+    parser.add_argument(
+        "--priority",
+        type=parse_signals,
+        default=os.environ.get("ANIMALS_FETCH_PRIORITY", ",".join(DEFAULT_SIGNALS)),
+        help="Comma-separated signals animals are fetched by, most important first, "
+        "out of views, staleness, table and name (default: %(default)s).",
+    )
 
 
-async def main():
-    """Runs the scraper and then starts the web server."""
-    setup_logging()
-    await scrape_data()  # First, scrape and populate the database
+def _add_serve_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--host", default=HOST, help="Address to bind (default: %(default)s).")
+    parser.add_argument(
+        "--port", type=int, default=PORT, help="Port to bind (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of uvicorn worker processes; with `all`, more than one implies SQLite "
+        "storage.",
+    )
+
 
-    print("Starting FastAPI server on http://127.0.0.1:8000")
-    config = uvicorn.Config(app, host="127.0.0.1", port=8000, log_level="info")
-    server = uvicorn.Server(config)
-    await server.serve()
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in (*COMMANDS, "-h", "--help"):
+        argv = ["all", *argv]  # No command: scrape, then serve
+
+    parser = argparse.ArgumentParser(description="Scrape Wikipedia animals and serve them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "scrape", help="Scrape a fresh dataset into the SQLite file and exit."
+    ).set_defaults(run=scrape)
+    commands.add_parser(
+        "serve", help="Serve the dataset in the SQLite file without scraping first."
+    ).set_defaults(run=serve)
+    commands.add_parser(
+        "all", help="Scrape, then serve (the default)."
+    ).set_defaults(run=scrape_and_serve)
+
+    for command, subparser in commands.choices.items():
+        subparser.add_argument(
+            "--db-path",
+            default=os.environ.get("ANIMALS_DB_PATH", DEFAULT_DB_PATH),
+            help="SQLite file the dataset is kept in"
+            + (", with more than one worker" if command == "all" else "")
+            + " (default: %(default)s).",
+        )
+        _add_scrape_arguments(subparser)  # `serve` and `all` use them for refreshes
+        if command != "serve":  # Both build a dataset first, in this or a scrape process
+            subparser.add_argument(
+                "--budget",
+                type=parse_budget,
+                help="Stop fetching after this long, e.g. 60s or 5m, keeping the previous "
+                "data of the animals not reached; the stalest pages and missing images are "
+                "fetched first.",
+            )
+        if command != "scrape":
+            _add_serve_arguments(subparser)
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    cli_args = parse_args()
+    os.environ["ANIMALS_SCRAPE_SHARDS"] = str(cli_args.shards)  # Also used by refreshes
+    if cli_args.lazy_images:
+        os.environ["ANIMALS_LAZY_IMAGES"] = "1"
+    os.environ["ANIMALS_FETCH_PRIORITY"] = ",".join(cli_args.priority)
+    cli_args.run(cli_args)
@@ -1,22 +1,32 @@
 """Animal Page Scraper Module
 
 This module defines the AnimalPageScraper class, responsible for fetching and processing
-animal pages using asynchronous HTTP requests and an in-memory database.
+animal pages using asynchronous HTTP requests and an in-memory database. A fixed-size pool
+of fetchers takes animal page URLs off a UrlFrontier as soon as the table scraper emits
+them, and the image found on each page is emitted to a second frontier for FileHandler.
+Pages recorded in the checkpoint of an interrupted scrape are replayed instead of fetched.
+The time each animal's page was fetched is stored, so refreshes can tell stale pages apart.
 """
 
 import asyncio
 import logging
+import time
 from typing import Optional
 
 from bs4 import BeautifulSoup
-from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
 from client.http_client import AsyncHttpClient
+from scraper.checkpoint import Checkpoint
+from scraper.frontier import UrlFrontier, normalize_url
+from scraper.progress import ScrapeProgress
 from scraper.web_scraper import WebScraper
 
 MAX_ATTEMPTS = 5  # Maximum number of retry attempts
 INITIAL_BACKOFF = 1  # Initial backoff time in seconds
 BACKOFF_MULTIPLIER = 2  # Multiplier for exponential backoff
 
+DEFAULT_PAGE_URL = "https://en.wikipedia.org/wiki/"  # Base for links on unknown pages
+
 
 class AnimalPageScraper(WebScraper):
     """Scrapes animal pages asynchronously and processes images."""
@@ -24,113 +34,142 @@ class AnimalPageScraper(WebScraper):
     def __init__(
         self,
         http_client: AsyncHttpClient,
-        http_client_image: AsyncHttpClient,
-        db: AnimalsInMemoryDB,
-        input_queue: Optional[asyncio.Queue] = None,
-        output_queue: Optional[asyncio.Queue] = None,
-        max_concurrent_requests: int = 10,
+        db: AnimalsStorage,
+        frontier: UrlFrontier,
+        image_frontier: UrlFrontier,
+        fetchers: int = 10,
+        checkpoint: Optional[Checkpoint] = None,
+        progress: Optional[ScrapeProgress] = None,
     ):
         super().__init__()
         self._logger = logging.getLogger(__name__)
         self._http_client_animal_page = http_client
-        self._http_client_image = http_client_image
         self._db = db
-        self._input_queue = input_queue or asyncio.Queue()
-        self._output_queue = output_queue or asyncio.Queue()
-        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
-        self._stop_event = asyncio.Event()
+        self._frontier = frontier
+        self._image_frontier = image_frontier
+        self._fetchers = fetchers
+        self._checkpoint = checkpoint
+        self._progress = progress
+        # Page URL -> its image URL and the animals it has been recorded for
+        self._recorded: dict[str, tuple[Optional[str], set[Optional[str]]]] = {}
 
     async def run(self):
-        """Ensures the scraper waits for data before processing."""
-        self._logger.debug("Waiting for data in queue...")
-
-        while self._http_client_animal_page.queue.empty():
-            self._logger.debug("Still waiting...")
-            await asyncio.sleep(1)
+        """Runs a fixed-size pool of fetchers until the frontier is drained."""
+        self._logger.debug(f"Starting {self._fetchers} page fetchers")
 
-        self._logger.debug("Data available! Starting processing.")
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(self._fetchers):
+                    tg.create_task(self._page_fetcher())
 
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(self._fetch_animal_pages())
-            workers = [tg.create_task(self._page_worker()) for _ in range(10)]
-            await self._input_queue.join()
-            self._stop_event.set()
-            await asyncio.gather(*workers)
+            # Animals whose link to a page came only after it had been fetched
+            for url, (image_url, recorded) in self._recorded.items():
+                await self._record_page(url, image_url, next(iter(recorded)))
+        finally:
+            self._image_frontier.close()  # No more images will be discovered
 
+        self._stop_event.set()
         self._logger.info("Exiting run()")
 
-    async def _fetch_animal_pages(self):
-        """Fetches animal pages and enqueues them for workers."""
-        self._logger.debug("Starting _fetch_animal_pages")
-
-        while not self._stop_event.is_set():
-            try:
-                results = await self._http_client_animal_page.get_results(batch_size=10)
-                if not results:
-                    self._logger.warning("No results received, stopping fetch loop.")
-                    break
-
-                self._logger.info(f"Fetched {len(results)} animal pages")
-
-                for url, response in results:
-                    if not url or not response:
-                        self._logger.warning(f"Invalid results received: {results}")
-                        continue
-                    await self._output_queue.put((url, response))
-                    self._input_queue.task_done()
-
-            except asyncio.TimeoutError:
-                self._logger.warning("Timeout fetching pages")
-            except Exception as exc:
-                self._logger.error("Error fetching animal page: %s", exc)
-
-        self._logger.info("Finished fetching pages, exiting.")
-
-    async def _page_worker(self):
-        """Processes animal pages from the queue with retry logic and backoff."""
-        self._logger.info("Starting _page_worker")
-
-        while not self._stop_event.is_set() or not self._output_queue.empty():
-            try:
-                item = await asyncio.wait_for(self._output_queue.get(), timeout=2)
-            except asyncio.TimeoutError:
-                self._logger.warning("Timeout waiting for output queue")
+    async def _page_fetcher(self):
+        """Takes animal pages off the frontier, fetches and processes them one by one."""
+        while (item := await self._frontier.get()) is not None:
+            url, animal_name = item
+            if self._checkpoint and url in self._checkpoint.pages:
+                self._logger.debug(f"Replaying {url} from the checkpoint")
+                image_url = self._checkpoint.pages[url]
+                await self._emit_image(image_url, animal_name)
+                # Fetched by the interrupted scrape, moments ago
+                await self._record_page(url, image_url, animal_name)
                 continue
 
-            if not item:
-                break
+            result = await self._fetch_page(url)
+            if result is None:
+                continue  # Not recorded, so a resumed scrape retries it
 
-            url, response = item
+            final_url, response = result
+            if not self._frontier.resolve(url, final_url):
+                self._logger.debug(f"{url} redirects to a page already seen")
             self._logger.debug(f"Processing {url}")
+            image_url = await self._process_page(final_url, response, animal_name)
+            self._logger.debug(f"Finished processing {url}")
 
-            await self._process_page(url, response)
-            self._output_queue.task_done()
+            if self._checkpoint:
+                self._checkpoint.record_page(url, image_url)
+            await self._record_page(url, image_url, animal_name)
 
-            self._logger.debug(f"Finished processing {url}")
+        self._logger.debug("Exiting _page_fetcher")
 
-        self._logger.debug("Exiting _page_worker")
+    async def _record_page(self, url: str, image_url: Optional[str], animal_name: Optional[str]):
+        """Stores a page's image and fetch time for `animal_name` and every animal sharing it.
 
-    async def _process_page(self, url: str, response: str):
-        """Processes an individual animal page and fetches the image URL."""
-        animal_name = url.split("/")[-1]
+        The page is fetched once, for the animal it was queued for, whose image has already
+        been emitted; the others, e.g. two rows of the table linking to the same page, get
+        the same image.
+        """
+        _, recorded = self._recorded.setdefault(url, (image_url, set()))
+        for name in dict.fromkeys([animal_name, *self._frontier.animals(url)]):
+            if name in recorded:
+                continue
+            recorded.add(name)
+            if name != animal_name:
+                await self._emit_image(image_url, name)
+            self._record_fetched(name)
+            if self._progress:
+                self._progress.page_fetched(name, image_url)
+
+    def _record_fetched(self, animal_name: Optional[str]):
+        """Stores the time the animal's page was fetched at."""
+        if animal_name:
+            self._db.insert_fetched_at(animal_name, time.time())
+
+    async def _fetch_page(self, url: str) -> Optional[tuple[str, str]]:
+        """Fetches an animal page, returning None if the request failed.
+
+        Returns:
+            The URL the page was served from after redirects, and the page's HTML.
+        """
+        try:
+            result = await self._http_client_animal_page.fetch(
+                url, enqueue=False, final_url=True, timeout=self._frontier.time_left()
+            )
+        except Exception as exc:
+            self._logger.error(f"Error fetching animal page {url}: {exc}")
+            return None
+
+        if not isinstance(result, tuple) or not result[1]:
+            if self._frontier.stopped:
+                self._logger.debug(f"Left {url} for the next refresh: {result}")
+            else:
+                self._logger.warning(f"Failed to fetch animal page {url}: {result}")
+            return None
+        return result
+
+    async def _process_page(
+        self, url: str, response: str, animal_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Processes an individual animal page and emits its image to the image frontier.
+
+        Returns:
+            The URL of the animal's image, or None if the page has none.
+        """
+        animal_name = animal_name or url.split("/")[-1]
         self._logger.debug(f"Extracting image of {animal_name}")
-        image_url = await self._extract_image_url(response, animal_name)
+        image_url = await self._extract_image_url(response, animal_name, url)
+        await self._emit_image(image_url, animal_name)
+        return image_url
 
+    async def _emit_image(self, image_url: Optional[str], animal_name: str):
+        """Stores an animal's image URL and queues the image for download."""
         if image_url:
             self._db.insert_image_url(image_url, animal_name)
-            asyncio.create_task(self._submit_image(image_url))
-
-    async def _submit_image(self, image_url: str):
-        """Handles async submission of images with proper error handling."""
-        try:
-            await self._http_client_image.submit_urls([image_url], is_image=True)
-        except Exception as exc:
-            self._logger.error(f"Failed to submit image URL {image_url}: {exc}")
+            if not await self._image_frontier.put(image_url, animal_name):
+                self._logger.debug(f"Image {image_url} is already being downloaded")
 
     async def _extract_image_url(
-        self, html_page: str, animal_name: str
+        self, html_page: str, animal_name: str, page_url: str = DEFAULT_PAGE_URL
     ) -> Optional[str]:
-        """Extracts the first available image URL from the page."""
+        """Extracts the first available image URL from the page, normalized."""
         self._logger.debug(f"Fetching image for {animal_name}")
         if not html_page:
             return None
@@ -139,8 +178,8 @@ class AnimalPageScraper(WebScraper):
         infobox = soup.find("table", {"class": "infobox"})
         image_tag = infobox.find("img") if infobox else None
 
-        if image_tag:
-            image_url = "https:" + image_tag.get("src")
+        if image_tag and image_tag.get("src"):
+            image_url = normalize_url(image_tag.get("src"), base=page_url)
             self._logger.debug(f"Found infobox image for {animal_name}: {image_url}")
             return image_url
 
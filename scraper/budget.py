@@ -0,0 +1,57 @@
+"""Refresh Budget Module
+
+This module parses the time budget of a refresh, e.g. `POST /refresh?budget=60s`, and
+defines the Deadline it is measured against. Once the deadline has passed, the page and
+image frontiers stop themselves (see `UrlFrontier.stop()`): no more URLs are handed out,
+requests in flight are cut off by a timeout of the time that was left when they started,
+and the refresh publishes what it has.
+
+It imports nothing beyond the standard library, so the web server can validate a budget
+without loading the scraper stack.
+"""
+
+import re
+import time
+from collections.abc import Callable
+
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+_BUDGET = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|s|m|h)?")
+
+
+def parse_budget(value: str) -> float:
+    """Parses a duration such as "60s", "1.5m", "500ms" or "90" (seconds).
+
+    Returns:
+        float: The duration in seconds.
+
+    Raises:
+        ValueError: If the value is not a positive duration.
+    """
+    match = _BUDGET.fullmatch(value.strip())
+    seconds = float(match[1]) * _UNITS[match[2] or "s"] if match else 0
+    if seconds <= 0:
+        raise ValueError(f"Invalid budget {value!r}; expected a duration such as 60s or 5m")
+    return seconds
+
+
+class Deadline:
+    """The moment a refresh's time budget runs out, on a given clock."""
+
+    def __init__(self, budget: float, clock: Callable[[], float] = time.monotonic):
+        """Starts the budget now.
+
+        Args:
+            budget (float): Seconds until the deadline.
+            clock (Callable[[], float]): Returns the current time in seconds; tests can
+                substitute a clock they control.
+        """
+        self._clock = clock
+        self._expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """Returns the seconds left until the deadline, 0 once it has passed."""
+        return max(self._expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
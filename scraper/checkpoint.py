@@ -0,0 +1,142 @@
+"""Scrape Checkpoint Module
+
+This module defines the Checkpoint class, an append-only journal of the animal pages and
+images a scrape has completed. Records are buffered and appended to the journal file as
+JSON lines every few records or seconds, so a scrape that dies part-way loses at most the
+last unflushed records. A restarted scrape loads the journal and replays what it records
+instead of fetching those URLs again; only the pages and images that were not completed
+are fetched. The journal is removed once a scrape completes, so the next refresh starts
+from scratch. A scrape holds an exclusive lock on its journal while it runs, so a second
+scrape of the same database, in this or another process, is refused instead of
+interleaving its records with the first one's.
+"""
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
+
+DEFAULT_BATCH_SIZE = 32  # Pending records that trigger a flush
+DEFAULT_FLUSH_INTERVAL = 1.0  # Seconds after which pending records are flushed
+
+
+class CheckpointLockedError(RuntimeError):
+    """Raised when another scrape is running on the same journal."""
+
+
+class Checkpoint:
+    """A journal of completed animal pages and images, keyed by their normalized URLs.
+
+    Attributes:
+        path (Path): The journal file.
+        _batch_size (int): The number of pending records that triggers a flush.
+        _flush_interval (float): Seconds after which pending records are flushed.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        self._logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pages: dict[str, Optional[str]] = {}
+        self._images: dict[str, str] = {}
+        self._pending: list[str] = []
+        self._last_flush = time.monotonic()
+        self._load()
+
+    def _load(self):
+        """Reads the records of an interrupted scrape, if the journal exists."""
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The process died while appending; the record was never completed
+                    self._logger.warning(f"Ignoring torn record in {self.path}")
+                    continue
+                if "page" in record:
+                    self._pages[record["page"]] = record["image_url"]
+                elif "image" in record:
+                    self._images[record["image"]] = record["local_path"]
+
+        self._logger.info(
+            f"Loaded checkpoint with {len(self._pages)} pages and {len(self._images)} images"
+        )
+
+    @property
+    def pages(self) -> Mapping[str, Optional[str]]:
+        """Completed animal page URLs, mapped to the image URL found on the page, if any."""
+        return MappingProxyType(self._pages)
+
+    @property
+    def images(self) -> Mapping[str, str]:
+        """Completed image URLs, mapped to the local path the image was saved to."""
+        return MappingProxyType(self._images)
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator["Checkpoint"]:
+        """Holds an exclusive lock on the journal for as long as the scrape runs.
+
+        The lock is taken on a `.lock` file next to the journal, which outlives `remove()`,
+        and is released by the operating system if the process dies.
+
+        Raises:
+            CheckpointLockedError: If another scrape holds the lock.
+        """
+        with open(f"{self.path}.lock", "a", encoding="utf-8") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError as e:
+                raise CheckpointLockedError(f"Another scrape is using {self.path}") from e
+            try:
+                yield self
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def record_page(self, url: str, image_url: Optional[str]):
+        """Records that an animal page has been processed."""
+        self._pages[url] = image_url
+        self._append({"page": url, "image_url": image_url})
+
+    def record_image(self, url: str, local_path: str):
+        """Records that an image has been downloaded and saved."""
+        self._images[url] = local_path
+        self._append({"image": url, "local_path": local_path})
+
+    def _append(self, record: dict):
+        self._pending.append(json.dumps(record) + "\n")
+        if (
+            len(self._pending) >= self._batch_size
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Appends pending records to the journal and syncs it to disk."""
+        if self._pending:
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write("".join(self._pending))
+                journal.flush()
+                os.fsync(journal.fileno())
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def remove(self):
+        """Discards the journal once the scrape it tracks has completed."""
+        self._pending = []
+        self._pages.clear()
+        self._images.clear()
+        self.path.unlink(missing_ok=True)
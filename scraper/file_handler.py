@@ -1,131 +1,175 @@
 import asyncio
 import logging
-import random
+import os
 import tempfile
 from pathlib import Path
+from typing import Optional
+
 import aiofiles
 from client.http_client import AsyncHttpClient
-from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
+from scraper.checkpoint import Checkpoint
+from scraper.frontier import UrlFrontier
+from scraper.paths import image_path
+from scraper.progress import ScrapeProgress
 from scraper.web_scraper import WebScraper
 
-MAX_ATTEMPTS = 5  # Maximum number of retry attempts
-INITIAL_BACKOFF = 1  # Initial backoff time in seconds
-BACKOFF_MULTIPLIER = 2  # Multiplier for exponential backoff
+
+async def save_file(file_path: Path, file_data: bytes):
+    """Writes a file asynchronously and atomically.
+
+    The data is written to a temporary file that is then renamed into place, so a crash
+    mid-write never leaves a truncated image behind.
+    """
+    part_path = file_path.with_name(file_path.name + ".part")
+    async with aiofiles.open(part_path, "wb") as file:
+        await file.write(file_data)
+    os.replace(part_path, file_path)
 
 
 class FileHandler(WebScraper):
     def __init__(
         self,
         http_client: AsyncHttpClient,
-        db: AnimalsInMemoryDB,
-        queue=asyncio.Queue(),
+        db: AnimalsStorage,
+        frontier: UrlFrontier,
         max_concurrent_downloads: int = 10,
+        checkpoint: Optional[Checkpoint] = None,
+        progress: Optional[ScrapeProgress] = None,
     ):
         super().__init__()
         self._http_client = http_client
         self._logger = logging.getLogger(__name__)
         self._db = db
-        self._queue = queue
-        self._semaphore = asyncio.Semaphore(
-            max_concurrent_downloads
-        )  # Limit concurrent downloads
+        self._frontier = frontier
+        self._max_concurrent_downloads = max_concurrent_downloads
+        self._checkpoint = checkpoint
+        self._progress = progress
         self._existing_images = self.get_existing_images(
             tempfile.gettempdir()
         )  # Use a set for quick lookups
+        # Image URL -> its local path and the animals it has been recorded for
+        self._recorded: dict[str, tuple[str, set[str]]] = {}
 
     async def run(self):
-        """Ensure FileHandler waits for image URLs before processing."""
-        self._logger.debug("Waiting for data in queue...")
-
-        # Wait until the queue has at least 1 item
-        while self._http_client.queue.empty():
-            await asyncio.sleep(1)
-
-        self._logger.info("Starting processing as data is available")
+        """Downloads images from the frontier with a fixed pool of fetchers."""
+        self._logger.info("Starting image fetchers")
 
         async with asyncio.TaskGroup() as tg:
-            tg.create_task(self._fetch_images())
-
-            workers = [tg.create_task(self._image_worker()) for _ in range(10)]
-
-            await self._queue.join()  # Ensure all queued images are processed
-
-            self._logger.info("Queue fully processed, stopping workers...")
-
-            self._stop_event.set()
-            await asyncio.gather(*workers)
+            for _ in range(self._max_concurrent_downloads):
+                tg.create_task(self._image_fetcher())
 
+        # Animals whose page named an image only after it had been saved
+        for image_url, (local_path, _) in self._recorded.items():
+            self._record_local_path(image_url, local_path)
+        self._stop_event.set()
         self._logger.info("Exiting run()")
 
-    async def _fetch_images(self):
-        """Fetch images asynchronously in small batches to improve performance."""
-        while not self._stop_event.is_set():
-            try:
-                results = await asyncio.gather(
-                    *[
-                        self._http_client.get_result() for _ in range(10)
-                    ]  # Fetch multiple images at once
-                )
-                for result in results:
-                    await self._queue.put(result)  # Add images to the queue
-            except Exception as e:
-                self._logger.error(f"Error fetching image: {e}")
-
     def get_existing_images(self, directory: str) -> set:
         """Retrieve all image filenames in the directory and store them in a set."""
         return {
             file.name for file in Path(directory).glob("*.jpg")
         }  # Store as str for quick lookup
 
-    async def _image_worker(self):
-        """Worker that processes image downloads from the queue."""
-        attempts = 0
-        backoff = INITIAL_BACKOFF
-
-        while not self._stop_event.is_set() or not self._queue.empty():
-            try:
-                item = await asyncio.wait_for(self._queue.get(), timeout=2)
-                attempts = 0  # Reset attempts on success
-            except asyncio.TimeoutError:
-                attempts += 1
-                if attempts >= MAX_ATTEMPTS:
-                    logging.error("Max retry attempts reached, giving up")
-                    break
-                await asyncio.sleep(backoff + random.uniform(0, 0.5))
-                backoff *= BACKOFF_MULTIPLIER
-                continue  # Skip the rest of the loop and retry
-
-            await self._save_image_locally(*item)
-            self._queue.task_done()
-
-        self._logger.debug("Exiting _image_worker")
-
-    async def _save_image_locally(self, image_url: str, image_data: bytes) -> None:
-        """Downloads and saves an image asynchronously with minimal blocking."""
-        animal_name = self._db.get_animal_name_by_url(image_url)
+    async def _image_fetcher(self):
+        """Takes image URLs off the frontier, downloads and saves them one by one."""
+        while (item := await self._frontier.get()) is not None:
+            image_url, animal_name = item
+            if self._replay_image(image_url, animal_name):
+                continue
+
+            image_data = await self._fetch_image(image_url)
+            if image_data is None:
+                continue  # Not recorded, so a resumed scrape retries it
+
+            local_path = await self._save_image_locally(image_url, image_data, animal_name)
+            if local_path and self._checkpoint:
+                self._checkpoint.record_image(image_url, local_path)
+
+        self._logger.debug("Exiting _image_fetcher")
+
+    def _replay_image(self, image_url: str, animal_name: Optional[str]) -> bool:
+        """Stores the local path of an image saved by an interrupted scrape, if still there."""
+        if not self._checkpoint or image_url not in self._checkpoint.images:
+            return False
+
+        local_path = self._checkpoint.images[image_url]
+        animal_name = animal_name or self._db.get_animal_name_by_url(image_url)
+        if not animal_name or not Path(local_path).exists():
+            return False
+
+        self._logger.debug(f"Replaying {image_url} from the checkpoint")
+        self._record_local_path(image_url, local_path, animal_name)
+        return True
+
+    async def _fetch_image(self, image_url: str) -> Optional[bytes]:
+        """Downloads an image, returning None if the request failed."""
+        try:
+            result = await self._http_client.fetch(
+                image_url, is_image=True, enqueue=False, timeout=self._frontier.time_left()
+            )
+        except Exception as e:
+            self._logger.error(f"Error fetching image {image_url}: {e}")
+            return None
+
+        if not isinstance(result, tuple) or not isinstance(result[1], bytes):
+            if self._frontier.stopped:
+                self._logger.debug(f"Left {image_url} for the next refresh: {result}")
+            else:
+                self._logger.warning(f"Failed to fetch image {image_url}: {result}")
+            return None
+        return result[1]
+
+    async def _save_image_locally(
+        self, image_url: str, image_data: bytes, animal_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Saves a downloaded image asynchronously with minimal blocking.
+
+        Returns:
+            The local path of the image, or None if it could not be saved.
+        """
+        animal_name = animal_name or self._db.get_animal_name_by_url(image_url)
         if not animal_name:
             self._logger.warning(
                 f"Could not find animal name for image url: {image_url}"
             )
-            return
+            return None
 
-        local_file_path = Path(tempfile.gettempdir(), f"{animal_name}.jpg")
+        local_file_path = image_path(animal_name)
 
         # Faster existence check
         if local_file_path.name in self._existing_images:
             self._logger.info(f"Image already exists at {local_file_path}")
-            return
+        elif not await self._write_file(local_file_path, image_data):
+            return None
 
-        async with self._semaphore:
-            await self._write_file(local_file_path, image_data)
+        self._record_local_path(image_url, str(local_file_path), animal_name)
+        return str(local_file_path)
 
-        self._db.insert_image_local_path(animal_name, str(local_file_path))
-
-    async def _write_file(self, file_path: Path, file_data: bytes):
+    def _record_local_path(
+        self, image_url: str, local_path: str, animal_name: Optional[str] = None
+    ):
+        """Stores the local path of an image for `animal_name` and every animal sharing it.
+
+        The image is saved once, under the name of the animal it was queued for, and that
+        file is recorded for the others too.
+        """
+        _, recorded = self._recorded.setdefault(image_url, (local_path, set()))
+        sharing = self._frontier.animals(image_url)
+        for name in [animal_name, *sharing] if animal_name else sharing:
+            if name in recorded:
+                continue
+            recorded.add(name)
+            self._db.insert_image_local_path(name, local_path)
+            if self._progress:
+                self._progress.image_saved(name, local_path)
+
+    async def _write_file(self, file_path: Path, file_data: bytes) -> bool:
         """Writes file asynchronously to avoid blocking I/O."""
         try:
-            async with aiofiles.open(file_path, "wb") as file:
-                await file.write(file_data)
+            await save_file(file_path, file_data)
             self._logger.debug(f"Image saved at {file_path}")
+            return True
         except Exception as e:
             self._logger.error(f"Failed to save image {file_path}: {e}")
+            return False
@@ -0,0 +1,233 @@
+"""URL Frontier Module
+
+This module defines the UrlFrontier class, the hand-off point between a stage that
+discovers URLs (e.g. parsing the animal table) and a pool of fetchers that download them.
+Producers put URLs as fast as they find them and close the frontier when done; each
+fetcher takes the next URL as soon as it is free, so discovery and network I/O overlap.
+
+URLs are normalized before they are queued and every normalized URL is queued at most
+once, so an animal page or image that is linked from several places is fetched only once.
+With a priority function (see scraper.priority), URLs are handed out by priority instead of
+in the order they were found.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Callable
+from typing import Any, Optional
+from urllib.parse import quote, unquote, urljoin, urlsplit, urlunsplit
+
+from scraper.budget import Deadline
+
+# Sentinel handed from fetcher to fetcher once the frontier is closed; sorts after every URL
+_CLOSED = (1, (), 0, None)
+
+_SAFE_PATH_CHARS = "/:@!$&'()*+,;=-._~"  # RFC 3986 path characters left unescaped
+_SAFE_QUERY_CHARS = _SAFE_PATH_CHARS + "?"
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> str:
+    """Returns the canonical form of a URL, so equivalent links compare equal.
+
+    Relative and protocol-relative URLs are resolved against `base`, the scheme and host
+    are lowercased, the path and query are consistently percent-encoded and the fragment
+    is dropped.
+
+    Args:
+        url (str): The URL, possibly relative, as found in a page.
+        base (Optional[str]): The URL of the page the link was found in.
+
+    Returns:
+        str: The normalized absolute URL.
+    """
+    if base:
+        url = urljoin(base, url)
+    scheme, netloc, path, query, _ = urlsplit(url.strip())
+    return urlunsplit(
+        (
+            scheme.lower(),
+            netloc.lower(),
+            quote(unquote(path), safe=_SAFE_PATH_CHARS) or "/",
+            quote(unquote(query), safe=_SAFE_QUERY_CHARS),
+            "",
+        )
+    )
+
+
+class UrlFrontier:
+    """An asynchronous work queue of `(url, animal_name)` items to be fetched.
+
+    Items are handed out lowest priority key first and, for equal keys, in the order they
+    were added.
+
+    Attributes:
+        saved (int): The number of fetches avoided because the URL was already seen.
+        left (int): The number of URLs dropped by `stop()` instead of being handed out.
+    """
+
+    def __init__(
+        self,
+        priority: Optional[Callable[[Optional[str]], Any]] = None,
+        hold: bool = False,
+        deadline: Optional[Deadline] = None,
+    ):
+        """Creates an empty frontier.
+
+        Args:
+            priority (Optional[Callable]): Returns the sort key of an item from its animal
+                name; items are handed out in plain FIFO order without one.
+            hold (bool): Hand out no URL until the frontier is closed, so that even the
+                first URLs are the highest priority of all rather than of those added
+                so far.
+            deadline (Optional[Deadline]): When the frontier stops itself, see `stop()`.
+        """
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._priority = priority
+        self._deadline = deadline
+        self._released = asyncio.Event()
+        if not hold:
+            self._released.set()
+        self._counter = itertools.count()  # Keeps FIFO order among equal priorities
+        self._closed = False
+        self._stopped = False
+        self._seen: set[str] = set()
+        self._animals: dict[str, list[str]] = {}  # Every animal each URL was added for
+        self.saved = 0
+        self.left = 0
+
+    async def put(
+        self, url: str, animal_name: Optional[str] = None, base: Optional[str] = None
+    ) -> bool:
+        """Adds a URL to fetch, together with the animal it belongs to.
+
+        Args:
+            url (str): The URL to fetch, possibly relative to `base`.
+            animal_name (Optional[str]): The animal the URL belongs to.
+            base (Optional[str]): The URL of the page the link was found in.
+
+        Returns:
+            bool: True if the URL was queued, False if it had already been seen or the
+                frontier has been stopped.
+        """
+        self._check_deadline()
+        if self._stopped:
+            self.left += 1
+            return False
+        if self._closed:
+            raise RuntimeError("Cannot add URLs to a closed frontier")
+
+        url = normalize_url(url, base)
+        if animal_name is not None:
+            animals = self._animals.setdefault(url, [])
+            if animal_name not in animals:
+                animals.append(animal_name)
+        if url in self._seen:
+            self.saved += 1
+            return False
+
+        self._seen.add(url)
+        key = self._priority(animal_name) if self._priority else ()
+        await self._queue.put((0, key, next(self._counter), (url, animal_name)))
+        return True
+
+    def animals(self, url: str) -> list[str]:
+        """Returns every animal a URL has been added for so far, in the order they came.
+
+        A URL is handed out once, with the first animal, but several animals can share
+        it, e.g. one image shown on several animal pages.
+        """
+        return list(self._animals.get(url, ()))
+
+    def resolve(self, url: str, final_url: str) -> bool:
+        """Records where a fetched URL was redirected to.
+
+        Args:
+            url (str): The URL as handed out by `get()`.
+            final_url (str): The URL the response was actually served from.
+
+        Returns:
+            bool: False if the redirect target had already been seen, meaning the
+                response duplicates one that is fetched elsewhere. It was fetched all the
+                same, so it is not counted in `saved`.
+        """
+        final_url = normalize_url(final_url)
+        if final_url == url:
+            return True
+        if final_url in self._seen:
+            return False
+
+        self._seen.add(final_url)  # Later links to the target are not fetched again
+        return True
+
+    async def get(self) -> Optional[tuple[str, Optional[str]]]:
+        """Waits for the next URL to fetch.
+
+        Returns:
+            The next `(url, animal_name)` item, or None once the frontier is closed and
+            every URL has been handed out.
+        """
+        await self._released.wait()
+        self._check_deadline()
+        entry = await self._queue.get()
+        if entry is not _CLOSED and self._check_deadline():
+            self.left += 1  # The deadline passed while waiting for it
+            entry = _CLOSED
+        if entry is _CLOSED:
+            self._queue.put_nowait(_CLOSED)  # Wake up the next waiting fetcher
+            return None
+        return entry[-1]
+
+    def close(self):
+        """Signals that no more URLs will be added."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(_CLOSED)
+            self._released.set()
+
+    def stop(self):
+        """Closes the frontier and drops the URLs that have not been handed out yet.
+
+        Fetchers finish the URL they are working on, whose request times out at the
+        deadline (see `time_left()`), and then get None, so a refresh whose time budget has
+        expired stops cleanly. URLs added afterwards are dropped as well. Called by `put()`
+        or `get()` once the frontier's deadline has passed.
+        """
+        self._stopped = True
+        while not self._queue.empty():
+            if self._queue.get_nowait() is not _CLOSED:
+                self.left += 1
+        self._closed = True
+        self._queue.put_nowait(_CLOSED)
+        self._released.set()
+
+    def _check_deadline(self) -> bool:
+        """Stops the frontier if its deadline has passed, and returns whether it is stopped."""
+        if self._deadline is not None and not self._stopped and self._deadline.expired:
+            self.stop()
+        return self._stopped
+
+    def time_left(self) -> Optional[float]:
+        """Returns the seconds until the frontier's deadline, or None without one.
+
+        Fetchers use it as the timeout of the request for a URL they were handed, so a
+        request in flight cannot overrun the budget.
+        """
+        return self._deadline.remaining() if self._deadline is not None else None
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the frontier has been stopped, or its deadline has passed."""
+        return self._check_deadline()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def seen(self) -> int:
+        """The number of distinct URLs queued or reached through a redirect."""
+        return len(self._seen)
+
+    def empty(self) -> bool:
+        """Returns True if no URL is waiting to be fetched."""
+        return self._queue.empty() or (self._closed and self._queue.qsize() == 1)
@@ -0,0 +1,170 @@
+"""Image Cache Module
+
+This module defines the ImageCache class, which downloads animal images on demand when the
+scrape runs in lazy mode and only records image URLs. The first request for an animal's
+image downloads and saves it; concurrent requests for the same animal wait for that single
+download instead of starting their own. Views are counted per animal so `prefetch()` can
+warm the most-viewed images first, e.g. after a refresh changed their URLs.
+
+The HTTP client stack is only imported by the first download, so a server whose images
+are all on disk starts without it.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from scraper.paths import image_path
+
+if TYPE_CHECKING:
+    from client.http_client import AsyncHttpClient
+
+DEFAULT_PREFETCH_LIMIT = 50  # Most-viewed images warmed by each prefetch
+DEFAULT_PREFETCH_CONCURRENCY = 2  # Prefetch downloads running at once, leaving room for views
+
+
+class ImageCache:
+    """Downloads animal images on first request and keeps them on disk.
+
+    Attributes:
+        views (Counter): The number of times each animal's image has been requested.
+        downloads (int): The number of images downloaded.
+        bytes_downloaded (int): The total size of the images downloaded.
+    """
+
+    def __init__(
+        self,
+        http_client: Optional["AsyncHttpClient"] = None,
+        prefetch_concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+    ):
+        """Creates an empty image cache.
+
+        Args:
+            http_client (Optional[AsyncHttpClient]): The client images are downloaded with;
+                by default the cache opens its own on the first download.
+            prefetch_concurrency (int): The prefetch downloads running at once.
+        """
+        self._http_client = http_client
+        self._client_lock = asyncio.Lock()
+        self._owned_client = contextlib.AsyncExitStack()  # Closes a client the cache opened
+        self._logger = logging.getLogger(__name__)
+        self._prefetch_slots = asyncio.Semaphore(prefetch_concurrency)
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._image_urls: dict[str, str] = {}  # The URL each cached image was fetched from
+        self.views: Counter = Counter()
+        self.downloads = 0
+        self.bytes_downloaded = 0
+
+    @property
+    def local_paths(self) -> dict[str, str]:
+        """The local paths of the images downloaded by the cache, by animal name."""
+        return {animal_name: str(image_path(animal_name)) for animal_name in self._image_urls}
+
+    async def get(self, animal_name: str, image_url: str) -> Optional[Path]:
+        """Returns the local copy of an animal's image, downloading it on first request.
+
+        Args:
+            animal_name (str): The animal whose image is requested.
+            image_url (str): The URL of the animal's current image.
+
+        Returns:
+            Optional[Path]: The saved image, or None if it could not be downloaded.
+        """
+        self.views[animal_name] += 1
+        return await self._load(animal_name, image_url)
+
+    def is_cached(self, animal_name: str, image_url: str) -> bool:
+        """Returns True if the animal's current image is on disk.
+
+        An image saved by an eager scrape is assumed current; one downloaded by the cache
+        is stale once the animal's image URL changes.
+        """
+        cached_url = self._image_urls.get(animal_name, image_url)
+        return cached_url == image_url and image_path(animal_name).exists()
+
+    async def _load(self, animal_name: str, image_url: str) -> Optional[Path]:
+        if self.is_cached(animal_name, image_url):
+            return image_path(animal_name)
+
+        download = self._in_flight.get(animal_name)
+        if download is None:
+            download = asyncio.ensure_future(self._download(animal_name, image_url))
+            self._in_flight[animal_name] = download
+            download.add_done_callback(lambda _: self._in_flight.pop(animal_name, None))
+
+        # A request that is cancelled must not cancel the download others are waiting for
+        return await asyncio.shield(download)
+
+    async def close(self):
+        """Closes the HTTP client if the cache opened it."""
+        await self._owned_client.aclose()
+
+    async def _client(self) -> "AsyncHttpClient":
+        async with self._client_lock:
+            if self._http_client is None:
+                # pylint: disable-next=import-outside-toplevel
+                from client.http_client import AsyncHttpClient
+
+                self._http_client = await self._owned_client.enter_async_context(
+                    AsyncHttpClient()
+                )
+        return self._http_client
+
+    async def _download(self, animal_name: str, image_url: str) -> Optional[Path]:
+        # pylint: disable-next=import-outside-toplevel
+        from scraper.file_handler import save_file
+
+        self._logger.debug(f"Downloading image of {animal_name} from {image_url}")
+        try:
+            client = await self._client()
+            result = await client.fetch(image_url, is_image=True, enqueue=False)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._logger.error(f"Error fetching image {image_url}: {e}")
+            return None
+        if not isinstance(result, tuple) or not isinstance(result[1], bytes):
+            self._logger.warning(f"Failed to fetch image {image_url}: {result}")
+            return None
+
+        path = image_path(animal_name)
+        try:
+            await save_file(path, result[1])
+        except OSError as e:
+            self._logger.error(f"Failed to save image {path}: {e}")
+            return None
+
+        self._image_urls[animal_name] = image_url
+        self.downloads += 1
+        self.bytes_downloaded += len(result[1])
+        return path
+
+    async def prefetch(
+        self, image_urls: Mapping[str, str], limit: int = DEFAULT_PREFETCH_LIMIT
+    ) -> int:
+        """Downloads the images of the most-viewed animals that are not cached yet.
+
+        Args:
+            image_urls (Mapping[str, str]): The current image URL of each animal.
+            limit (int): The maximum number of most-viewed animals to consider.
+
+        Returns:
+            int: The number of images downloaded.
+        """
+        animal_names = [
+            animal_name
+            for animal_name, _ in self.views.most_common(limit)
+            if animal_name in image_urls
+            and not self.is_cached(animal_name, image_urls[animal_name])
+        ]
+
+        async def warm(animal_name: str) -> bool:
+            async with self._prefetch_slots:  # Most-viewed animals take the slots first
+                return await self._load(animal_name, image_urls[animal_name]) is not None
+
+        warmed = await asyncio.gather(*[warm(animal_name) for animal_name in animal_names])
+        if animal_names:
+            self._logger.info(f"Prefetched {sum(warmed)} of {len(animal_names)} images")
+        return sum(warmed)
@@ -0,0 +1,28 @@
+"""Paths Module
+
+This module defines where scraped files are kept on disk. It imports nothing beyond the
+standard library, so the web server can locate saved images without loading the scraper
+stack.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+def image_path(animal_name: str) -> Path:
+    """Returns where the image of an animal is saved."""
+    return Path(tempfile.gettempdir(), f"{animal_name}.jpg")
+
+
+def checkpoint_path(db_path: Optional[str | os.PathLike] = None) -> Path:
+    """Returns the journal of an unfinished scrape into the database at `db_path`.
+
+    The journal sits next to the database file, so scrapes of different databases never
+    share one. Without a file, the dataset is only kept in memory and the journal is kept
+    with the images instead.
+    """
+    if db_path:
+        return Path(f"{db_path}.checkpoint.jsonl")
+    return Path(tempfile.gettempdir(), "animals_scrape_checkpoint.jsonl")
@@ -0,0 +1,248 @@
+"""Scrape Pipeline Module
+
+This module runs a complete scrape into an AnimalsStorage: the table scraper, the animal
+page scraper and the file handler on one event loop, or the page and image work spread
+over several processes by `scrape_sharded()`. It is shared by the `scrape` command, which
+writes straight into the SQLite file the server reads, and by the server's refreshes,
+which import it on the first refresh so that serving starts without the scraper stack.
+
+A scrape either rebuilds the dataset, or, with a time budget, updates it in place: the
+table is parsed in full, the stalest pages and missing images are fetched first, and
+whatever the budget did not reach keeps its previous data until a later refresh.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable, Mapping
+from typing import Optional
+
+from client.http_client import AsyncHttpClient
+from db.animals_storage import AnimalsSnapshot, AnimalsStorage
+from db.batch_writer import BatchWriter
+from scraper.animal_page_scraper import AnimalPageScraper
+from scraper.budget import Deadline
+from scraper.checkpoint import Checkpoint
+from scraper.file_handler import FileHandler
+from scraper.frontier import UrlFrontier
+from scraper.paths import checkpoint_path
+from scraper.priority import DEFAULT_SIGNALS, FetchPriority, parse_signals
+from scraper.progress import ScrapeProgress
+from scraper.shards import remove_shard_checkpoints, scrape_sharded
+from scraper.table_scraper import AnimalTableScraper
+
+
+def fetch_priority(views: Optional[Mapping[str, int]] = None) -> FetchPriority:
+    """Creates the fetch priority configured by the `ANIMALS_FETCH_PRIORITY` variable.
+
+    Args:
+        views (Optional[Mapping[str, int]]): The image views counted by the server, if any.
+    """
+    signals = os.environ.get("ANIMALS_FETCH_PRIORITY")
+    return FetchPriority(parse_signals(signals) if signals else DEFAULT_SIGNALS, views=views)
+
+
+async def scrape_data(
+    db: AnimalsStorage,
+    progress: ScrapeProgress,
+    url: Optional[str] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    shards: Optional[int] = None,
+    lazy_images: Optional[bool] = None,
+    priority: Optional[FetchPriority] = None,
+    budget: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+):
+    """Runs the web scraper to populate the database.
+
+    If a previous scrape was interrupted, the pages and images recorded in its checkpoint
+    are replayed rather than fetched again. A scrape already running on the same
+    checkpoint, in this or another process, makes this one fail with
+    `CheckpointLockedError` before anything is reset.
+
+    With a `budget`, no more pages or images are fetched once it has expired. The animals
+    are then fetched stalest first, images that are missing from disk come first, and the
+    image URLs, saved images and fetch times of the animals not reached are kept from the
+    previous dataset, so the next budgeted refresh continues where this one stopped.
+
+    Args:
+        db (AnimalsStorage): The storage the new dataset is published to.
+        progress (ScrapeProgress): Where the scrapers report what they have done.
+        url (Optional[str]): The page with the table of animals, Wikipedia's by default.
+        checkpoint (Optional[Checkpoint]): The journal of completed pages and images, by
+            default next to the database file set by the `ANIMALS_DB_PATH` environment
+            variable, as used by `server.create_db()`.
+        shards (Optional[int]): The number of processes animal pages and images are
+            scraped in, from the `ANIMALS_SCRAPE_SHARDS` environment variable by default.
+        lazy_images (Optional[bool]): Only record image URLs and download each image when
+            it is first requested, if the `ANIMALS_LAZY_IMAGES` environment variable is
+            set by default.
+        priority (Optional[FetchPriority]): The order animals are fetched in, by default
+            from the signals in the `ANIMALS_FETCH_PRIORITY` environment variable.
+        budget (Optional[float]): Seconds after which fetching stops, see above; the whole
+            dataset is fetched by default.
+        clock (Callable[[], float]): The clock the budget is measured on.
+    """
+    print("Starting data scraping...")
+
+    url = url or AnimalTableScraper.URL
+    checkpoint = checkpoint or Checkpoint(checkpoint_path(os.environ.get("ANIMALS_DB_PATH")))
+    with checkpoint.locked():  # Refuses to run alongside a scrape of the same database
+        if checkpoint.pages or checkpoint.images:
+            print(
+                f"Resuming interrupted scrape: {len(checkpoint.pages)} pages "
+                f"and {len(checkpoint.images)} images already done"
+            )
+        shards = shards or int(os.environ.get("ANIMALS_SCRAPE_SHARDS", "1"))
+        if lazy_images is None:
+            lazy_images = bool(os.environ.get("ANIMALS_LAZY_IMAGES"))
+        previous = db.snapshot()
+        priority = (priority or fetch_priority()).with_fetched_at(
+            previous.animal_fetched_at, stalest_first=budget is not None
+        )
+        if budget is not None and shards > 1:
+            print("Refreshing in one process: the budget is spent on the stalest pages in order")
+            shards = 1
+
+        start_time = time.perf_counter()
+        progress.started()
+
+        # Clear old data before re-scraping; readers keep the last published snapshot
+        db.reset()
+        writer = BatchWriter(db)  # Scrapers' writes are applied to the DB in batches
+
+        try:
+            if shards > 1:
+                saved = await scrape_sharded(
+                    writer, shards, url, str(checkpoint.path), progress, lazy_images, priority
+                )
+            else:
+                saved = await _scrape_pipeline(
+                    writer,
+                    progress,
+                    url,
+                    checkpoint,
+                    lazy_images,
+                    priority,
+                    Deadline(budget, clock) if budget is not None else None,
+                    previous,
+                )
+        except BaseException as e:
+            writer.abort()  # Readers keep the previous dataset; the checkpoint keeps the work
+            progress.failed(e)
+            raise
+
+        snapshot = writer.publish()  # Make the complete dataset visible to readers at once
+        checkpoint.remove()  # The next refresh starts from scratch
+        remove_shard_checkpoints(str(checkpoint.path))
+        progress.finished(snapshot.generation)
+        db.get_all_data()
+        print(f"Frontier skipped {saved} duplicate fetches")
+        print(f"Scraping complete. Execution time: {time.perf_counter() - start_time:.4f} seconds")
+
+
+def _carry_over(previous: AnimalsSnapshot, writer: BatchWriter) -> list[tuple[str, str]]:
+    """Copies the previous dataset's image URLs, saved images and fetch times to `writer`.
+
+    A budgeted refresh overwrites them for the animals it reaches; the collateral
+    adjectives are not copied, since the whole table is parsed again.
+
+    Returns:
+        list[tuple[str, str]]: The `(image_url, animal_name)` images not saved on disk.
+    """
+    local_paths = {
+        animal_name: local_path
+        for animal_name, local_path in previous.animal_images_local_paths.items()
+        if os.path.exists(local_path)
+    }
+    writer.insert_many(
+        image_urls=previous.animal_image_urls.items(),
+        local_paths=local_paths.items(),
+        fetched_at=previous.animal_fetched_at.items(),
+    )
+    return [
+        (image_url, animal_name)
+        for image_url, animal_name in previous.animal_image_urls.items()
+        if animal_name not in local_paths
+    ]
+
+
+async def _frontiers(
+    writer: BatchWriter,
+    priority: FetchPriority,
+    deadline: Optional[Deadline],
+    previous: AnimalsSnapshot,
+    lazy_images: bool,
+) -> tuple[UrlFrontier, UrlFrontier]:
+    """Creates the frontiers of animal pages and of images, to be filled by the scrapers.
+
+    With a deadline, both stop once it has passed, pages are only handed out once the
+    whole table has been ranked, and the previous dataset is carried over, with the images
+    missing from disk queued first.
+    """
+    if deadline is None:
+        return UrlFrontier(priority), UrlFrontier(priority)
+    frontier = UrlFrontier(priority, hold=True, deadline=deadline)
+    image_frontier = UrlFrontier(priority.missing_images_first(), deadline=deadline)
+    missing_images = _carry_over(previous, writer)
+    if not lazy_images:
+        for image_url, animal_name in missing_images:
+            await image_frontier.put(image_url, animal_name)
+    return frontier, image_frontier
+
+
+async def _scrape_pipeline(
+    writer: BatchWriter,
+    progress: ScrapeProgress,
+    url: str,
+    checkpoint: Checkpoint,
+    lazy_images: bool,
+    priority: FetchPriority,
+    deadline: Optional[Deadline] = None,
+    previous: Optional[AnimalsSnapshot] = None,
+) -> int:
+    """Scrapes the table, the animal pages and their images on this event loop.
+
+    Args:
+        deadline (Optional[Deadline]): When no more pages or images are fetched.
+        previous (Optional[AnimalsSnapshot]): The dataset a refresh with a deadline
+            updates.
+
+    Returns:
+        int: The number of fetches saved by deduplication.
+    """
+    frontier, image_frontier = await _frontiers(
+        writer, priority, deadline, previous or AnimalsSnapshot(), lazy_images
+    )
+
+    async with AsyncHttpClient() as client, AsyncHttpClient() as client_image:
+        print("Created HTTP clients")
+
+        scrapers = [
+            AnimalTableScraper(client, writer, frontier, url=url, progress=progress),
+            AnimalPageScraper(
+                client, writer, frontier, image_frontier, checkpoint=checkpoint, progress=progress
+            ),
+        ]
+        if not lazy_images:
+            scrapers.append(
+                FileHandler(
+                    client_image, writer, image_frontier, checkpoint=checkpoint, progress=progress
+                )
+            )
+
+        print("Initialized scrapers")
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for scraper in scrapers:
+                    tg.create_task(scraper.run())
+        finally:
+            checkpoint.flush()  # Whatever completed is kept for the next attempt
+
+    if frontier.stopped:
+        print(
+            f"Budget expired: {frontier.left} pages and {image_frontier.left} images "
+            "left for the next refresh"
+        )
+    return frontier.saved + image_frontier.saved
@@ -0,0 +1,116 @@
+"""Fetch Priority Module
+
+This module defines the FetchPriority class, which orders the animals in a UrlFrontier so
+that the most useful pages and images are fetched first after a refresh. Each configured
+signal turns an animal into a sort key and animals are compared signal by signal, so the
+order of the signals is their precedence:
+
+- `views`: most-viewed animals first, from the `/images/<animal>` view counts.
+- `staleness`: animals whose page was fetched longest ago first, by the last-fetched times
+  recorded in the database, or by when their image was saved if the database predates
+  them; animals never fetched come first.
+- `table`: the order the animals appear in on the Wikipedia table.
+- `name`: alphabetical order.
+"""
+
+import math
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, Optional
+
+from scraper.paths import image_path
+
+SIGNALS = ("views", "staleness", "table", "name")
+DEFAULT_SIGNALS = ("views", "table")
+
+
+def parse_signals(value: str) -> tuple[str, ...]:
+    """Parses a comma-separated list of signals, e.g. from the command line.
+
+    Raises:
+        ValueError: If a signal is not one of `SIGNALS`.
+    """
+    signals = tuple(signal.strip() for signal in value.split(",") if signal.strip())
+    _check_signals(signals)
+    return signals
+
+
+def _check_signals(signals: Sequence[str]):
+    unknown = [signal for signal in signals if signal not in SIGNALS]
+    if unknown:
+        raise ValueError(f"Unknown fetch priority signals {unknown}; expected {SIGNALS}")
+
+
+class FetchPriority:
+    """Computes the priority of an animal's page and image; lower keys are fetched first.
+
+    The same instance is shared by the page and image frontiers, so an animal's image keeps
+    the position its page had.
+    """
+
+    def __init__(
+        self,
+        signals: Sequence[str] = DEFAULT_SIGNALS,
+        views: Optional[Mapping[str, int]] = None,
+        fetched_at: Optional[Mapping[str, float]] = None,
+    ):
+        """Creates a priority from its signals, most important first.
+
+        Args:
+            signals (Sequence[str]): Signals out of `SIGNALS`.
+            views (Optional[Mapping[str, int]]): The image views of each animal.
+            fetched_at (Optional[Mapping[str, float]]): When each animal's page was last
+                fetched, as a Unix time.
+        """
+        _check_signals(signals)
+        self.signals = tuple(signals)
+        self._views = views if views is not None else {}
+        self._fetched_at = fetched_at if fetched_at is not None else {}
+        self._positions: dict[str, int] = {}
+        keys: dict[str, Callable[[str], Any]] = {
+            "views": lambda animal_name: -self._views.get(animal_name, 0),
+            "staleness": self._last_fetched,
+            "table": self._position,
+            "name": str.casefold,
+        }
+        self._keys = [keys[signal] for signal in self.signals]
+
+    def __call__(self, animal_name: Optional[str]) -> tuple:
+        """Returns the sort key of an animal."""
+        animal_name = animal_name or ""
+        return tuple(key(animal_name) for key in self._keys)
+
+    def with_fetched_at(
+        self, fetched_at: Mapping[str, float], stalest_first: bool = False
+    ) -> "FetchPriority":
+        """Returns a copy whose `staleness` signal uses the given last-fetched times.
+
+        Args:
+            fetched_at (Mapping[str, float]): When each animal's page was last fetched.
+            stalest_first (bool): Make `staleness` the most important signal, e.g. for a
+                refresh with a time budget, which should spend it on the stalest animals.
+        """
+        signals = self.signals
+        if stalest_first:
+            signals = ("staleness", *(signal for signal in signals if signal != "staleness"))
+        return FetchPriority(signals, self._views, fetched_at)
+
+    def missing_images_first(self) -> Callable[[Optional[str]], tuple]:
+        """Returns a priority for images that puts animals without a saved image first.
+
+        Images already on disk are not downloaded again, so with a time budget the
+        downloads that are actually needed should not wait behind them.
+        """
+        return lambda animal_name: (image_path(animal_name or "").exists(), *self(animal_name))
+
+    def _position(self, animal_name: str) -> int:
+        """Returns the order in which the animal was first prioritized, i.e. its table row."""
+        return self._positions.setdefault(animal_name, len(self._positions))
+
+    def _last_fetched(self, animal_name: str) -> float:
+        fetched_at = self._fetched_at.get(animal_name)
+        if fetched_at is not None:
+            return fetched_at
+        try:
+            return image_path(animal_name).stat().st_mtime  # Fetched before times were kept
+        except OSError:
+            return -math.inf  # Never fetched, so the stalest of all
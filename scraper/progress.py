@@ -0,0 +1,136 @@
+"""Scrape Progress Module
+
+This module defines the ScrapeProgress class, which the scrapers report to as they parse
+table rows, fetch animal pages and save images, and which broadcasts each report as an
+event to every subscriber. A refresh runs on its own event loop in a worker thread while
+subscribers (e.g. the `/refresh/events` stream) wait on the server's loop, so events are
+handed to each subscriber's loop thread-safely.
+"""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from typing import Optional
+
+Event = tuple[str, dict]  # The event name and its JSON-serializable data
+
+
+class _Subscriber:
+    """An event queue owned by one subscriber's event loop."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Event] = asyncio.Queue()
+
+    def put(self, event: Event):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+
+class ScrapeProgress:
+    """Counts what a scrape has done so far and broadcasts it to subscribers.
+
+    Events are `start`, `row` (a table row was parsed), `page` (an animal page was
+    processed), `image` (an image was saved), and `done` or `error` when the scrape ends.
+
+    Attributes:
+        running (bool): Whether a scrape is in progress.
+        rows (int): The table rows parsed by the current or last scrape.
+        pages (int): The animal pages processed by the current or last scrape.
+        images (int): The images saved by the current or last scrape.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: set[_Subscriber] = set()
+        self.running = False
+        self.rows = 0
+        self.pages = 0
+        self.images = 0
+
+    def status(self) -> dict:
+        """Returns the counters of the current or last scrape."""
+        return {
+            "running": self.running,
+            "rows": self.rows,
+            "pages": self.pages,
+            "images": self.images,
+        }
+
+    def started(self):
+        """Reports that a scrape has started and resets the counters."""
+        with self._lock:
+            self.running = True
+            self.rows = self.pages = self.images = 0
+            self._publish("start", {})
+
+    def row_parsed(self, animal_name: str, adjectives: list[str]):
+        """Reports a parsed table row with the animal's collateral adjectives."""
+        with self._lock:
+            self.rows += 1
+            self._publish(
+                "row", {"animal": animal_name, "adjectives": adjectives, "rows": self.rows}
+            )
+
+    def page_fetched(self, animal_name: str, image_url: Optional[str]):
+        """Reports a processed animal page with the image found on it, if any."""
+        with self._lock:
+            self.pages += 1
+            self._publish(
+                "page", {"animal": animal_name, "image_url": image_url, "pages": self.pages}
+            )
+
+    def image_saved(self, animal_name: str, local_path: str):
+        """Reports an animal's image saved at `local_path`."""
+        with self._lock:
+            self.images += 1
+            self._publish(
+                "image",
+                {"animal": animal_name, "local_path": local_path, "images": self.images},
+            )
+
+    def finished(self, generation: int):
+        """Reports that the scrape's data has been published as `generation`."""
+        with self._lock:
+            self.running = False
+            self._publish("done", {**self.status(), "generation": generation})
+
+    def failed(self, error: BaseException):
+        """Reports that the scrape ended with `error`."""
+        with self._lock:
+            self.running = False
+            self._publish("error", {**self.status(), "message": str(error)})
+
+    def _publish(self, name: str, data: dict):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put((name, data))
+            except RuntimeError:  # The subscriber's event loop has been closed
+                self._subscribers.discard(subscriber)
+
+    async def events(self, timeout: Optional[float] = None) -> AsyncIterator[Optional[Event]]:
+        """Subscribes to events until the caller stops iterating.
+
+        The first event is a `status` event with the current counters, so a subscriber
+        joining part-way through a scrape knows how far it has got.
+
+        Args:
+            timeout (Optional[float]): Seconds after which None is yielded if no event has
+                arrived, e.g. to send a keep-alive.
+
+        Yields:
+            The next `(name, data)` event, or None after `timeout` seconds without one.
+        """
+        subscriber = _Subscriber()
+        with self._lock:
+            self._subscribers.add(subscriber)
+            status = self.status()
+        try:
+            yield "status", status
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
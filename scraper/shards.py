@@ -0,0 +1,197 @@
+"""Sharded Scrape Module
+
+This module spreads the page and image work of a scrape across several processes, so
+parsing animal pages is not capped at one core. The parent process fetches the animal
+table as usual, hash-partitions the animal page URLs into shards and hands each shard to a
+worker process. Every worker runs its own AsyncHttpClient, AnimalPageScraper and FileHandler
+pipeline into a private in-memory database and returns the image URLs, local paths and
+page fetch times it found, which the parent merges into its own database.
+"""
+
+import asyncio
+import glob
+import logging
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from client.http_client import AsyncHttpClient
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
+from scraper.animal_page_scraper import AnimalPageScraper
+from scraper.checkpoint import Checkpoint
+from scraper.file_handler import FileHandler
+from scraper.frontier import UrlFrontier
+from scraper.priority import FetchPriority
+from scraper.progress import ScrapeProgress
+from scraper.table_scraper import AnimalTableScraper
+
+PageItem = tuple[str, Optional[str]]  # An animal page URL and the animal's name
+
+
+def shard_of(url: str, shards: int) -> int:
+    """Returns the shard a URL belongs to.
+
+    A CRC of the URL is used instead of `hash()`, which is salted differently in every
+    process, so a URL maps to the same shard across runs and a shard's checkpoint can be
+    resumed.
+    """
+    return zlib.crc32(url.encode()) % shards
+
+
+def partition(items: list[PageItem], shards: int) -> list[list[PageItem]]:
+    """Splits animal pages into `shards` lists by the hash of their URL."""
+    partitions: list[list[PageItem]] = [[] for _ in range(shards)]
+    for item in items:
+        partitions[shard_of(item[0], shards)].append(item)
+    return partitions
+
+
+def shard_checkpoint_path(checkpoint_path: str, shard: int, shards: int) -> str:
+    """Returns the journal of one shard; resuming requires the same shard count."""
+    return f"{checkpoint_path}.{shard}-of-{shards}"
+
+
+def remove_shard_checkpoints(checkpoint_path: str):
+    """Discards the journals of every shard, whatever shard count they were written with.
+
+    Workers keep their journals when they finish, so the parent calls this only once the
+    merged results are published; a scrape that fails before that resumes from them.
+    """
+    path = Path(checkpoint_path)
+    for journal in path.parent.glob(f"{glob.escape(path.name)}.*-of-*"):
+        journal.unlink(missing_ok=True)
+
+
+def scrape_shard(
+    items: list[PageItem], checkpoint_path: Optional[str] = None, lazy_images: bool = False
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]], list[tuple[str, float]], int]:
+    """Fetches the animal pages of one shard and their images, in a worker process.
+
+    Args:
+        items (list[PageItem]): The `(url, animal_name)` pages of this shard.
+        checkpoint_path (Optional[str]): The journal of this shard, if any.
+        lazy_images (bool): Only record image URLs, leaving the downloads to ImageCache.
+
+    Returns:
+        The `(image_url, animal_name)`, `(animal_name, local_path)` and
+        `(animal_name, fetched_at)` pairs found, and the number of fetches saved by
+        deduplication.
+    """
+    return asyncio.run(_scrape_shard(items, checkpoint_path, lazy_images))
+
+
+async def _scrape_shard(
+    items: list[PageItem], checkpoint_path: Optional[str], lazy_images: bool
+):
+    db = AnimalsInMemoryDB()
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    frontier = UrlFrontier()
+    image_frontier = UrlFrontier()
+    for url, animal_name in items:
+        await frontier.put(url, animal_name)
+    frontier.close()
+
+    async with AsyncHttpClient() as client, AsyncHttpClient() as client_image:
+        page_scraper = AnimalPageScraper(
+            client, db, frontier, image_frontier, checkpoint=checkpoint
+        )
+        file_handler = FileHandler(client_image, db, image_frontier, checkpoint=checkpoint)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(page_scraper.run())
+                if not lazy_images:
+                    tg.create_task(file_handler.run())
+        finally:
+            if checkpoint:
+                checkpoint.flush()
+
+    # The journal is kept until the parent has published the merged results
+    snapshot = db.publish()
+    return (
+        list(snapshot.animal_image_urls.items()),
+        list(snapshot.animal_images_local_paths.items()),
+        list(snapshot.animal_fetched_at.items()),
+        frontier.saved + image_frontier.saved,
+    )
+
+
+async def scrape_sharded(
+    db: AnimalsStorage,
+    shards: int,
+    url: str = AnimalTableScraper.URL,
+    checkpoint_path: Optional[str] = None,
+    progress: Optional[ScrapeProgress] = None,
+    lazy_images: bool = False,
+    priority: Optional[FetchPriority] = None,
+) -> int:
+    """Scrapes the animal table in this process and its pages in `shards` worker processes.
+
+    Args:
+        db (AnimalsStorage): The database the adjectives and the shards' results go to.
+        shards (int): The number of worker processes.
+        url (str): The page with the table of animals.
+        checkpoint_path (Optional[str]): The base path of the shards' journals, which are
+            kept for the caller to remove with `remove_shard_checkpoints()` once it publishes.
+        progress (Optional[ScrapeProgress]): Reports table rows as they are parsed, and
+            pages and images as each shard's results are merged.
+        lazy_images (bool): Only record image URLs, leaving the downloads to ImageCache.
+        priority (Optional[FetchPriority]): The order pages are handed to the shards in.
+
+    Returns:
+        int: The number of fetches saved by deduplication.
+    """
+    logger = logging.getLogger(__name__)
+    frontier = UrlFrontier(priority)
+
+    async with AsyncHttpClient() as client:
+        await AnimalTableScraper(client, db, frontier, url=url, progress=progress).run()
+
+    items = []  # In priority order, which each shard keeps
+    while (item := await frontier.get()) is not None:
+        items.append(item)
+    logger.info(f"Scraping {len(items)} animal pages in {shards} shards")
+
+    results = await _run_shards(partition(items, shards), checkpoint_path, lazy_images)
+    return frontier.saved + _merge(db, results, progress)
+
+
+def _merge(db: AnimalsStorage, results: list, progress: Optional[ScrapeProgress]) -> int:
+    """Writes the shards' results to `db`, returning the fetches they saved."""
+    saved = 0
+    for image_urls, local_paths, fetched_at, shard_saved in results:
+        db.insert_many(image_urls=image_urls, local_paths=local_paths, fetched_at=fetched_at)
+        saved += shard_saved
+        if progress:
+            for image_url, animal_name in image_urls:
+                progress.page_fetched(animal_name, image_url)
+            for animal_name, local_path in local_paths:
+                progress.image_saved(animal_name, local_path)
+    return saved
+
+
+async def _run_shards(
+    partitions: list[list[PageItem]], checkpoint_path: Optional[str], lazy_images: bool
+):
+    """Runs `scrape_shard()` for every partition in its own worker process."""
+    shards = len(partitions)
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=shards, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    pool,
+                    scrape_shard,
+                    shard_items,
+                    shard_checkpoint_path(checkpoint_path, shard, shards)
+                    if checkpoint_path
+                    else None,
+                    lazy_images,
+                )
+                for shard, shard_items in enumerate(partitions)
+            ]
+        )
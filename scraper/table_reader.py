@@ -0,0 +1,250 @@
+"""Animal Table Reader Module
+
+This module reads the rows of the `List_of_animal_names` table while the HTML is parsed,
+instead of building a tree of the whole page first. The page is fed to an event-based
+parser chunk by chunk, and each row is yielded as soon as its closing tag (or the next
+row) has been seen, so the scraper can queue an animal's page while the rest of the table
+is still being parsed. Parsing stops at the end of the table.
+
+Two parser backends produce the same events:
+
+- `lxml`: libxml2's HTML parser, much faster; used when lxml is installed.
+- `html.parser`: the standard library's parser, always available.
+"""
+
+from collections.abc import Iterator
+from html.parser import HTMLParser
+from typing import NamedTuple, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # Optional: the standard library parser is used instead
+    etree = None
+
+TABLE_CLASS = "wikitable sortable sticky-header"
+CHUNK_SIZE = 16 * 1024  # Characters of HTML parsed between yielding the completed rows
+BACKENDS = ("lxml", "html.parser")
+
+
+class TableRow(NamedTuple):
+    """A row of the animal table.
+
+    Attributes:
+        animal (str): The text of the first link in the animal's cell.
+        href (Optional[str]): The target of that link, if it has one.
+        adjectives (list[str]): The collateral adjectives, one per text node of their cell.
+    """
+
+    animal: str
+    href: Optional[str]
+    adjectives: list[str]
+
+
+class TableError(ValueError):
+    """Raised when the page has no animal table, or the table lacks the wanted column."""
+
+
+def default_backend() -> str:
+    """Returns the fastest parser backend available."""
+    return "lxml" if etree is not None else "html.parser"
+
+
+def read_animal_table(
+    html: str,
+    column: str,
+    empty: str = "—",
+    animal_column: int = 0,
+    backend: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[TableRow]:
+    """Yields the rows of the animal table as they are parsed.
+
+    Rows are yielded if their cells reach the `column` header and their `animal_column`
+    cell has a link; header rows and rows of nested tables are skipped.
+
+    Args:
+        html (str): The page.
+        column (str): The header of the column to read the adjectives from.
+        empty (str): The cell text meaning that an animal has no adjectives.
+        animal_column (int): The index of the cell holding the link to the animal's page.
+        backend (Optional[str]): One of `BACKENDS`, `default_backend()` by default.
+        chunk_size (int): The number of characters parsed at a time.
+
+    Raises:
+        TableError: If the page has no animal table or the table has no `column` header.
+        ValueError: If the backend is unknown or not installed.
+    """
+    handler = _TableHandler(column, empty, animal_column)
+    parser = _parser(backend or default_backend(), handler)
+
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start : start + chunk_size])
+        yield from handler.pop_rows()
+        if handler.done:
+            break
+    else:
+        parser.close()
+        yield from handler.pop_rows()
+
+    if handler.error:
+        raise TableError(handler.error)
+    if not handler.found:
+        raise TableError("Failed to find the animal table")
+
+
+def _parser(backend: str, handler: "_TableHandler"):
+    """Returns a parser with `feed()` and `close()` that reports to `handler`."""
+    if backend == "lxml":
+        if etree is None:
+            raise ValueError("The lxml parser backend is not installed")
+        return etree.HTMLParser(target=handler)
+    if backend == "html.parser":
+        return _StdlibParser(handler)
+    raise ValueError(f"Unknown parser backend {backend!r}; expected one of {BACKENDS}")
+
+
+class _StdlibParser(HTMLParser):
+    """Forwards the standard library parser's callbacks as lxml-style target events."""
+
+    def __init__(self, handler: "_TableHandler"):
+        super().__init__(convert_charrefs=True)
+        self._handler = handler
+
+    def handle_starttag(self, tag, attrs):
+        self._handler.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self._handler.start(tag, dict(attrs))
+        self._handler.end(tag)
+
+    def handle_endtag(self, tag):
+        self._handler.end(tag)
+
+    def handle_data(self, data):
+        self._handler.data(data)
+
+
+class _Cell:
+    """The text nodes of a table cell and the first link in it."""
+
+    __slots__ = ("header", "strings", "link", "href", "in_link")
+
+    def __init__(self, header: bool):
+        self.header = header
+        self.strings: list[str] = []
+        self.link: Optional[list[str]] = None  # The text nodes of the first link
+        self.href: Optional[str] = None
+        self.in_link = False
+
+
+class _TableHandler:
+    """Turns parser events into table rows (an lxml parser target).
+
+    Cells and rows are also closed implicitly by the next cell or row, as browsers do,
+    so both backends read tables whose end tags are left out the same way.
+    """
+
+    def __init__(self, column: str, empty: str, animal_column: int):
+        self._column = column
+        self._empty = empty
+        self._animal_column = animal_column
+        self._depth = 0  # Tables open from the animal table inwards
+        self._headers: list[str] = []
+        self._column_index: Optional[int] = None
+        self._cells: list[_Cell] = []  # The data cells of the current row
+        self._cell: Optional[_Cell] = None
+        self._text: list[str] = []  # Pieces of the current text node
+        self._rows: list[TableRow] = []
+        self.found = False
+        self.done = False
+        self.error: Optional[str] = None
+
+    def pop_rows(self) -> list[TableRow]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def start(self, tag: str, attrs: dict):
+        self._flush_text()
+        if self.done:
+            return
+        if tag == "table":
+            if self._depth:
+                self._depth += 1
+            elif " ".join((attrs.get("class") or "").split()) == TABLE_CLASS:
+                self.found = True
+                self._depth = 1
+        elif self._depth == 1 and tag == "tr":
+            self._end_row()
+        elif self._depth == 1 and tag in ("td", "th"):
+            self._end_cell()
+            self._cell = _Cell(header=tag == "th")
+        elif tag == "a" and self._cell is not None and self._cell.link is None:
+            self._cell.link = []
+            self._cell.href = attrs.get("href")
+            self._cell.in_link = True
+
+    def end(self, tag: str):
+        self._flush_text()
+        if self.done or not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+            if not self._depth:
+                self._end_row()
+                self.done = True
+        elif self._depth == 1 and tag == "tr":
+            self._end_row()
+        elif self._depth == 1 and tag in ("td", "th"):
+            self._end_cell()
+        elif tag == "a" and self._cell is not None:
+            self._cell.in_link = False
+
+    def data(self, data: str):
+        if self._cell is not None:
+            self._text.append(data)
+
+    def close(self):
+        self._end_row()
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        self._cell.strings.append(text)
+        if self._cell.in_link:
+            self._cell.link.append(text)
+
+    def _end_cell(self):
+        cell, self._cell = self._cell, None
+        if cell is None:
+            return
+        if cell.header:
+            self._headers.append("".join(cell.strings).strip())
+        else:
+            self._cells.append(cell)
+
+    def _end_row(self):
+        self._end_cell()
+        cells, self._cells = self._cells, []
+        if cells and not self.done:
+            self._read_row(cells)
+
+    def _read_row(self, cells: list[_Cell]):
+        if self._column_index is None:
+            if self._column not in self._headers:
+                self.error = f"Collateral adjectives column '{self._column}' was not found"
+                self.done = True  # Stop parsing, no row can be read
+                return
+            self._column_index = self._headers.index(self._column)
+
+        if len(cells) <= max(self._column_index, self._animal_column):
+            return
+        animal_cell = cells[self._animal_column]
+        if animal_cell.link is None:
+            return
+
+        adjectives = [text.strip() for text in cells[self._column_index].strings if text.strip()]
+        if "".join(adjectives) == self._empty:
+            adjectives = []
+        self._rows.append(TableRow("".join(animal_cell.link).strip(), animal_cell.href, adjectives))
@@ -1,10 +1,12 @@
 import asyncio
 import logging
-
-from bs4 import BeautifulSoup
+from typing import Optional
 
 from client.http_client import AsyncHttpClient
-from db.animals_db import AnimalsInMemoryDB
+from db.animals_storage import AnimalsStorage
+from scraper.frontier import UrlFrontier
+from scraper.progress import ScrapeProgress
+from scraper.table_reader import TableError, TableRow, read_animal_table
 from scraper.web_scraper import WebScraper
 
 
@@ -17,26 +19,32 @@ class AnimalTableScraper(WebScraper):
     def __init__(
         self,
         http_client: AsyncHttpClient,
-        db: AnimalsInMemoryDB,
-        queue: asyncio.Queue,
-        max_concurrent_requests: int = 10,
+        db: AnimalsStorage,
+        frontier: UrlFrontier,
+        url: str = URL,
+        progress: Optional[ScrapeProgress] = None,
+        parser_backend: Optional[str] = None,
     ):
         super().__init__()
         self._http_client = http_client
         self._db = db
-        self._queue = queue
+        self._frontier = frontier
+        self._url = url
+        self._progress = progress
+        self._parser_backend = parser_backend  # `table_reader.default_backend()` if None
+        self._page_url_prefix = url.rsplit("/", 1)[0] + "/"
         self._logger = logging.getLogger(__name__)
-        self._semaphore = asyncio.Semaphore(
-            max_concurrent_requests
-        )  # Limit concurrent requests
 
     async def run(self):
         """Runs the Wikipedia scraping process."""
         self._logger.info("Starting run()")
 
-        soup = await self._fetch_wikipedia_page()
-        if soup:
-            await self._scrap_animal_table(soup)
+        try:
+            html = await self._fetch_wikipedia_page()
+            if html:
+                await self._scrap_animal_table(html)
+        finally:
+            self._frontier.close()  # No more animal pages will be discovered
 
         self._logger.info("Finished processing, setting stop event.")
 
@@ -44,99 +52,54 @@ class AnimalTableScraper(WebScraper):
 
         self._logger.info("Exiting run()")
 
-    async def _fetch_wikipedia_page(self):
-        """Fetches the Wikipedia page and parses it using BeautifulSoup."""
+    async def _fetch_wikipedia_page(self) -> Optional[str]:
+        """Fetches the Wikipedia page, returning its HTML."""
         self._logger.info("Fetching Wikipedia page")
         try:
-            _, response = await self._http_client.fetch(self.URL)
+            _, response = await self._http_client.fetch(self._url, enqueue=False)
 
             if not response or response.startswith("Error:"):  # Check for failure
                 raise ValueError(f"Failed to retrieve page content: {response}")
 
-            return BeautifulSoup(response, "html.parser")
+            return response
         except Exception as e:
             self._logger.error(f"Failed to fetch Wikipedia page: {e}")
             return None
 
-    async def _scrap_animal_table(self, soup: BeautifulSoup):
-        """Scrape the animal table asynchronously in batches."""
-        animals_table = soup.find("table", class_="wikitable sortable sticky-header")
-        if not animals_table:
-            self._logger.warning("Failed to find the animal table")
-            self._stop_event.set()  # Signal that scraping is complete
-            return
-
-        headers = [header.text.strip() for header in animals_table.find_all("th")]
-        collateral_adjectives_column_index = (
-            self._get_collateral_adjectives_column_index(headers)
+    async def _scrap_animal_table(self, html: str):
+        """Scrape the animal table, emitting animal pages to the frontier as rows are parsed."""
+        rows = read_animal_table(
+            html,
+            self.COLLATERAL_ADJECTIVE_COLUMN,
+            empty=self.EMPTY_COLUMN,
+            animal_column=self.ANIMAL_COLUMN_INDEX,
+            backend=self._parser_backend,
         )
-        if collateral_adjectives_column_index is None:
-            self._logger.warning(
-                f"Collateral adjectives column '{self.COLLATERAL_ADJECTIVE_COLUMN}' was not found"
-            )
+        try:
+            for row in rows:
+                await self._process_animal_row(row)
+                await asyncio.sleep(0)  # Let the fetchers start on the queued pages
+        except TableError as e:
+            self._logger.warning(str(e))
             self._stop_event.set()  # Signal completion to avoid indefinite hang
             return
 
-        rows = list(animals_table.find_all("tr"))
-        if not rows:
-            self._logger.warning("No rows found in animal table")
-            self._stop_event.set()
-            return
-
-        batch_size = 10  # Process in batches
-        for i in range(0, len(rows), batch_size):
-            tasks = []
-            for row in rows[i : i + batch_size]:
-                cells = row.find_all(["td"])
-                if len(cells) > collateral_adjectives_column_index:
-                    task = asyncio.create_task(
-                        self._process_animal_row(
-                            cells, collateral_adjectives_column_index
-                        )
-                    )
-                    tasks.append(task)
-
-            if tasks:
-                await asyncio.gather(
-                    *tasks
-                )  # Ensure all tasks complete before moving forward
-
         self._logger.info("Finished processing animal table")
         self._stop_event.set()  # Ensure the scraper signals completion
 
-    async def _process_animal_row(self, cells, collateral_adjectives_column_index):
-        """Processes a single row asynchronously."""
-        animal_link = cells[self.ANIMAL_COLUMN_INDEX].find("a")
-        if not animal_link:
-            return
-
-        animal_name = animal_link.text.strip()
+    async def _process_animal_row(self, row: TableRow):
+        """Stores a row's adjectives and emits the animal's page URL to the frontier."""
+        animal_name = row.animal
         self._logger.debug(f"Adding {animal_name} to queue")
 
-        # Extract collateral adjectives
-        collateral_adjectives = self._extract_collateral_adjectives(
-            cells[collateral_adjectives_column_index]
-        )
-        for adjective in collateral_adjectives:
-            self._db.insert_animal_to_collateral_adjectives(adjective, animal_name)
-
-        # Add animal page URL to queue for `AnimalPageScraper`
-        full_url = f"https://en.wikipedia.org/wiki/{animal_name}"
-        await self._queue.put((full_url, None))
-
-        async with self._semaphore:
-            await self._http_client.submit_urls([full_url])
-
-    def _get_collateral_adjectives_column_index(self, headers: list[str]) -> int | None:
-        """Gets the column index for collateral adjectives."""
-        return (
-            headers.index(self.COLLATERAL_ADJECTIVE_COLUMN)
-            if self.COLLATERAL_ADJECTIVE_COLUMN in headers
-            else None
-        )
+        if row.adjectives:
+            self._db.insert_many(
+                adjectives=[(adjective, animal_name) for adjective in row.adjectives]
+            )
+        if self._progress:
+            self._progress.row_parsed(animal_name, row.adjectives)
 
-    def _extract_collateral_adjectives(self, cell) -> list[str]:
-        """Extracts collateral adjectives from a cell."""
-        if cell.get_text(strip=True) == self.EMPTY_COLUMN:
-            return []
-        return [text.strip() for text in cell.stripped_strings if text.strip()]
+        # Add animal page URL to the frontier for the `AnimalPageScraper` fetchers
+        page_url = row.href or f"{self._page_url_prefix}{animal_name}"
+        if not await self._frontier.put(page_url, animal_name, base=self._url):
+            self._logger.debug(f"Page of {animal_name} is already queued")
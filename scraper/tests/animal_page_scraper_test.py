@@ -0,0 +1,188 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+
+from client.http_client import AsyncHttpClient
+from db.animals_db import AnimalsInMemoryDB
+from scraper.animal_page_scraper import AnimalPageScraper
+from scraper.budget import Deadline
+from scraper.frontier import UrlFrontier
+
+PAGE = """
+<table class="infobox"><tr><td><img src="//upload.example.com/{name}.jpg"></td></tr></table>
+"""
+
+
+@pytest.fixture
+def mock_http_client():
+    """Fixture for a page client that serves an infobox image for every animal."""
+    client = AsyncMock(spec=AsyncHttpClient)
+
+    async def fetch(url, **_):
+        if url.endswith("/Puma"):  # Redirects to the Cougar page
+            url = url.replace("/Puma", "/Cougar")
+        return url, PAGE.format(name=url.rsplit("/", 1)[-1])
+
+    client.fetch.side_effect = fetch
+    return client
+
+
+@pytest.fixture
+def mock_db():
+    """Fixture for creating a mocked in-memory database."""
+    return MagicMock(spec=AnimalsInMemoryDB)
+
+
+@pytest.fixture
+def frontier():
+    """Fixture for creating the frontier animal pages are taken from."""
+    return UrlFrontier()
+
+
+@pytest.fixture
+def image_frontier():
+    """Fixture for creating the frontier images are emitted to."""
+    return UrlFrontier()
+
+
+@pytest.fixture
+def scraper(mock_http_client, mock_db, frontier, image_frontier):
+    """Fixture to create an instance of the scraper with a small fetcher pool."""
+    return AnimalPageScraper(
+        mock_http_client, mock_db, frontier, image_frontier, fetchers=3
+    )
+
+
+async def drain(frontier):
+    """Returns every item left in a closed frontier."""
+    items = []
+    while (item := await frontier.get()) is not None:
+        items.append(item)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_requests_time_out_at_the_frontier_deadline(
+    mock_http_client, mock_db, image_frontier
+):
+    """Test that a page request cannot outlast the time left in the refresh's budget."""
+    now = [0.0]
+    frontier = UrlFrontier(deadline=Deadline(10, clock=lambda: now[0]))
+    await frontier.put("https://en.wikipedia.org/wiki/Bear", "Bear")
+    frontier.close()
+    now[0] = 7
+
+    await AnimalPageScraper(mock_http_client, mock_db, frontier, image_frontier).run()
+
+    assert mock_http_client.fetch.await_args.kwargs["timeout"] == 3
+
+
+@pytest.mark.asyncio
+async def test_run_fetches_every_page_until_frontier_closes(
+    scraper, mock_http_client, mock_db, frontier, image_frontier
+):
+    """Test that the fetcher pool drains the frontier and emits every page's image."""
+    for name in ["Bear", "Cat", "Dog", "Eel"]:
+        await frontier.put(f"https://en.wikipedia.org/wiki/{name}", name)
+    frontier.close()
+
+    await scraper.run()
+
+    assert mock_http_client.fetch.await_count == 4
+    mock_db.insert_image_url.assert_any_call("https://upload.example.com/Cat.jpg", "Cat")
+    assert sorted(call.args[0] for call in mock_db.insert_fetched_at.call_args_list) == [
+        "Bear", "Cat", "Dog", "Eel"
+    ]
+    assert image_frontier.closed
+    assert sorted(await drain(image_frontier)) == [
+        (f"https://upload.example.com/{name}.jpg", name)
+        for name in ["Bear", "Cat", "Dog", "Eel"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_redirect_to_seen_page_is_recorded_for_its_animal(
+    scraper, mock_db, frontier, image_frontier
+):
+    """Test that a page redirecting to an already queued page still gives its animal data."""
+    await frontier.put("https://en.wikipedia.org/wiki/Cougar", "Cougar")
+    await frontier.put("https://en.wikipedia.org/wiki/Puma", "Puma")
+    frontier.close()
+
+    await scraper.run()
+
+    assert sorted(mock_db.insert_image_url.call_args_list) == [
+        call("https://upload.example.com/Cougar.jpg", "Cougar"),
+        call("https://upload.example.com/Cougar.jpg", "Puma"),
+    ]
+    assert sorted(c.args[0] for c in mock_db.insert_fetched_at.call_args_list) == [
+        "Cougar",
+        "Puma",
+    ]
+    assert frontier.saved == 0  # Both pages were fetched
+    assert len(await drain(image_frontier)) == 1
+
+
+@pytest.mark.asyncio
+async def test_page_linked_by_several_animals_is_recorded_for_each(
+    scraper, mock_http_client, mock_db, frontier, image_frontier
+):
+    """Test that animals linking to the same page all get its image and fetch time."""
+    await frontier.put("https://en.wikipedia.org/wiki/Donkey", "Donkey")
+    await frontier.put("https://en.wikipedia.org/wiki/Donkey", "Ass")
+    frontier.close()
+
+    await scraper.run()
+
+    assert mock_http_client.fetch.await_count == 1
+    assert mock_db.insert_image_url.call_args_list == [
+        call("https://upload.example.com/Donkey.jpg", "Donkey"),
+        call("https://upload.example.com/Donkey.jpg", "Ass"),
+    ]
+    assert [c.args[0] for c in mock_db.insert_fetched_at.call_args_list] == ["Donkey", "Ass"]
+    await drain(image_frontier)
+    assert image_frontier.animals("https://upload.example.com/Donkey.jpg") == ["Donkey", "Ass"]
+
+
+@pytest.mark.asyncio
+async def test_animal_linking_to_a_page_already_fetched_is_recorded(
+    scraper, mock_db, frontier
+):
+    """Test that an animal whose link comes after its page was processed gets its data."""
+    run = asyncio.create_task(scraper.run())
+    await frontier.put("https://en.wikipedia.org/wiki/Donkey", "Donkey")
+    while not mock_db.insert_fetched_at.called:
+        await asyncio.sleep(0.01)
+
+    await frontier.put("https://en.wikipedia.org/wiki/Donkey", "Ass")
+    frontier.close()
+    await run
+
+    mock_db.insert_image_url.assert_called_with("https://upload.example.com/Donkey.jpg", "Ass")
+    assert [c.args[0] for c in mock_db.insert_fetched_at.call_args_list] == ["Donkey", "Ass"]
+
+
+@pytest.mark.asyncio
+async def test_extract_image_url_resolves_protocol_relative_src(scraper):
+    """Test that an image src is resolved against the page it was found on."""
+    html = PAGE.format(name="Owl").replace("//upload.example.com", "//UPLOAD.example.com")
+
+    image_url = await scraper._extract_image_url(html, "Owl", "http://example.com/wiki/Owl")
+    assert image_url == "http://upload.example.com/Owl.jpg"
+
+
+@pytest.mark.asyncio
+async def test_failed_page_is_skipped(
+    scraper, mock_http_client, mock_db, frontier, image_frontier
+):
+    """Test that a page which could not be fetched is skipped without stopping the pool."""
+    mock_http_client.fetch.side_effect = None
+    mock_http_client.fetch.return_value = ("Error: Connection Error", "")
+    await frontier.put("https://en.wikipedia.org/wiki/Bear", "Bear")
+    frontier.close()
+
+    await scraper.run()
+
+    mock_db.insert_image_url.assert_not_called()
+    assert await drain(image_frontier) == []
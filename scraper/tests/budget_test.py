@@ -0,0 +1,32 @@
+import pytest
+
+from scraper.budget import Deadline, parse_budget
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [("60s", 60), ("90", 90), ("1.5m", 90), ("500ms", 0.5), ("2h", 7200), (" 5 m ", 300)],
+)
+def test_parse_budget(value, seconds):
+    """Test that durations are read in seconds, with seconds as the default unit."""
+    assert parse_budget(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "0s", "-5s", "5 minutes", "s", "1e3"])
+def test_invalid_budget_is_rejected(value):
+    """Test that anything but a positive duration is rejected."""
+    with pytest.raises(ValueError, match="Invalid budget"):
+        parse_budget(value)
+
+
+def test_deadline_counts_down_on_its_clock():
+    """Test that the time left is measured on the given clock and never negative."""
+    now = [100.0]
+    deadline = Deadline(5, clock=lambda: now[0])
+    assert deadline.remaining() == 5 and not deadline.expired
+
+    now[0] = 103
+    assert deadline.remaining() == 2
+
+    now[0] = 106
+    assert deadline.remaining() == 0 and deadline.expired
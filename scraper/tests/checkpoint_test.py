@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import pytest
+
+import server
+from benchmarks.stub_server import StubWikipedia
+from scraper.checkpoint import Checkpoint, CheckpointLockedError
+from scraper.paths import checkpoint_path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+SCRAPE_SCRIPT = """
+import asyncio, sys
+import server
+from scraper.checkpoint import Checkpoint, CheckpointLockedError
+from scraper.paths import checkpoint_path
+asyncio.run(server.scrape_data(sys.argv[1], Checkpoint(sys.argv[2], flush_interval=0.05)))
+"""
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Fixture for the path of a checkpoint journal."""
+    return tmp_path / "checkpoint.jsonl"
+
+
+def test_records_survive_restart(journal_path):
+    """Test that flushed records are loaded by a new checkpoint on the same journal."""
+    checkpoint = Checkpoint(journal_path)
+    checkpoint.record_page("https://example.com/wiki/Owl", "https://example.com/owl.jpg")
+    checkpoint.record_page("https://example.com/wiki/Eel", None)
+    checkpoint.record_image("https://example.com/owl.jpg", "/tmp/Owl.jpg")
+    checkpoint.flush()
+
+    resumed = Checkpoint(journal_path)
+    assert dict(resumed.pages) == {
+        "https://example.com/wiki/Owl": "https://example.com/owl.jpg",
+        "https://example.com/wiki/Eel": None,
+    }
+    assert dict(resumed.images) == {"https://example.com/owl.jpg": "/tmp/Owl.jpg"}
+
+
+def test_records_are_flushed_in_batches(journal_path):
+    """Test that records are only appended to the journal once a batch is due."""
+    checkpoint = Checkpoint(journal_path, batch_size=2, flush_interval=60)
+    checkpoint.record_page("https://example.com/wiki/Owl", None)
+    assert not journal_path.exists()
+
+    checkpoint.record_page("https://example.com/wiki/Eel", None)
+    assert len(Checkpoint(journal_path).pages) == 2
+
+
+def test_torn_record_is_ignored(journal_path):
+    """Test that a record the process died while appending is skipped on load."""
+    journal_path.write_text(
+        '{"page": "https://example.com/wiki/Owl", "image_url": null}\n{"page": "https://ex'
+    )
+
+    assert list(Checkpoint(journal_path).pages) == ["https://example.com/wiki/Owl"]
+
+
+def test_remove_discards_journal(journal_path):
+    """Test that a completed scrape leaves no journal behind."""
+    checkpoint = Checkpoint(journal_path)
+    checkpoint.record_image("https://example.com/owl.jpg", "/tmp/Owl.jpg")
+    checkpoint.flush()
+
+    checkpoint.remove()
+
+    assert not journal_path.exists()
+    assert not checkpoint.images
+
+
+def test_lock_refuses_a_second_scrape_on_the_journal(journal_path):
+    """Test that only one scrape at a time can hold a journal, and that it is released."""
+    with Checkpoint(journal_path).locked():
+        with pytest.raises(CheckpointLockedError):
+            with Checkpoint(journal_path).locked():
+                pass  # pragma: no cover
+        with Checkpoint(journal_path.with_name("other.jsonl")).locked():
+            pass  # Another database's journal is independent
+
+    with Checkpoint(journal_path).locked():
+        pass
+
+
+def test_journal_is_kept_next_to_the_database(tmp_path):
+    """Test that each database file has its own journal, outside the working directory."""
+    assert checkpoint_path(tmp_path / "animals.sqlite3") == (
+        tmp_path / "animals.sqlite3.checkpoint.jsonl"
+    )
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        assert checkpoint_path(None).parent == tmp_path
+
+
+def fetched(stub: StubWikipedia, prefix: str) -> set[str]:
+    return {path for path in stub.requests if path.startswith(prefix)}
+
+
+@pytest.mark.asyncio
+async def test_killed_scrape_resumes_where_it_stopped(tmp_path, journal_path):
+    """Test that a scrape killed part-way is resumed without refetching completed URLs."""
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+
+    async with StubWikipedia(animals=60, latency=0.2) as stub:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            SCRAPE_SCRIPT,
+            stub.list_url,
+            str(journal_path),
+            cwd=REPO_ROOT,
+            env={**os.environ, "TMPDIR": str(image_dir), "PYTHONPATH": str(REPO_ROOT)},
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        while not journal_path.exists() and process.returncode is None:
+            await asyncio.sleep(0.01)
+        process.kill()
+        await process.wait()
+
+        interrupted = Checkpoint(journal_path)
+        done_pages = {urlsplit(url).path for url in interrupted.pages}
+        done_images = {urlsplit(url).path for url in interrupted.images}
+        assert 0 < len(done_pages) < 60, "the scrape was not killed part-way"
+
+        stub.requests.clear()
+        with patch("tempfile.gettempdir", return_value=str(image_dir)):
+            await server.scrape_data(stub.list_url, Checkpoint(journal_path))
+
+        all_pages = {urlsplit(stub.page_url(animal)).path for animal in stub.animals}
+        all_images = {urlsplit(stub.image_url(animal)).path for animal in stub.animals}
+        assert fetched(stub, "/wiki/Animal_") == all_pages - done_pages
+        assert fetched(stub, "/images/") == all_images - done_images
+        assert set(stub.requests.values()) == {1}
+
+    snapshot = server.db.snapshot()
+    assert len(snapshot.animal_image_urls) == 60
+    assert len(snapshot.animal_images_local_paths) == 60
+    assert not journal_path.exists()
@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+
+from client.http_client import AsyncHttpClient
+from db.animals_db import AnimalsInMemoryDB
+from scraper.file_handler import FileHandler
+from scraper.frontier import UrlFrontier
+
+
+@pytest.fixture
+def mock_http_client():
+    """Fixture for an image client that returns the URL as the image bytes."""
+    client = AsyncMock(spec=AsyncHttpClient)
+
+    async def fetch(url, **_):
+        return url, url.encode()
+
+    client.fetch.side_effect = fetch
+    return client
+
+
+@pytest.fixture
+def mock_db():
+    """Fixture for creating a mocked in-memory database."""
+    return MagicMock(spec=AnimalsInMemoryDB)
+
+
+@pytest.fixture
+def frontier():
+    """Fixture for creating the frontier images are taken from."""
+    return UrlFrontier()
+
+
+@pytest.fixture
+def file_handler(mock_http_client, mock_db, frontier, tmp_path):
+    """Fixture to create a file handler that saves images into a temporary directory."""
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        yield FileHandler(mock_http_client, mock_db, frontier, max_concurrent_downloads=2)
+
+
+@pytest.mark.asyncio
+async def test_run_saves_every_image_from_frontier(
+    file_handler, mock_http_client, mock_db, frontier, tmp_path
+):
+    """Test that each queued image is downloaded once and saved under its animal's name."""
+    await frontier.put("https://example.com/owl.jpg", "Owl")
+    await frontier.put("https://example.com/bat.jpg", "Bat")
+    await frontier.put("https://example.com/owl.jpg", "Eagle-owl")
+    frontier.close()
+
+    await file_handler.run()
+
+    assert mock_http_client.fetch.await_count == 2
+    assert (tmp_path / "Owl.jpg").read_bytes() == b"https://example.com/owl.jpg"
+    mock_db.insert_image_local_path.assert_any_call("Bat", str(tmp_path / "Bat.jpg"))
+
+
+@pytest.mark.asyncio
+async def test_shared_image_is_recorded_for_every_animal(mock_http_client, frontier, tmp_path):
+    """Test that an image shared by two animals is saved once and recorded for both."""
+    db = AnimalsInMemoryDB()
+    owl_url = "https://example.com/owl.jpg"
+    for animal_name in ("Owl", "Eagle-owl"):  # The table shows the URL's last owner
+        db.insert_image_url(owl_url, animal_name)
+        await frontier.put(owl_url, animal_name)
+    frontier.close()
+
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        await FileHandler(mock_http_client, db, frontier).run()
+
+    assert mock_http_client.fetch.await_count == 1
+    assert db.animal_image_urls == {owl_url: "Eagle-owl"}
+    assert db.animal_images_local_paths == {
+        "Owl": str(tmp_path / "Owl.jpg"),
+        "Eagle-owl": str(tmp_path / "Owl.jpg"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_image_shared_after_it_was_saved_is_recorded(file_handler, mock_db, frontier):
+    """Test that an animal naming an image that was already saved gets its local path."""
+    owl_url = "https://example.com/owl.jpg"
+    run = asyncio.create_task(file_handler.run())
+    await frontier.put(owl_url, "Owl")
+    while not mock_db.insert_image_local_path.called:
+        await asyncio.sleep(0.01)
+
+    await frontier.put(owl_url, "Eagle-owl")  # Not fetched again
+    frontier.close()
+    await run
+
+    local_path = mock_db.insert_image_local_path.call_args_list[0].args[1]
+    assert mock_db.insert_image_local_path.call_args_list == [
+        call("Owl", local_path),
+        call("Eagle-owl", local_path),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_is_skipped(file_handler, mock_http_client, mock_db, frontier):
+    """Test that an image which could not be downloaded is not saved."""
+    mock_http_client.fetch.side_effect = None
+    mock_http_client.fetch.return_value = "Error: Timeout"
+    await frontier.put("https://example.com/owl.jpg", "Owl")
+    frontier.close()
+
+    await file_handler.run()
+
+    mock_db.insert_image_local_path.assert_not_called()
@@ -0,0 +1,195 @@
+import asyncio
+
+import pytest
+
+from scraper.budget import Deadline
+from scraper.frontier import UrlFrontier, normalize_url
+
+
+@pytest.mark.asyncio
+async def test_get_returns_items_in_order():
+    """Test that URLs are handed out in the order they were added."""
+    frontier = UrlFrontier()
+    await frontier.put("https://example.com/a", "a")
+    await frontier.put("https://example.com/b")
+
+    assert await frontier.get() == ("https://example.com/a", "a")
+    assert await frontier.get() == ("https://example.com/b", None)
+
+
+@pytest.mark.asyncio
+async def test_close_releases_every_waiting_consumer():
+    """Test that closing the frontier ends all consumers once it is drained."""
+    frontier = UrlFrontier()
+    consumers = [asyncio.create_task(frontier.get()) for _ in range(3)]
+    await frontier.put("https://example.com/a", "a")
+    frontier.close()
+
+    results = await asyncio.gather(*consumers)
+    assert sorted(results, key=str) == [("https://example.com/a", "a"), None, None]
+    assert frontier.empty()
+
+
+@pytest.mark.asyncio
+async def test_put_after_close_fails():
+    """Test that a closed frontier rejects new URLs."""
+    frontier = UrlFrontier()
+    frontier.close()
+
+    with pytest.raises(RuntimeError):
+        await frontier.put("https://example.com/a")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_urls_are_queued_once():
+    """Test that equivalent URLs are only queued the first time they are seen."""
+    frontier = UrlFrontier()
+    assert await frontier.put("/wiki/Red_fox", "Red fox", base="https://en.wikipedia.org/wiki/List")
+    assert not await frontier.put("https://EN.wikipedia.org/wiki/Red_fox#Diet", "Fox")
+    frontier.close()
+
+    assert await frontier.get() == ("https://en.wikipedia.org/wiki/Red_fox", "Red fox")
+    assert await frontier.get() is None
+    assert frontier.saved == 1
+
+
+@pytest.mark.asyncio
+async def test_every_animal_sharing_a_url_is_kept():
+    """Test that a URL added for several animals is handed out once but lists them all."""
+    frontier = UrlFrontier()
+    await frontier.put("https://example.com/owl.jpg", "Owl")
+    await frontier.put("https://example.com/owl.jpg", "Eagle-owl")
+    await frontier.put("https://example.com/owl.jpg", "Owl")
+    frontier.close()
+
+    assert await frontier.get() == ("https://example.com/owl.jpg", "Owl")
+    assert await frontier.get() is None
+    assert frontier.animals("https://example.com/owl.jpg") == ["Owl", "Eagle-owl"]
+    assert not frontier.animals("https://example.com/bat.jpg")
+
+
+def test_resolve_redirects():
+    """Test that a redirect to an already seen URL is reported as a duplicate."""
+    frontier = UrlFrontier()
+    frontier._seen.update({"https://example.com/a", "https://example.com/b"})
+
+    assert frontier.resolve("https://example.com/a", "https://example.com/a")
+    assert not frontier.resolve("https://example.com/b", "https://example.com/a")
+    assert frontier.resolve("https://example.com/c", "https://example.com/d")
+    assert frontier.saved == 0  # Every one of them was fetched
+
+
+@pytest.mark.parametrize(
+    "url, base, expected",
+    [
+        ("/wiki/Tiger", "https://en.wikipedia.org/wiki/List",
+         "https://en.wikipedia.org/wiki/Tiger"),
+        ("//upload.wikimedia.org/a.jpg", "https://en.wikipedia.org/wiki/Owl",
+         "https://upload.wikimedia.org/a.jpg"),
+        ("https://en.wikipedia.org/wiki/Bald eagle", None,
+         "https://en.wikipedia.org/wiki/Bald%20eagle"),
+        ("https://en.wikipedia.org/wiki/Bald%20eagle", None,
+         "https://en.wikipedia.org/wiki/Bald%20eagle"),
+        ("https://en.wikipedia.org/wiki/Przewalski%27s_horse", None,
+         "https://en.wikipedia.org/wiki/Przewalski's_horse"),
+        ("https://en.wikipedia.org/wiki/Caf\u00e9", None,
+         "https://en.wikipedia.org/wiki/Caf%C3%A9"),
+        ("HTTPS://Example.COM", None, "https://example.com/"),
+    ],
+)
+def test_normalize_url(url, base, expected):
+    """Test that links are resolved, encoded and canonicalized consistently."""
+    assert normalize_url(url, base) == expected
+
+
+@pytest.mark.asyncio
+async def test_urls_are_handed_out_by_priority():
+    """Test that a prioritized frontier hands out lower keys first, FIFO among equals."""
+    ranks = {"Owl": 1, "Bat": 0, "Eel": 1}
+    frontier = UrlFrontier(priority=lambda animal_name: (ranks[animal_name],))
+    for animal_name in ["Owl", "Bat", "Eel"]:
+        await frontier.put(f"https://example.com/wiki/{animal_name}", animal_name)
+    frontier.close()
+
+    assert [(await frontier.get())[1] for _ in range(3)] == ["Bat", "Owl", "Eel"]
+    assert await frontier.get() is None
+
+
+@pytest.mark.asyncio
+async def test_stop_drops_the_urls_not_handed_out():
+    """Test that a stopped frontier hands out no more URLs and drops later ones."""
+    frontier = UrlFrontier()
+    for animal_name in ["Owl", "Bat", "Eel"]:
+        await frontier.put(f"https://example.com/wiki/{animal_name}", animal_name)
+    assert (await frontier.get())[1] == "Owl"
+
+    frontier.stop()
+
+    assert await frontier.get() is None
+    assert not await frontier.put("https://example.com/wiki/Yak", "Yak")
+    assert frontier.left == 3  # Bat, Eel and Yak
+    assert frontier.stopped and frontier.closed
+
+
+@pytest.mark.asyncio
+async def test_stop_wakes_waiting_fetchers():
+    """Test that fetchers waiting on an empty frontier all return once it is stopped."""
+    frontier = UrlFrontier()
+    waiting = [asyncio.create_task(frontier.get()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    frontier.stop()
+
+    assert await asyncio.gather(*waiting) == [None, None, None]
+    assert frontier.left == 0
+
+
+@pytest.mark.asyncio
+async def test_held_frontier_hands_out_by_priority_once_closed():
+    """Test that a held frontier waits for every URL before handing out the best one."""
+    frontier = UrlFrontier(priority=lambda animal_name: (animal_name,), hold=True)
+    fetcher = asyncio.create_task(frontier.get())
+    await frontier.put("https://example.com/wiki/Owl", "Owl")
+    await asyncio.sleep(0)
+    assert not fetcher.done()
+
+    await frontier.put("https://example.com/wiki/Bat", "Bat")
+    frontier.close()
+
+    assert (await fetcher)[1] == "Bat"
+
+
+@pytest.mark.asyncio
+async def test_frontier_stops_at_its_deadline():
+    """Test that a frontier stops itself once its deadline has passed."""
+    now = [0.0]
+    frontier = UrlFrontier(deadline=Deadline(10, clock=lambda: now[0]))
+    await frontier.put("https://example.com/wiki/Owl", "Owl")
+    await frontier.put("https://example.com/wiki/Bat", "Bat")
+    assert (await frontier.get())[1] == "Owl"
+    now[0] = 4
+    assert frontier.time_left() == 6
+
+    now[0] = 10
+
+    assert frontier.time_left() == 0
+    assert await frontier.get() is None
+    assert not await frontier.put("https://example.com/wiki/Eel", "Eel")
+    assert frontier.stopped
+    assert frontier.left == 2  # Bat and Eel
+
+
+@pytest.mark.asyncio
+async def test_deadline_passing_while_waiting_stops_the_fetcher():
+    """Test that a fetcher woken up after the deadline passed does not get the URL."""
+    now = [0.0]
+    frontier = UrlFrontier(deadline=Deadline(10, clock=lambda: now[0]))
+    fetcher = asyncio.create_task(frontier.get())
+    await asyncio.sleep(0)
+
+    await frontier.put("https://example.com/wiki/Owl", "Owl")
+    now[0] = 10  # Before the fetcher gets to run again
+
+    assert await fetcher is None
+    assert frontier.stopped
+    assert frontier.left == 1
@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from client.http_client import AsyncHttpClient
+from scraper.image_cache import ImageCache
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """Fixture for the directory images are saved to."""
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        yield tmp_path
+
+
+@pytest.fixture
+def mock_http_client():
+    """Fixture for an image client that slowly returns the URL as the image bytes."""
+    client = AsyncMock(spec=AsyncHttpClient)
+
+    async def fetch(url, **_):
+        await asyncio.sleep(0.01)
+        return url, url.encode()
+
+    client.fetch.side_effect = fetch
+    return client
+
+
+@pytest.fixture
+def cache(mock_http_client):
+    """Fixture to create an image cache that prefetches one image at a time."""
+    return ImageCache(mock_http_client, prefetch_concurrency=1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_download(cache, mock_http_client, image_dir):
+    """Test that concurrent requests for the same animal trigger a single download."""
+    paths = await asyncio.gather(
+        *[cache.get("Owl", "https://example.com/owl.jpg") for _ in range(5)]
+    )
+
+    assert paths == [image_dir / "Owl.jpg"] * 5
+    assert mock_http_client.fetch.await_count == 1
+    assert (image_dir / "Owl.jpg").read_bytes() == b"https://example.com/owl.jpg"
+    assert cache.views["Owl"] == 5
+    assert cache.bytes_downloaded == len(b"https://example.com/owl.jpg")
+
+
+@pytest.mark.asyncio
+async def test_cached_image_is_not_downloaded_again(cache, mock_http_client, image_dir):
+    """Test that an image already on disk, e.g. from an eager scrape, is served as is."""
+    (image_dir / "Owl.jpg").write_bytes(b"eager")
+
+    assert await cache.get("Owl", "https://example.com/owl.jpg") == image_dir / "Owl.jpg"
+    mock_http_client.fetch.assert_not_awaited()
+    assert cache.local_paths == {}  # Only images the cache downloaded are listed
+
+
+@pytest.mark.asyncio
+async def test_changed_image_url_is_downloaded_again(cache, mock_http_client, image_dir):
+    """Test that an image downloaded by the cache is refreshed when its URL changes."""
+    await cache.get("Owl", "https://example.com/owl.jpg")
+    await cache.get("Owl", "https://example.com/owl-2.jpg")
+
+    assert mock_http_client.fetch.await_count == 2
+    assert (image_dir / "Owl.jpg").read_bytes() == b"https://example.com/owl-2.jpg"
+    assert cache.local_paths == {"Owl": str(image_dir / "Owl.jpg")}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("image_dir")
+async def test_failed_download_is_retried_on_next_request(cache, mock_http_client):
+    """Test that a failed download is not cached."""
+    mock_http_client.fetch.side_effect = None
+    mock_http_client.fetch.return_value = "Error: Timeout"
+
+    assert await cache.get("Owl", "https://example.com/owl.jpg") is None
+    assert await cache.get("Owl", "https://example.com/owl.jpg") is None
+    assert mock_http_client.fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_most_viewed_first(cache, mock_http_client, image_dir):
+    """Test that the prefetcher downloads the most-viewed uncached images, in order."""
+    cache.views.update({"Owl": 5, "Eel": 1, "Bat": 3, "Yak": 2})
+    (image_dir / "Yak.jpg").write_bytes(b"eager")
+    image_urls = {name: f"https://example.com/{name}.jpg" for name in ["Owl", "Eel", "Bat"]}
+    image_urls["Yak"] = "https://example.com/Yak.jpg"
+
+    assert await cache.prefetch(image_urls, limit=3) == 2
+
+    fetched = [call.args[0] for call in mock_http_client.fetch.await_args_list]
+    assert fetched == ["https://example.com/Owl.jpg", "https://example.com/Bat.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_own_client_is_opened_on_first_download(mock_http_client, image_dir):
+    """Test that a cache without a client opens one only when it downloads, and closes it."""
+    mock_http_client.__aenter__.return_value = mock_http_client
+    (image_dir / "Owl.jpg").write_bytes(b"eager")
+
+    with patch("client.http_client.AsyncHttpClient", return_value=mock_http_client) as opened:
+        cache = ImageCache()
+        await cache.get("Owl", "https://example.com/owl.jpg")
+        opened.assert_not_called()
+
+        await cache.get("Eel", "https://example.com/eel.jpg")
+        await cache.get("Bat", "https://example.com/bat.jpg")
+        opened.assert_called_once()
+
+        await cache.close()
+    mock_http_client.__aexit__.assert_awaited_once()
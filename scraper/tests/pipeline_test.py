@@ -0,0 +1,155 @@
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.stub_server import StubWikipedia
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_sqlite_db import AnimalsSQLiteDB
+from scraper import pipeline
+from scraper.animal_page_scraper import AnimalPageScraper
+from scraper.checkpoint import Checkpoint, CheckpointLockedError
+from scraper.priority import FetchPriority
+from scraper.progress import ScrapeProgress
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """Fixture for the directory images are saved to."""
+    directory = tmp_path / "images"
+    directory.mkdir()
+    with patch("tempfile.gettempdir", return_value=str(directory)):
+        yield directory
+
+
+def requests_clock(stub, prefix):
+    """Returns a clock that advances one second per request for a path starting with `prefix`.
+
+    The stub counts a request as soon as it arrives, so a budget of N on this clock expires
+    exactly when the N-th such request is made, however slow the machine is.
+    """
+    return lambda: float(
+        sum(count for path, count in stub.requests.items() if path.startswith(prefix))
+    )
+
+
+async def refresh(db, stub, tmp_path, budget=None, clock=None) -> set[str]:
+    """Runs a refresh and returns the animals whose page it fetched."""
+    stub.requests.clear()
+    await pipeline.scrape_data(
+        db,
+        ScrapeProgress(),
+        stub.list_url,
+        Checkpoint(tmp_path / "checkpoint.jsonl"),
+        shards=1,
+        lazy_images=False,
+        priority=FetchPriority(("table",)),
+        budget=budget,
+        clock=clock or requests_clock(stub, "/wiki/Animal_"),
+    )
+    return {path.rsplit("/", 1)[1] for path in stub.requests if path.startswith("/wiki/Animal_")}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("image_dir")
+async def test_budgeted_refreshes_fetch_the_stalest_pages_first(tmp_path):
+    """Test that each budgeted refresh starts with the pages the previous ones missed."""
+    db = AnimalsInMemoryDB()
+
+    async with StubWikipedia(animals=100, latency=0.01, jitter=False) as stub:
+        table_order = stub.animals
+        first = await refresh(db, stub, tmp_path, budget=10)  # Expires at the 10th page
+        after_first = db.snapshot()
+        second = await refresh(db, stub, tmp_path, budget=10)
+
+    # Never-fetched animals tie on staleness, so they are taken in table order
+    assert 10 <= len(first) < 50 and 10 <= len(second) < 50
+    assert first == set(table_order[: len(first)])
+    assert second == set(table_order[len(first) : len(first) + len(second)])
+    assert set(after_first.animal_fetched_at) == first
+
+    snapshot = db.snapshot()
+    assert set(snapshot.animal_fetched_at) == first | second
+    assert set(snapshot.animal_image_urls.values()) >= first  # Kept from the first refresh
+    assert len(snapshot.collateral_adjectives_to_animals) == 50  # The whole table, once
+
+
+@pytest.mark.asyncio
+async def test_budgeted_refresh_downloads_missing_images_first(tmp_path, image_dir):
+    """Test that images missing from disk are downloaded without fetching their pages."""
+    db = AnimalsInMemoryDB()
+
+    async with StubWikipedia(animals=20, latency=0.05, jitter=False) as stub:
+        await refresh(db, stub, tmp_path)
+        fetched_at = dict(db.snapshot().animal_fetched_at)
+        (image_dir / "Animal_3.jpg").unlink()
+
+        # Expires as the missing image is requested, while the table is still loading
+        pages = await refresh(db, stub, tmp_path, budget=1, clock=requests_clock(stub, "/images/"))
+
+        assert not pages
+        assert [path for path in stub.requests if path.startswith("/images/")] == [
+            "/images/Animal_3.jpg"
+        ]
+
+    snapshot = db.snapshot()
+    assert (image_dir / "Animal_3.jpg").exists()
+    assert len(snapshot.animal_images_local_paths) == 20
+    assert snapshot.animal_fetched_at == fetched_at
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("image_dir")
+async def test_unbudgeted_refresh_rebuilds_the_dataset(tmp_path):
+    """Test that a refresh without a budget fetches every page and records when."""
+    db = AnimalsInMemoryDB()
+
+    async with StubWikipedia(animals=10, latency=0.01, jitter=False) as stub:
+        pages = await refresh(db, stub, tmp_path)
+
+    snapshot = db.snapshot()
+    assert len(pages) == 10
+    assert sorted(snapshot.animal_fetched_at) == sorted(stub.animals)
+    assert len(snapshot.animal_images_local_paths) == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("image_dir")
+async def test_refresh_is_refused_while_another_scrape_holds_the_journal(tmp_path):
+    """Test that a second scrape on the same journal fails before touching the data."""
+    db = AnimalsInMemoryDB()
+
+    async with StubWikipedia(animals=10, latency=0.01, jitter=False) as stub:
+        await refresh(db, stub, tmp_path)
+        published = db.snapshot()
+        with Checkpoint(tmp_path / "checkpoint.jsonl").locked():
+            with pytest.raises(CheckpointLockedError):
+                await refresh(db, stub, tmp_path)
+
+        assert not stub.requests
+        assert db.snapshot() is published
+        assert db.animal_image_urls == dict(published.animal_image_urls)  # Not reset
+        await refresh(db, stub, tmp_path)  # Runs again once the lock is released
+
+    assert db.snapshot().generation == published.generation + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("image_dir")
+async def test_failed_refresh_keeps_the_previous_dataset(tmp_path):
+    """Test that a failed refresh is rolled back and the database stays writable."""
+    db = AnimalsSQLiteDB(tmp_path / "animals.sqlite3")
+
+    async with StubWikipedia(animals=10, latency=0.01, jitter=False) as stub:
+        await refresh(db, stub, tmp_path)
+        published = db.snapshot()
+        with patch.object(AnimalPageScraper, "run", side_effect=RuntimeError("boom")):
+            with pytest.raises(ExceptionGroup):
+                await refresh(db, stub, tmp_path)
+
+    assert db.snapshot() is published
+    assert db.animal_image_urls == dict(published.animal_image_urls)  # Writer state, too
+    worker = AnimalsSQLiteDB(tmp_path / "animals.sqlite3", busy_timeout=0.1)
+    worker.insert_fetched_at("Animal_0", 100.0)
+    assert worker.publish().generation == published.generation + 1
+    worker.close()
+    db.close()
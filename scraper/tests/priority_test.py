@@ -0,0 +1,87 @@
+import os
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from scraper.priority import FetchPriority, parse_signals
+
+ANIMALS = ["Owl", "bat", "Eel", "Yak"]  # In table order
+
+
+def ranked(priority: FetchPriority) -> list[str]:
+    keys = {animal_name: priority(animal_name) for animal_name in ANIMALS}
+    return sorted(ANIMALS, key=keys.__getitem__)
+
+
+def test_views_then_table_order():
+    """Test that the most-viewed animals come first and ties keep the table order."""
+    priority = FetchPriority(("views", "table"), views=Counter({"Eel": 3, "Yak": 3, "bat": 1}))
+
+    assert ranked(priority) == ["Eel", "Yak", "bat", "Owl"]
+
+
+def test_views_are_read_live():
+    """Test that views counted after the priority was created are taken into account."""
+    views = Counter()
+    priority = FetchPriority(("views",), views=views)
+    views["Yak"] += 1
+
+    assert ranked(priority)[0] == "Yak"
+
+
+def test_name_order_is_case_insensitive():
+    """Test that the `name` signal sorts alphabetically regardless of case."""
+    assert ranked(FetchPriority(("name",))) == ["bat", "Eel", "Owl", "Yak"]
+
+
+def test_stalest_images_first(tmp_path):
+    """Test that missing images come first, then those saved longest ago."""
+    for mtime, animal_name in enumerate(["Yak", "Owl", "Eel"]):
+        path = tmp_path / f"{animal_name}.jpg"
+        path.write_bytes(b"")
+        os.utime(path, (mtime, mtime))
+
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        assert ranked(FetchPriority(("staleness",))) == ["bat", "Yak", "Owl", "Eel"]
+
+
+def test_unknown_signal_is_rejected():
+    """Test that a misspelled signal is reported instead of silently ignored."""
+    assert parse_signals("views, table") == ("views", "table")
+    with pytest.raises(ValueError):
+        parse_signals("views,popularity")
+    with pytest.raises(ValueError):
+        FetchPriority(("popularity",))
+
+
+def test_stalest_pages_first_by_last_fetched_time(tmp_path):
+    """Test that recorded fetch times take precedence over image times."""
+    (tmp_path / "Owl.jpg").write_bytes(b"")  # Saved now, but its page was fetched earlier
+    fetched_at = {"Owl": 10.0, "Eel": 20.0, "Yak": 5.0}
+
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        priority = FetchPriority(("staleness",), fetched_at=fetched_at)
+        assert ranked(priority) == ["bat", "Yak", "Owl", "Eel"]
+
+
+def test_with_fetched_at_puts_staleness_first():
+    """Test that a budgeted refresh ranks by staleness before the configured signals."""
+    priority = FetchPriority(("views", "table"), views=Counter({"Eel": 3}))
+
+    stalest = priority.with_fetched_at({"bat": 1.0, "Eel": 2.0, "Owl": 3.0, "Yak": 3.0}, True)
+
+    assert stalest.signals == ("staleness", "views", "table")
+    assert ranked(stalest) == ["bat", "Eel", "Owl", "Yak"]
+    assert priority.with_fetched_at({}).signals == ("views", "table")
+
+
+def test_missing_images_first(tmp_path):
+    """Test that the image priority puts animals without a saved image first."""
+    (tmp_path / "Owl.jpg").write_bytes(b"")
+    priority = FetchPriority(("table",))
+    ranked(priority)  # Positions in table order
+
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        image_priority = priority.missing_images_first()
+        assert sorted(ANIMALS, key=image_priority) == ["bat", "Eel", "Yak", "Owl"]
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+
+from scraper.progress import ScrapeProgress
+
+
+async def next_event(events):
+    return await asyncio.wait_for(anext(events), 1)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_events_published_from_another_thread():
+    """Test that a scrape on another thread's event loop reaches subscribers on this one."""
+    progress = ScrapeProgress()
+    events = progress.events()
+    assert await next_event(events) == (
+        "status",
+        {"running": False, "rows": 0, "pages": 0, "images": 0},
+    )
+
+    def scrape():
+        progress.started()
+        progress.row_parsed("Owl", ["strigine"])
+        progress.page_fetched("Owl", "https://example.com/owl.jpg")
+        progress.image_saved("Owl", "/tmp/Owl.jpg")
+        progress.finished(generation=3)
+
+    thread = threading.Thread(target=scrape)
+    thread.start()
+    received = [await next_event(events) for _ in range(5)]
+    thread.join()
+    await events.aclose()
+
+    assert received == [
+        ("start", {}),
+        ("row", {"animal": "Owl", "adjectives": ["strigine"], "rows": 1}),
+        ("page", {"animal": "Owl", "image_url": "https://example.com/owl.jpg", "pages": 1}),
+        ("image", {"animal": "Owl", "local_path": "/tmp/Owl.jpg", "images": 1}),
+        ("done", {"running": False, "rows": 1, "pages": 1, "images": 1, "generation": 3}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_starts_from_current_status():
+    """Test that a subscriber joining part-way through a scrape gets the counters so far."""
+    progress = ScrapeProgress()
+    progress.started()
+    progress.row_parsed("Owl", [])
+    progress.row_parsed("Eel", [])
+
+    events = progress.events()
+    assert await next_event(events) == (
+        "status",
+        {"running": True, "rows": 2, "pages": 0, "images": 0},
+    )
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_subscription_yields_none_after_timeout():
+    """Test that an idle subscriber is woken up so it can send a keep-alive."""
+    progress = ScrapeProgress()
+    events = progress.events(timeout=0.01)
+    await next_event(events)
+
+    assert await next_event(events) is None
+    await events.aclose()
+    assert not progress._subscribers  # Unsubscribed once iteration stops
+
+
+@pytest.mark.asyncio
+async def test_failed_scrape_is_reported():
+    """Test that subscribers are told when a scrape ends with an error."""
+    progress = ScrapeProgress()
+    events = progress.events()
+    await next_event(events)
+
+    progress.started()
+    progress.failed(RuntimeError("boom"))
+
+    assert await next_event(events) == ("start", {})
+    name, data = await next_event(events)
+    assert (name, data["message"], data["running"]) == ("error", "boom", False)
+    await events.aclose()
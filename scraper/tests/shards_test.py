@@ -0,0 +1,77 @@
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import pytest
+
+from benchmarks.stub_server import StubWikipedia
+from db.animals_db import AnimalsInMemoryDB
+from db.batch_writer import BatchWriter
+from scraper import pipeline
+from scraper.checkpoint import Checkpoint
+from scraper.progress import ScrapeProgress
+from scraper.shards import partition, scrape_sharded, shard_of
+
+
+def test_partition_assigns_each_page_to_one_stable_shard():
+    """Test that pages are split by the hash of their URL, the same way in every run."""
+    items = [(f"https://en.wikipedia.org/wiki/Animal_{i}", f"Animal {i}") for i in range(100)]
+
+    partitions = partition(items, 4)
+
+    assert sorted(item for shard in partitions for item in shard) == sorted(items)
+    assert all(partitions)  # No shard is left idle
+    for shard, shard_items in enumerate(partitions):
+        assert all(shard_of(url, 4) == shard for url, _ in shard_items)
+
+
+@pytest.mark.asyncio
+async def test_scrape_sharded_merges_every_shard(tmp_path, monkeypatch):
+    """Test that the results of all worker processes are merged into the parent's DB."""
+    monkeypatch.setenv("TMPDIR", str(tmp_path))  # Where the shard processes save images
+    db = AnimalsInMemoryDB()
+
+    async with StubWikipedia(animals=20, latency=0.01) as stub:
+        with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+            await scrape_sharded(db, 2, url=stub.list_url)
+
+        assert set(stub.requests.values()) == {1}
+        assert len(stub.requests) == 41  # The table, 20 pages and 20 images
+
+    snapshot = db.publish()
+    assert sorted(snapshot.animal_image_urls.values()) == sorted(stub.animals)
+    assert sorted(snapshot.animal_fetched_at) == sorted(stub.animals)
+    assert snapshot.animal_images_local_paths["Animal_3"] == str(tmp_path / "Animal_3.jpg")
+    assert (tmp_path / "Animal_3.jpg").exists()
+    assert len(snapshot.collateral_adjectives_to_animals) == 20
+
+
+@pytest.mark.asyncio
+async def test_shard_journals_are_kept_until_the_results_are_published(tmp_path, monkeypatch):
+    """Test that a sharded scrape failing to publish resumes from its shards' journals."""
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    journal_path = tmp_path / "checkpoint.jsonl"
+    db = AnimalsInMemoryDB()
+
+    async def scrape():
+        await pipeline.scrape_data(
+            db, ScrapeProgress(), stub.list_url, Checkpoint(journal_path), shards=2
+        )
+
+    async with StubWikipedia(animals=10, latency=0.01) as stub:
+        with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+            with patch.object(BatchWriter, "publish", side_effect=RuntimeError("boom")):
+                with pytest.raises(RuntimeError):
+                    await scrape()
+            assert sorted(path.name for path in tmp_path.glob("checkpoint.jsonl.*-of-*")) == [
+                "checkpoint.jsonl.0-of-2",
+                "checkpoint.jsonl.1-of-2",
+            ]
+
+            stub.requests.clear()
+            await scrape()
+
+        assert list(stub.requests) == [urlsplit(stub.list_url).path]  # Pages were replayed
+
+    assert sorted(db.snapshot().animal_image_urls.values()) == sorted(stub.animals)
+    assert not journal_path.exists()
+    assert not list(tmp_path.glob("checkpoint.jsonl.*-of-*"))
@@ -0,0 +1,169 @@
+import pytest
+
+from scraper import table_reader
+from scraper.table_reader import TableError, TableRow, read_animal_table
+
+COLUMN = "Collateral adjective"
+
+
+@pytest.fixture(params=table_reader.BACKENDS)
+def backend(request):
+    """Fixture running a test with each parser backend that is installed."""
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    return request.param
+
+
+def read(html: str, backend: str, **kwargs) -> list[TableRow]:
+    return list(read_animal_table(html, COLUMN, backend=backend, **kwargs))
+
+
+def table(*rows: str, headers: str = "<th>Animal</th><th>Collateral adjective</th>") -> str:
+    body = "".join(rows)
+    return (
+        "<html><body><p>Lead</p>"
+        f"<table class='wikitable sortable sticky-header'><tr>{headers}</tr>{body}</table>"
+        "</body></html>"
+    )
+
+
+def test_reads_rows_in_table_order(backend):
+    """Test that each row is read with its link and adjectives."""
+    html = table(
+        "<tr><td><a href='/wiki/Bear'>Bear</a></td><td>ursine</td></tr>",
+        "<tr><td><a href='/wiki/Cat'>Cat</a></td><td>feline</td></tr>",
+    )
+
+    assert read(html, backend) == [
+        TableRow("Bear", "/wiki/Bear", ["ursine"]),
+        TableRow("Cat", "/wiki/Cat", ["feline"]),
+    ]
+
+
+def test_reads_column_by_header(backend):
+    """Test that the adjectives are read from the column under the wanted header."""
+    html = table(
+        "<tr><td><a href='/wiki/Bee'>Bee</a></td><td>Hive</td><td>apian</td><td>Europe</td></tr>",
+        headers="<th>Animal</th><th>Type</th><th>Collateral adjective\n</th><th>Region</th>",
+    )
+
+    assert read(html, backend) == [TableRow("Bee", "/wiki/Bee", ["apian"])]
+
+
+def test_splits_adjectives_on_text_nodes(backend):
+    """Test that adjectives separated by line breaks or markup are read one by one."""
+    html = table(
+        "<tr><td><a href='/wiki/Bird'>Bird</a><sup>[1]</sup></td>"
+        "<td>avian<br/>ornithic <i>(rare)</i></td></tr>",
+    )
+
+    assert read(html, backend) == [TableRow("Bird", "/wiki/Bird", ["avian", "ornithic", "(rare)"])]
+
+
+def test_empty_column_has_no_adjectives(backend):
+    """Test that a "—" cell means that the animal has no collateral adjectives."""
+    html = table("<tr><td><a href='/wiki/Gnu'>Gnu</a></td><td> — </td></tr>")
+
+    assert read(html, backend) == [TableRow("Gnu", "/wiki/Gnu", [])]
+
+
+def test_decodes_entities(backend):
+    """Test that character references are decoded in names, links and adjectives."""
+    html = table(
+        "<tr><td><a href='/wiki/Ant?a=1&amp;b=2'>Ant &amp; co</a></td><td>&mdash;</td></tr>"
+    )
+
+    assert read(html, backend) == [TableRow("Ant & co", "/wiki/Ant?a=1&b=2", [])]
+
+
+def test_skips_rows_without_animal_or_column(backend):
+    """Test that rows without a link to the animal or too few cells are skipped."""
+    html = table(
+        "<tr><td>No link</td><td>Furry</td></tr>",
+        "<tr><td><a href='/wiki/Owl'>Owl</a></td></tr>",
+        "<tr><td><a href='/wiki/Fox'>Fox</a></td><td>vulpine</td></tr>",
+    )
+
+    assert read(html, backend) == [TableRow("Fox", "/wiki/Fox", ["vulpine"])]
+
+
+def test_ignores_nested_tables(backend):
+    """Test that the rows of a table inside a cell are not read as animals."""
+    html = table(
+        "<tr><td><a href='/wiki/Elk'>Elk</a></td><td>cervine"
+        "<table><tr><td><a href='/wiki/Note'>Note</a></td><td>x</td></tr></table></td></tr>",
+        "<tr><td><a href='/wiki/Emu'>Emu</a></td><td>dromaian</td></tr>",
+    )
+
+    assert read(html, backend) == [
+        TableRow("Elk", "/wiki/Elk", ["cervine", "Note", "x"]),
+        TableRow("Emu", "/wiki/Emu", ["dromaian"]),
+    ]
+
+
+def test_reads_rows_without_end_tags(backend):
+    """Test that cells and rows are closed by the next cell or row."""
+    html = table(
+        "<tr><td><a href='/wiki/Yak'>Yak</a><td>bovine",
+        "<tr><td><a href='/wiki/Ox'>Ox</a><td>taurine",
+    )
+
+    assert read(html, backend) == [
+        TableRow("Yak", "/wiki/Yak", ["bovine"]),
+        TableRow("Ox", "/wiki/Ox", ["taurine"]),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_chunk_boundaries_do_not_split_text(backend, chunk_size):
+    """Test that text split across chunks is read as one string."""
+    html = table("<tr><td><a href='/wiki/Wolf'>Grey wolf</a></td><td>lupine</td></tr>")
+
+    assert read(html, backend, chunk_size=chunk_size) == [
+        TableRow("Grey wolf", "/wiki/Wolf", ["lupine"])
+    ]
+
+
+def test_yields_rows_before_the_page_is_parsed(backend):
+    """Test that rows are yielded while the rest of the page is still unparsed."""
+    rows = [f"<tr><td><a href='/wiki/A{i}'>A{i}</a></td><td>a{i}</td></tr>" for i in range(200)]
+    html = table(*rows)
+    rows = read_animal_table(html, COLUMN, backend=backend, chunk_size=256)
+
+    first = next(rows)
+
+    assert first == TableRow("A0", "/wiki/A0", ["a0"])
+    assert len(list(rows)) == 199
+
+
+def test_stops_at_the_end_of_the_table(backend):
+    """Test that parsing stops once the animal table is closed."""
+    html = table("<tr><td><a href='/wiki/Bat'>Bat</a></td><td>chiropteran</td></tr>")
+    html += "<table class='wikitable sortable sticky-header'><tr><th>Other</th></tr></table>"
+
+    assert read(html + "x" * 100_000, backend, chunk_size=64) == [
+        TableRow("Bat", "/wiki/Bat", ["chiropteran"])
+    ]
+
+
+def test_missing_table(backend):
+    """Test that a page without the animal table is an error."""
+    with pytest.raises(TableError, match="animal table"):
+        read("<html><body><p>No table here</p></body></html>", backend)
+
+
+def test_missing_column(backend):
+    """Test that a table without the wanted column is an error."""
+    html = table(
+        "<tr><td><a href='/wiki/Lion'>Lion</a></td><td>Roaring</td></tr>",
+        headers="<th>Animal</th><th>Something Else</th>",
+    )
+
+    with pytest.raises(TableError, match=COLUMN):
+        read(html, backend)
+
+
+def test_unknown_backend():
+    """Test that an unknown backend is rejected."""
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        read(table(), "html5lib")
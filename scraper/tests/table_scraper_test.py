@@ -1,11 +1,12 @@
-import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from bs4 import BeautifulSoup
 
 from client.http_client import AsyncHttpClient
 from db.animals_db import AnimalsInMemoryDB
+from scraper.frontier import UrlFrontier
+from scraper.progress import ScrapeProgress
+from scraper.table_reader import TableRow
 from scraper.table_scraper import AnimalTableScraper
 
 
@@ -24,29 +25,28 @@ def mock_db():
 
 
 @pytest.fixture
-def mock_queue():
-    """Fixture for creating an asyncio queue."""
-    return asyncio.Queue()
+def frontier():
+    """Fixture for creating the frontier animal pages are emitted to."""
+    return UrlFrontier()
 
 
 @pytest.fixture
-def scraper(mock_http_client, mock_db, mock_queue):
+def scraper(mock_http_client, mock_db, frontier):
     """Fixture to create an instance of the scraper."""
-    return AnimalTableScraper(mock_http_client, mock_db, mock_queue)
+    return AnimalTableScraper(mock_http_client, mock_db, frontier)
 
 
 @pytest.mark.asyncio
 async def test_fetch_wikipedia_page_success(scraper, mock_http_client):
-    """Test successfully fetching and parsing the Wikipedia page."""
+    """Test successfully fetching the Wikipedia page."""
     mock_html = "<html><body><table class='wikitable sortable sticky-header'></table></body></html>"
     mock_http_client.fetch.return_value = (
         "https://en.wikipedia.org/wiki/List_of_animal_names",
         mock_html,
     )
 
-    soup = await scraper._fetch_wikipedia_page()
-    assert isinstance(soup, BeautifulSoup)
-    assert soup.find("table", class_="wikitable sortable sticky-header") is not None
+    html = await scraper._fetch_wikipedia_page()
+    assert html == mock_html
 
 
 @pytest.mark.asyncio
@@ -57,18 +57,14 @@ async def test_fetch_wikipedia_page_failure(scraper, mock_http_client):
         "Error: Timeout",
     )
 
-    soup = await scraper._fetch_wikipedia_page()
-    assert soup is None
+    html = await scraper._fetch_wikipedia_page()
+    assert html is None
 
 
 @pytest.mark.asyncio
 async def test_scrap_animal_table_no_table(scraper):
     """Test handling when no animal table is found in the page."""
-    soup = BeautifulSoup(
-        "<html><body><p>No table here</p></body></html>", "html.parser"
-    )
-
-    await scraper._scrap_animal_table(soup)
+    await scraper._scrap_animal_table("<html><body><p>No table here</p></body></html>")
     assert scraper._stop_event.is_set()  # Ensure scraper stops if table is missing
 
 
@@ -85,74 +81,83 @@ async def test_scrap_animal_table_no_collateral_adjective_column(scraper):
     </body>
     </html>
     """
-    soup = BeautifulSoup(html, "html.parser")
-
-    await scraper._scrap_animal_table(soup)
+    await scraper._scrap_animal_table(html)
     assert scraper._stop_event.is_set()
 
 
 @pytest.mark.asyncio
-async def test_process_animal_row(scraper, mock_db, mock_queue):
-    """Test extracting and processing an animal row."""
+async def test_scrap_animal_table_emits_every_row(scraper, mock_db, frontier):
+    """Test that each animal row is emitted to the frontier in table order."""
     html = """
-    <tr>
-        <td><a href='/wiki/Tiger'>Tiger</a></td>
-        <td>Feline</td>
-    </tr>
+    <table class="wikitable sortable sticky-header">
+        <tr><th>Animal</th><th>Collateral adjective</th></tr>
+        <tr><td><a href='/wiki/Bear'>Bear</a></td><td>ursine</td></tr>
+        <tr><td><a href='/wiki/Cat'>Cat</a></td><td>feline</td></tr>
+    </table>
     """
-    row_soup = BeautifulSoup(html, "html.parser")
-    cells = row_soup.find_all("td")
-
-    await scraper._process_animal_row(cells, 1)
+    await scraper._scrap_animal_table(html)
 
-    # Check database insertion
-    mock_db.insert_animal_to_collateral_adjectives.assert_called_with("Feline", "Tiger")
-
-    # Check queue insertion
-    queued_item = await mock_queue.get()
-    assert queued_item == ("https://en.wikipedia.org/wiki/Tiger", None)
+    assert await frontier.get() == ("https://en.wikipedia.org/wiki/Bear", "Bear")
+    assert await frontier.get() == ("https://en.wikipedia.org/wiki/Cat", "Cat")
+    assert mock_db.insert_many.call_count == 2
 
 
 @pytest.mark.asyncio
-async def test_process_animal_row_missing_animal(scraper, mock_db, mock_queue):
-    """Test handling a row without a valid animal link."""
+async def test_scrap_animal_table_skips_rows_without_animal(scraper, mock_db, frontier):
+    """Test that rows without an animal link and "—" adjectives are handled like before."""
     html = """
-    <tr>
-        <td>No link</td>
-        <td>Furry</td>
-    </tr>
+    <table class="wikitable sortable sticky-header">
+        <tr><th>Animal</th><th>Collateral adjective</th></tr>
+        <tr><td>No link</td><td>Furry</td></tr>
+        <tr><td><a href='/wiki/Gnu'>Gnu</a></td><td>—</td></tr>
+    </table>
     """
-    row_soup = BeautifulSoup(html, "html.parser")
-    cells = row_soup.find_all("td")
+    await scraper._scrap_animal_table(html)
 
-    await scraper._process_animal_row(cells, 1)
+    assert await frontier.get() == ("https://en.wikipedia.org/wiki/Gnu", "Gnu")
+    assert frontier.empty()
+    mock_db.insert_many.assert_not_called()
 
-    # Ensure nothing was added to the database or queue
-    mock_db.insert_animal_to_collateral_adjectives.assert_not_called()
-    assert mock_queue.empty()
+
+@pytest.mark.asyncio
+async def test_run_closes_frontier_on_failure(scraper, mock_http_client, frontier):
+    """Test that the frontier is closed even if the table page cannot be fetched."""
+    mock_http_client.fetch.return_value = (AnimalTableScraper.URL, "Error: Timeout")
+
+    await scraper.run()
+
+    assert frontier.closed
+    assert await frontier.get() is None
 
 
 @pytest.mark.asyncio
-async def test_get_collateral_adjectives_column_index(scraper):
-    """Test finding the correct column index for collateral adjectives."""
-    headers = ["Animal", "Type", "Collateral adjective", "Region"]
-    index = scraper._get_collateral_adjectives_column_index(headers)
-    assert index == 2
+async def test_process_animal_row(scraper, mock_db, frontier):
+    """Test processing an animal row."""
+    await scraper._process_animal_row(TableRow("Tiger", "/wiki/Tiger", ["Feline"]))
+
+    # Check database insertion
+    mock_db.insert_many.assert_called_once_with(adjectives=[("Feline", "Tiger")])
+
+    # Check frontier insertion
+    queued_item = await frontier.get()
+    assert queued_item == ("https://en.wikipedia.org/wiki/Tiger", "Tiger")
 
 
 @pytest.mark.asyncio
-async def test_get_collateral_adjectives_column_index_not_found(scraper):
-    """Test when the collateral adjective column is missing."""
-    headers = ["Animal", "Type", "Region"]
-    index = scraper._get_collateral_adjectives_column_index(headers)
-    assert index is None
+async def test_process_animal_row_reports_progress(mock_http_client, mock_db, frontier):
+    """Test that each parsed row is reported with its adjectives."""
+    progress = MagicMock(spec=ScrapeProgress)
+    scraper = AnimalTableScraper(mock_http_client, mock_db, frontier, progress=progress)
+
+    await scraper._process_animal_row(TableRow("Tiger", "/wiki/Tiger", ["Feline"]))
+
+    progress.row_parsed.assert_called_once_with("Tiger", ["Feline"])
 
 
 @pytest.mark.asyncio
-async def test_extract_collateral_adjectives_empty(scraper):
-    """Test extracting collateral adjectives from an empty cell."""
-    html = "<td>—</td>"
-    cell = BeautifulSoup(html, "html.parser").td
+async def test_process_animal_row_without_href(scraper, mock_db, frontier):
+    """Test that an animal link without a target falls back to the page named after it."""
+    await scraper._process_animal_row(TableRow("Tiger", None, []))
 
-    adjectives = scraper._extract_collateral_adjectives(cell)
-    assert adjectives == []
+    mock_db.insert_many.assert_not_called()
+    assert await frontier.get() == ("https://en.wikipedia.org/wiki/Tiger", "Tiger")
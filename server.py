@@ -0,0 +1,252 @@
+"""The FastAPI app serving the scraped animals.
+
+It only imports the web stack and the storage engines; the scraper stack (aiohttp, bs4,
+aiofiles) is imported by the first refresh or image download, so a server started on an
+existing dataset binds its port quickly. Run it with `python main.py serve`.
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, BackgroundTasks
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from fastapi.templating import Jinja2Templates
+
+from db.animals_db import AnimalsInMemoryDB
+from db.animals_sqlite_db import AnimalsSQLiteDB
+from db.animals_storage import AnimalsStorage
+from db.search_index import DEFAULT_SEARCH_LIMIT
+from scraper.budget import parse_budget
+from scraper.checkpoint import CheckpointLockedError
+from scraper.image_cache import ImageCache
+from scraper.progress import ScrapeProgress
+
+if TYPE_CHECKING:
+    from scraper.checkpoint import Checkpoint
+    from scraper.priority import FetchPriority
+
+EVENTS_KEEPALIVE = 15.0  # Seconds between keep-alives on an idle `/refresh/events` stream
+PREFETCH_INTERVAL = 5.0  # Seconds between checks for a newly published dataset to prefetch
+
+
+@contextlib.asynccontextmanager
+async def lifespan(fastapi_app: FastAPI):
+    """Owns the image cache and its prefetcher for as long as the server runs."""
+    db.snapshot()  # Load the existing dataset before the first request
+    fastapi_app.state.image_cache = ImageCache()
+    prefetcher = asyncio.create_task(_prefetch_images(fastapi_app.state.image_cache))
+    try:
+        yield
+    finally:
+        prefetcher.cancel()
+        await fastapi_app.state.image_cache.close()
+
+
+# Initialize FastAPI app and templates
+app = FastAPI(lifespan=lifespan)
+templates = Jinja2Templates(directory="templates")
+
+
+def create_db() -> AnimalsStorage:
+    """Creates the storage engine selected by the `ANIMALS_DB_PATH` environment variable.
+
+    When it is set, the data is kept in a SQLite file at that path, which can be shared
+    between worker processes and survives restarts; otherwise it is kept in memory.
+    """
+    db_path = os.environ.get("ANIMALS_DB_PATH")
+    if db_path:
+        return AnimalsSQLiteDB(db_path)
+    return AnimalsInMemoryDB()
+
+
+# Shared database instance
+db = create_db()
+
+# Only one refresh may write into the shared database at a time
+_refresh_lock = threading.Lock()
+
+# Progress of the running refresh, streamed to browsers by `/refresh/events`
+progress = ScrapeProgress()
+
+
+async def scrape_data(
+    url: Optional[str] = None,
+    checkpoint: Optional["Checkpoint"] = None,
+    shards: Optional[int] = None,
+    lazy_images: Optional[bool] = None,
+    priority: Optional["FetchPriority"] = None,
+    budget: Optional[float] = None,
+):
+    """Runs the web scraper to populate the database, see `scraper.pipeline.scrape_data()`.
+
+    Unless `priority` is given, animals are fetched in the order configured by the
+    `ANIMALS_FETCH_PRIORITY` environment variable, with the image views counted by this
+    server.
+    """
+    from scraper import pipeline  # pylint: disable=import-outside-toplevel
+
+    image_cache = getattr(app.state, "image_cache", None)  # Only set while serving
+    priority = priority or pipeline.fetch_priority(image_cache.views if image_cache else None)
+    await pipeline.scrape_data(
+        db, progress, url, checkpoint, shards, lazy_images, priority, budget
+    )
+
+
+@app.get("/")
+async def homepage(request: Request):
+    """Renders the HTML page with scraped data."""
+    snapshot = db.snapshot()
+    return templates.TemplateResponse(
+        "index.html",
+        {
+            "request": request,
+            "adjective_to_animals": snapshot.collateral_adjectives_to_animals,
+            "animal_images": snapshot.animal_image_urls,
+            "local_paths": snapshot.animal_images_local_paths,
+            "cached_paths": request.app.state.image_cache.local_paths,
+        },
+    )
+
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=100),
+):
+    """
+    Searches the animals and collateral adjectives of the published dataset.
+    - Terms with a word starting with `q` first, e.g. "bea" finds "Bear" and "Black bear".
+    - If there are none, terms resembling `q`, e.g. "ursne" finds "ursine".
+    - Each result lists its animals: the animal itself, or the animals of the adjective.
+    """
+    snapshot = db.snapshot()
+    return {
+        "query": q,
+        "generation": snapshot.generation,
+        "results": snapshot.search(q, limit),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _image_urls_by_animal(generation: int) -> dict[str, str]:  # pylint: disable=unused-argument
+    """Returns the image URL of each animal in the published snapshot `generation`.
+
+    The generation is only the cache key, so the index is rebuilt once per dataset.
+    """
+    return {
+        animal_name: image_url
+        for image_url, animal_name in db.snapshot().animal_image_urls.items()
+    }
+
+
+@app.get("/images/{animal_name:path}")
+async def animal_image(request: Request, animal_name: str):
+    """
+    Serves the image of an animal.
+    - Served from disk if it has been downloaded already.
+    - Otherwise downloaded on this first request; concurrent requests share the download.
+    """
+    image_url = _image_urls_by_animal(db.snapshot().generation).get(animal_name)
+    if image_url is None:
+        raise HTTPException(status_code=404, detail=f"No image of {animal_name}")
+
+    local_path = await request.app.state.image_cache.get(animal_name, image_url)
+    if local_path is None:
+        return RedirectResponse(image_url)  # Let the browser fetch it from the source
+    return FileResponse(local_path, media_type="image/jpeg")
+
+
+async def _prefetch_images(image_cache: ImageCache):
+    """Warms the search index and the most-viewed animals' images of each new dataset."""
+    generation = None
+    while True:
+        snapshot = db.snapshot()
+        if snapshot.generation != generation:
+            generation = snapshot.generation
+            # Index it off the event loop, so the first search does not wait for it
+            await asyncio.to_thread(getattr, snapshot, "search_view")
+            await image_cache.prefetch(_image_urls_by_animal(generation))
+        await asyncio.sleep(PREFETCH_INTERVAL)
+
+
+def _run_refresh(budget: Optional[float] = None):
+    """Runs a scrape on its own event loop unless another refresh is in progress."""
+    if not _refresh_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+        return
+    try:
+        asyncio.run(scrape_data(budget=budget))
+    except CheckpointLockedError as e:  # Another worker or `main.py scrape` is refreshing
+        progress.failed(e)
+    finally:
+        _refresh_lock.release()
+
+
+@app.post("/refresh")
+async def refresh_data(
+    background_tasks: BackgroundTasks,
+    budget: Optional[str] = Query(None, max_length=20, examples=["60s", "5m"]),
+):
+    """
+    API endpoint to trigger a fresh data scrape.
+    - Runs scraping in the background.
+    - Returns an immediate response while the data refreshes.
+    - With a `budget` such as `60s`, fetches the stalest pages and missing images first,
+      stops when the budget expires and keeps the previous data of the rest.
+    """
+    seconds = None
+    if budget is not None:
+        try:
+            seconds = parse_budget(budget)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+
+    if _refresh_lock.locked():
+        return {"message": "A data refresh is already in progress."}
+
+    background_tasks.add_task(_run_refresh, seconds)  # Runs in a worker thread
+    return {
+        "message": "Data refresh started! Follow its progress at /refresh/events.",
+        "budget": seconds,
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    """Formats a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _refresh_events(request: Request):
+    """Streams refresh progress events until the client disconnects."""
+    generation = db.snapshot().generation
+    async for event in progress.events(timeout=EVENTS_KEEPALIVE):
+        if await request.is_disconnected():
+            break
+        if event is not None:
+            name, data = event
+            generation = data.get("generation", generation)
+            yield _sse(name, data)
+        elif not progress.running and db.snapshot().generation != generation:
+            # Published by a scrape in another process, e.g. with several workers
+            generation = db.snapshot().generation
+            yield _sse("done", {**progress.status(), "generation": generation})
+        else:
+            yield ": keep-alive\n\n"
+
+
+@app.get("/refresh/events")
+async def refresh_events(request: Request):
+    """
+    Server-Sent Events stream of the refresh progress.
+    - Starts with a `status` event holding the current counters.
+    - Then `start`, `row`, `page` and `image` events as the scrapers work, carrying the
+      new data, and `done` or `error` when the refresh ends.
+    """
+    return StreamingResponse(
+        _refresh_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
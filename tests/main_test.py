@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def scrape_data():
+    """Fixture for the pipeline's `scrape_data()`, replaced so nothing is fetched."""
+    with patch("main.setup_logging"), patch(
+        "scraper.pipeline.scrape_data", new_callable=AsyncMock
+    ) as mock:
+        yield mock
+
+
+@pytest.mark.parametrize(
+    "argv, budget",
+    [
+        (["scrape", "--budget", "60s"], 60.0),
+        (["all", "--workers", "2"], None),
+        (["all", "--workers", "2", "--budget", "5m"], 300.0),
+        (["--workers", "2"], None),  # `all` is the default command
+    ],
+)
+def test_every_scraping_command_runs_the_scrape(scrape_data, tmp_path, argv, budget):
+    """Test that `scrape`, as run by `all --workers N`, gets every argument it reads."""
+    args = main.parse_args([*argv, "--db-path", str(tmp_path / "animals.sqlite3")])
+
+    main.scrape(args)
+
+    assert scrape_data.await_args.kwargs["budget"] == budget
+
+
+def test_serve_takes_no_budget():
+    """Test that `serve`, which never scrapes on start, rejects a budget."""
+    with pytest.raises(SystemExit):
+        main.parse_args(["serve", "--budget", "60s"])
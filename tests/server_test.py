@@ -0,0 +1,107 @@
+import json
+from urllib.parse import urlencode
+
+import pytest
+
+import server
+from db.animals_db import AnimalsInMemoryDB
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Fixture for the dataset served by the app, with two animals and an adjective."""
+    database = AnimalsInMemoryDB()
+    database.insert_many(adjectives=[("ursine", "Bear"), ("ursine", "Black bear")])
+    database.publish()
+    monkeypatch.setattr(server, "db", database)
+    return database
+
+
+async def get(path: str, **params) -> tuple[int, dict]:
+    """Sends a GET request straight to the ASGI app and returns its status and JSON body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params).encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await server.app(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], json.loads(body)
+
+
+@pytest.mark.asyncio
+async def test_search_returns_ranked_results_with_animals(db):
+    """Test the response shape: the query, the generation and each match's animals."""
+    status, body = await get("/api/search", q="bea")
+
+    assert status == 200
+    assert body == {
+        "query": "bea",
+        "generation": db.snapshot().generation,
+        "results": [
+            {"kind": "animal", "term": "Bear", "score": 1.0, "animals": ["Bear"]},
+            {"kind": "animal", "term": "Black bear", "score": 0.9, "animals": ["Black bear"]},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db")
+async def test_search_lists_the_animals_of_an_adjective():
+    """Test that an adjective result lists every animal associated with it."""
+    _, body = await get("/api/search", q="ursine")
+
+    assert body["results"] == [
+        {"kind": "adjective", "term": "ursine", "score": 1.0, "animals": ["Bear", "Black bear"]}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_only_sees_published_data(db):
+    """Test that unpublished writes are not searchable."""
+    db.insert_animal_to_collateral_adjectives("vulpine", "Fox")
+
+    _, body = await get("/api/search", q="fox")
+
+    assert body["results"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db")
+async def test_search_limit():
+    """Test that `limit` caps the number of results."""
+    _, body = await get("/api/search", q="bea", limit=1)
+
+    assert [result["term"] for result in body["results"]] == ["Bear"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db")
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"q": ""}, {"q": "x" * 101}, {"q": "bea", "limit": 0}, {"q": "bea", "limit": 101},
+     {"q": "bea", "limit": "many"}],
+)
+async def test_search_rejects_invalid_parameters(params):
+    """Test that a missing or oversized query and an out-of-range limit are rejected."""
+    status, body = await get("/api/search", **params)
+
+    assert status == 422
+    assert body["detail"]